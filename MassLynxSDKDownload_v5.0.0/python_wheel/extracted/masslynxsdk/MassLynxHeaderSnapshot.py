@@ -0,0 +1,83 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+from .MassLynxRawDefs import MassLynxHeaderItem
+
+class MassLynxHeaderSnapshot(object):
+    """
+    Copy of every header item of a raw file, read with one dll call
+    Plain python strings only - no native handle - so it can be cached, pickled and sent to other processes
+    Items the dll could not read are left out, with their error message in GetErrors
+    The snapshot is immutable
+    """
+
+    __slots__ = ('_values', '_errors')
+
+    def __init__(self, values, errors = None):
+        # item value -> string, ordered as MassLynxHeaderItem
+        object.__setattr__(self, '_values', { int(item) : str(value) for item, value in dict(values).items() })
+        object.__setattr__(self, '_errors', { int(item) : str(error) for item, error in dict(errors or {}).items() })
+
+    def __setattr__(self, name, value):
+        raise AttributeError( "MassLynxHeaderSnapshot is immutable" )
+
+    def __delattr__(self, name):
+        raise AttributeError( "MassLynxHeaderSnapshot is immutable" )
+
+    def __reduce__(self):
+        return (MassLynxHeaderSnapshot, (self._values, self._errors))
+
+    def __eq__(self, other):
+        return isinstance(other, MassLynxHeaderSnapshot) and self._values == other._values and self._errors == other._errors
+
+    def __hash__(self):
+        return hash( (tuple(sorted(self._values.items())), tuple(sorted(self._errors.items()))) )
+
+    def __repr__(self):
+        return "MassLynxHeaderSnapshot(%r)" % self.ToDict()
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, whichItem):
+        return int(whichItem) in self._values
+
+    def __getitem__(self, whichItem):
+        return self._values[ int(whichItem) ]
+
+    def Get( self, whichItem, default = "" ):
+        """
+        Returns the value of a header item
+
+        @param  whichItem MassLynxHeaderItem
+        @param  default value returned if the item was not read
+
+        @return string
+        """
+        return self._values.get( int(whichItem), default )
+
+    def GetItems( self ):
+        """
+        Returns the items in the snapshot
+
+        @return list of MassLynxHeaderItem
+        """
+        return [ MassLynxHeaderItem(item) for item in self._values ]
+
+    def GetErrors( self ):
+        """
+        Returns the items that could not be read
+
+        @return dict MassLynxHeaderItem -> error message
+        """
+        return { MassLynxHeaderItem(item) : error for item, error in self._errors.items() }
+
+    def ToDict( self ):
+        """
+        Returns a copy of the values keyed by item name
+
+        @return dict
+        """
+        return { MassLynxHeaderItem(item).name : value for item, value in self._values.items() }
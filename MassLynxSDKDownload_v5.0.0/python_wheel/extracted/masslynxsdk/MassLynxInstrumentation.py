@@ -0,0 +1,228 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import bisect
+import json
+import threading
+import time
+
+from .MassLynxRawReader import MassLynxStringHandler, MassLynxBuffer
+from .MassLynxProcessorBase import MassLynxStringHandler as MassLynxProcessorStringHandler
+from .Providers.MassLynxProvider import MassLynxProvider
+
+## \cond
+class _MassLynxCallStatistics(object):
+    __slots__ = ('calls', 'errors', 'seconds', 'bytes', 'buckets')
+
+    def __init__(self, bucketCount):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.buckets = [0] * (bucketCount + 1)     # last bucket is +Inf
+
+class _MassLynxInstrumentedDll(object):
+    # stands in for the loaded library while instrumentation is enabled
+
+    def __init__(self, dll):
+        self._dll = dll
+
+    def __getattr__(self, name):
+        function = getattr( self._dll, name )
+        if (not callable( function )):
+            return function
+
+        record = MassLynxInstrumentation._Record
+        clock = time.perf_counter
+        def call( *args ):
+            start = clock()
+            code = function( *args )
+            record( name, clock() - start, code )
+            return code
+
+        # cached on the instance, later lookups do not reach __getattr__
+        setattr( self, name, call )
+        return call
+## \endcond
+
+class MassLynxInstrumentation(object):
+    """
+    Opt-in counters for every MassLynxRaw entry point: calls, error codes, bytes copied out of
+    dll buffers and a latency histogram, plus the time spent decoding strings (ToString).
+    While enabled the providers call the library through a timing wrapper; when disabled the
+    library itself is used again, so there is no cost at all.
+    Only the dll backend is measured, the mmap and synthetic backends do not call the library.
+    Enabling it does not load the library: it is wrapped when it is loaded.
+    """
+
+    # upper bounds of the latency buckets in seconds
+    Buckets = ( 1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0 )
+
+    ToStringName = "ToString"
+
+    _lock = threading.Lock()
+    _statistics = {}
+    _last = threading.local()
+    _enabled = False
+
+    @staticmethod
+    def Enable():
+        """
+        Starts counting, the counters collected so far are kept
+
+        @return void
+        """
+        with MassLynxInstrumentation._lock:
+            if (MassLynxInstrumentation._enabled):
+                return
+            MassLynxInstrumentation._enabled = True
+            MassLynxProvider.SetWrapper( _MassLynxInstrumentedDll )
+            MassLynxBuffer._recorder = MassLynxInstrumentation._RecordBytes
+            MassLynxStringHandler._recorder = MassLynxInstrumentation._RecordString
+            MassLynxProcessorStringHandler._recorder = MassLynxInstrumentation._RecordString
+
+    @staticmethod
+    def Disable():
+        """
+        Stops counting and restores the library, the counters are kept
+
+        @return void
+        """
+        with MassLynxInstrumentation._lock:
+            if (not MassLynxInstrumentation._enabled):
+                return
+            MassLynxInstrumentation._enabled = False
+            MassLynxProvider.SetWrapper( None )
+            MassLynxBuffer._recorder = None
+            MassLynxStringHandler._recorder = None
+            MassLynxProcessorStringHandler._recorder = None
+
+    @staticmethod
+    def IsEnabled():
+        """
+        Returns True while calls are counted
+
+        @return bool
+        """
+        return MassLynxInstrumentation._enabled
+
+    @staticmethod
+    def Reset():
+        """
+        Clears the counters
+
+        @return void
+        """
+        with MassLynxInstrumentation._lock:
+            MassLynxInstrumentation._statistics = {}
+
+    @staticmethod
+    def GetStatistics():
+        """
+        Returns a copy of the counters
+
+        @return dict of entry point -> dict with calls, errors, seconds, bytes, meanSeconds
+                and buckets (list of [upper bound, count], not cumulative, None is +Inf)
+        """
+        with MassLynxInstrumentation._lock:
+            items = [ (name, statistics.calls, statistics.errors, statistics.seconds, statistics.bytes, list(statistics.buckets))
+                      for name, statistics in MassLynxInstrumentation._statistics.items() ]
+
+        bounds = list( MassLynxInstrumentation.Buckets ) + [ None ]
+        result = {}
+        for name, calls, errors, seconds, size, buckets in sorted( items ):
+            result[ name ] = {
+                'calls' : calls,
+                'errors' : errors,
+                'seconds' : seconds,
+                'meanSeconds' : seconds / calls if calls else 0.0,
+                'bytes' : size,
+                'buckets' : [ [ bound, count ] for bound, count in zip( bounds, buckets ) ],
+            }
+        return result
+
+    @staticmethod
+    def ToJson( indent = None ):
+        """
+        Returns the counters as JSON, see GetStatistics
+
+        @param  indent passed to json.dumps
+
+        @return string
+        """
+        return json.dumps( MassLynxInstrumentation.GetStatistics(), indent = indent )
+
+    @staticmethod
+    def ToPrometheus( prefix = "masslynx_dll" ):
+        """
+        Returns the counters in the Prometheus text exposition format
+
+        @param  prefix metric name prefix
+
+        @return string
+        """
+        statistics = MassLynxInstrumentation.GetStatistics()
+        lines = []
+        for metric, kind, text, key in ( ( "calls_total", "counter", "Calls per MassLynxRaw entry point", 'calls' ),
+                                         ( "errors_total", "counter", "Calls that returned an error code", 'errors' ),
+                                         ( "bytes_total", "counter", "Bytes copied out of library buffers", 'bytes' ) ):
+            lines.append( "# HELP %s_%s %s" % (prefix, metric, text) )
+            lines.append( "# TYPE %s_%s %s" % (prefix, metric, kind) )
+            for name, values in statistics.items():
+                lines.append( '%s_%s{function="%s"} %d' % (prefix, metric, name, values[ key ]) )
+
+        lines.append( "# HELP %s_call_seconds Latency per MassLynxRaw entry point" % prefix )
+        lines.append( "# TYPE %s_call_seconds histogram" % prefix )
+        for name, values in statistics.items():
+            cumulative = 0
+            for bound, count in values['buckets']:
+                cumulative += count
+                lines.append( '%s_call_seconds_bucket{function="%s",le="%s"} %d' % (prefix, name, "+Inf" if None == bound else repr(bound), cumulative) )
+            lines.append( '%s_call_seconds_sum{function="%s"} %r' % (prefix, name, values['seconds']) )
+            lines.append( '%s_call_seconds_count{function="%s"} %d' % (prefix, name, values['calls']) )
+        return "\n".join( lines ) + "\n"
+
+    ## \cond
+    @staticmethod
+    def _Statistics( name ):
+        # called with the lock held
+        statistics = MassLynxInstrumentation._statistics.get( name )
+        if (None == statistics):
+            statistics = _MassLynxCallStatistics( len(MassLynxInstrumentation.Buckets) )
+            MassLynxInstrumentation._statistics[ name ] = statistics
+        return statistics
+
+    @staticmethod
+    def _Record( name, seconds, code, size = 0 ):
+        # bytes copied after the call are charged to the last entry point of the thread
+        MassLynxInstrumentation._last.name = name
+        bucket = bisect.bisect_left( MassLynxInstrumentation.Buckets, seconds )
+        with MassLynxInstrumentation._lock:
+            statistics = MassLynxInstrumentation._Statistics( name )
+            statistics.calls += 1
+            statistics.seconds += seconds
+            statistics.bytes += size
+            statistics.buckets[ bucket ] += 1
+            if (0 != code):
+                statistics.errors += 1
+
+    @staticmethod
+    def _RecordBytes( size ):
+        name = getattr( MassLynxInstrumentation._last, 'name', None )
+        if (None == name):
+            return
+        with MassLynxInstrumentation._lock:
+            MassLynxInstrumentation._Statistics( name ).bytes += size
+
+    @staticmethod
+    def _RecordString( function, *args ):
+        # decode and release of the string, the release is also counted as its own entry point
+        name = getattr( MassLynxInstrumentation._last, 'name', None )
+        start = time.perf_counter()
+        value = function( *args )
+        MassLynxInstrumentation._Record( MassLynxInstrumentation.ToStringName, time.perf_counter() - start, 0, len(value) )
+        MassLynxInstrumentation._last.name = name
+        return value
+    ## \endcond
@@ -3,7 +3,6 @@
     MassLynx Python SDK
 '''
 
-from ctypes import c_char_p, c_void_p
 from .MassLynxParameters import MassLynxParameters
 from .Providers.MassLynxProvider import MassLynxProvider
 
@@ -22,6 +21,5 @@ class MassLynxLicense(object):
         bytes = str.encode(userLicense)
         params = MassLynxParameters()
         getLicenseInfo = MassLynxProvider.MassLynxDll.getLicenseInfo
-        getLicenseInfo.argtypes = [c_char_p , c_void_p]
         code = getLicenseInfo(bytes, params.GetParameters())
         return params
\ No newline at end of file
@@ -0,0 +1,158 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import os
+import re
+import struct
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+## \cond
+# _FUNCnnn.CMP - compound name of each MRM transition, as runs of at least 4 printable ascii bytes
+MassLynxCmpMinimumName = 4
+
+# _FUNCnnn.EE - 128 byte header, then one uint16 cone voltage, uint16 collision energy pair per transition
+MassLynxEeHeaderBytes = 128
+MassLynxEeRecord = [ ('coneVoltage', '<u2'), ('collisionEnergy', '<u2') ]
+## \endcond
+
+class MassLynxMRMMetadata(object):
+    """
+    Compound names (_FUNCnnn.CMP) and cone voltages / collision energies (_FUNCnnn.EE)
+    of the MRM transitions of one function, read from the .raw directory
+    Files are parsed once and cached per path, size and modification time, so the cache follows
+    a file that is rewritten but repeated reads of a large method cost nothing.
+    """
+
+    _lock = threading.Lock()
+    _cache = {}
+
+    def __init__(self, names, coneVoltages, collisionEnergies):
+        self.names = names
+        self.coneVoltages = coneVoltages
+        self.collisionEnergies = collisionEnergies
+
+    @staticmethod
+    def Read( path, whichFunction ):
+        """
+        Returns the metadata of a function (0 based), from the cache when the files did not change
+
+        @param  path .raw directory
+        @param  whichFunction function index, _FUNC001 is function 0
+
+        @return MassLynxMRMMetadata, with no names or energies if the files are missing
+        """
+        base = os.path.join( path, "_FUNC%03d" % (whichFunction + 1) )
+        names = MassLynxMRMMetadata._Cached( base + ".CMP", MassLynxMRMMetadata._ParseCmp )
+        energies = MassLynxMRMMetadata._Cached( base + ".EE", MassLynxMRMMetadata._ParseEe )
+        if (None == energies):
+            energies = ( [], [] )
+        return MassLynxMRMMetadata( [] if None == names else names, energies[0], energies[1] )
+
+    @staticmethod
+    def ReadAll( path ):
+        """
+        Returns the metadata of every function that has a _FUNCnnn.CMP or _FUNCnnn.EE file
+
+        @param  path .raw directory
+
+        @return dict of function index (0 based) -> MassLynxMRMMetadata
+        """
+        numbers = set()
+        if (os.path.isdir( path )):
+            for name in os.listdir( path ):
+                match = re.match( r'_FUNC(\d{3})\.(CMP|EE)$', name, re.IGNORECASE )
+                if (match):
+                    numbers.add( int(match.group(1)) )
+        return { number - 1 : MassLynxMRMMetadata.Read( path, number - 1 ) for number in sorted( numbers ) }
+
+    @staticmethod
+    def ClearCache():
+        """
+        Drops every parsed file
+
+        @return void
+        """
+        with MassLynxMRMMetadata._lock:
+            MassLynxMRMMetadata._cache = {}
+
+    def GetNames( self, count ):
+        """
+        Returns count names, MRM_n where the file has no name
+
+        @return list of string
+        """
+        names = list( self.names[ :count ] )
+        return names + [ "MRM_%d" % (index + 1) for index in range( len(names), count ) ]
+
+    def GetEnergies( self, count ):
+        """
+        Returns count (cone voltage, collision energy) pairs, (None, None) where the file has no values
+
+        @return list of (int, int) tuples
+        """
+        pairs = list( zip( self._ToList( self.coneVoltages[ :count ] ), self._ToList( self.collisionEnergies[ :count ] ) ) )
+        return pairs + [ (None, None) ] * (count - len(pairs))
+
+    ## \cond
+    @staticmethod
+    def _ToList( values ):
+        return values.tolist() if hasattr( values, 'tolist' ) else list( values )
+
+    @staticmethod
+    def _Cached( path, parse ):
+        try:
+            status = os.stat( path )
+        except OSError:
+            return None
+        signature = ( status.st_size, status.st_mtime_ns )
+
+        with MassLynxMRMMetadata._lock:
+            entry = MassLynxMRMMetadata._cache.get( path )
+        if (None != entry and signature == entry[0]):
+            return entry[1]
+
+        try:
+            with open( path, 'rb' ) as f:
+                value = parse( f.read() )
+        except OSError:
+            return None
+
+        with MassLynxMRMMetadata._lock:
+            MassLynxMRMMetadata._cache[ path ] = ( signature, value )
+        return value
+
+    @staticmethod
+    def _ParseCmp( content ):
+        if (None == numpy):
+            return [ text.decode( 'ascii' ).strip() for text in re.findall( b'[ -~]{%d,}' % MassLynxCmpMinimumName, content ) ]
+
+        # start and end of every run of printable bytes
+        printable = numpy.frombuffer( content, dtype=numpy.uint8 )
+        printable = ((printable >= 0x20) & (printable <= 0x7E)).astype( numpy.int8 )
+        edges = numpy.flatnonzero( numpy.diff( numpy.concatenate( ( [0], printable, [0] ) ) ) )
+        starts, ends = edges[ 0::2 ], edges[ 1::2 ]
+        keep = (ends - starts) >= MassLynxCmpMinimumName
+        return [ content[ start:end ].decode( 'ascii' ).strip() for start, end in zip( starts[ keep ].tolist(), ends[ keep ].tolist() ) ]
+
+    @staticmethod
+    def _ParseEe( content ):
+        count = max( 0, len(content) - MassLynxEeHeaderBytes ) // 4
+        if (None == numpy):
+            values = struct.unpack_from( '<%dH' % (2 * count), content, MassLynxEeHeaderBytes ) if count else ()
+            return ( list( values[ 0::2 ] ), list( values[ 1::2 ] ) )
+
+        records = numpy.frombuffer( content, dtype=numpy.dtype( MassLynxEeRecord ), count=count, offset=MassLynxEeHeaderBytes if count else 0 )
+        energies = ( records['coneVoltage'].astype( numpy.int32 ), records['collisionEnergy'].astype( numpy.int32 ) )
+
+        # shared by every reader of the cached file
+        for values in energies:
+            values.setflags( write=False )
+        return energies
+    ## \endcond
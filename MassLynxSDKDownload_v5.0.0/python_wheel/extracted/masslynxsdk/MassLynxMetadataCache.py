@@ -0,0 +1,181 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import hashlib
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+
+class MassLynxMetadataCache(object):
+    """
+    On-disk cache of metadata derived from raw files, a SQLite database in a cache directory
+    Values are stored per raw fingerprint and name, so a run that did not change is read back
+    without opening it again; a run that is rewritten gets a new fingerprint and its old entries
+    age out. When the database grows past the size budget the least recently used values are evicted.
+    Values are pickled, the cache directory must only be writable by trusted users.
+    Every failure to read or write the database is ignored - the cache is an optimization only.
+    """
+
+    DefaultBudget = 64 * 1024 * 1024
+
+    ## \cond
+    _schema = "CREATE TABLE IF NOT EXISTS entries ( fingerprint TEXT, name TEXT, value BLOB, size INTEGER, used REAL, PRIMARY KEY ( fingerprint, name ) )"
+    ## \endcond
+
+    def __init__(self, directory = None, budget = DefaultBudget):
+        self._directory = MassLynxMetadataCache.DefaultDirectory() if (None == directory) else directory
+        self._budget = budget
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.Close()
+
+    @staticmethod
+    def DefaultDirectory():
+        """
+        Returns the cache directory: MASSLYNX_CACHE_DIR, otherwise masslynx in the user cache directory
+
+        @return string
+        """
+        directory = os.environ.get( "MASSLYNX_CACHE_DIR" )
+        if (directory):
+            return directory
+        base = os.environ.get( "LOCALAPPDATA" ) or os.environ.get( "XDG_CACHE_HOME" ) or os.path.join( os.path.expanduser( "~" ), ".cache" )
+        return os.path.join( base, "masslynx" )
+
+    @staticmethod
+    def Fingerprint( path ):
+        """
+        Returns the fingerprint of a raw directory: its name and the sizes and modification times
+        of _HEADER.TXT and the _FUNC files, which change whenever the run is rewritten
+        Synthetic paths are their own fingerprint.
+
+        @param  path raw directory or synthetic path
+
+        @return string
+        """
+        entries = [ os.path.basename( os.path.normpath( path ) ) ]
+        if (os.path.isdir( path )):
+            with os.scandir( path ) as it:
+                for item in it:
+                    if (item.is_file() and re.match( r'(_FUNC\d{3}\.|_HEADER\.TXT$)', item.name, re.IGNORECASE )):
+                        stat = item.stat()
+                        entries.append( "%s:%d:%d" % (item.name.upper(), stat.st_size, stat.st_mtime_ns) )
+        return hashlib.sha1( "\n".join( sorted(entries) ).encode() ).hexdigest()
+
+    def Get( self, fingerprint, name ):
+        """
+        Returns a cached value
+
+        @param  fingerprint see Fingerprint
+        @param  name what the value is, e.g. "header"
+
+        @return the value, None if it is not cached
+        """
+        try:
+            with self._lock:
+                connection = self._Connect()
+                row = connection.execute( "SELECT value FROM entries WHERE fingerprint = ? AND name = ?", (fingerprint, name) ).fetchone()
+                if (None == row):
+                    return None
+                connection.execute( "UPDATE entries SET used = ? WHERE fingerprint = ? AND name = ?", (time.time(), fingerprint, name) )
+                connection.commit()
+            return pickle.loads( row[0] )
+        except (sqlite3.Error, OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def Put( self, fingerprint, name, value ):
+        """
+        Stores a value, then evicts the least recently used values beyond the budget
+
+        @param  fingerprint see Fingerprint
+        @param  name what the value is
+        @param  value any picklable value
+
+        @return bool - False if the value could not be stored
+        """
+        blob = pickle.dumps( value, protocol=pickle.HIGHEST_PROTOCOL )
+        if (len(blob) > self._budget):
+            return False
+        try:
+            with self._lock:
+                connection = self._Connect()
+                connection.execute( "INSERT OR REPLACE INTO entries VALUES ( ?, ?, ?, ?, ? )", (fingerprint, name, sqlite3.Binary( blob ), len(blob), time.time()) )
+                self._Evict( connection )
+                connection.commit()
+            return True
+        except (sqlite3.Error, OSError):
+            return False
+
+    def GetSize( self ):
+        """
+        Returns the bytes of cached values
+
+        @return int
+        """
+        try:
+            with self._lock:
+                return self._Connect().execute( "SELECT COALESCE( SUM( size ), 0 ) FROM entries" ).fetchone()[0]
+        except (sqlite3.Error, OSError):
+            return 0
+
+    def Clear( self ):
+        """
+        Removes every cached value
+
+        @return void
+        """
+        try:
+            with self._lock:
+                connection = self._Connect()
+                connection.execute( "DELETE FROM entries" )
+                connection.commit()
+                connection.execute( "VACUUM" )
+        except (sqlite3.Error, OSError):
+            pass
+
+    def Close( self ):
+        """
+        Closes the database, it is opened again by the next call
+
+        @return void
+        """
+        with self._lock:
+            if (None != self._connection):
+                self._connection.close()
+                self._connection = None
+
+    ## \cond
+    def _Connect( self ):
+        # called with the lock held
+        if (None == self._connection):
+            os.makedirs( self._directory, exist_ok=True )
+            connection = sqlite3.connect( os.path.join( self._directory, "metadata.sqlite" ), timeout=30, check_same_thread=False )
+            # evicted pages are given back to the file system, only applies to a new database
+            connection.execute( "PRAGMA auto_vacuum = FULL" )
+            connection.execute( MassLynxMetadataCache._schema )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _Evict( self, connection ):
+        total = connection.execute( "SELECT COALESCE( SUM( size ), 0 ) FROM entries" ).fetchone()[0]
+        if (total <= self._budget):
+            return
+        evicted = []
+        for fingerprint, name, size in connection.execute( "SELECT fingerprint, name, size FROM entries ORDER BY used" ).fetchall():
+            if (total <= self._budget):
+                break
+            evicted.append( (fingerprint, name) )
+            total -= size
+        connection.executemany( "DELETE FROM entries WHERE fingerprint = ? AND name = ?", evicted )
+    ## \endcond
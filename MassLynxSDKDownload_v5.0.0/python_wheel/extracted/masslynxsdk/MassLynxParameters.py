@@ -11,13 +11,11 @@ class MassLynxParameters(object):
         self._codeHandler = MassLynxCodeHandler() 
         self._stringHandler = MassLynxStringHandler()
         createParameters = MassLynxProvider.MassLynxDll.createParameters
-        createParameters.argtypes = [POINTER(c_void_p)]
         self.CheckReturnCode(createParameters(self._mlParameters))
 
     # destroy the samplelist
     def __del__(self):
         destroyParameters = MassLynxProvider.MassLynxDll.destroyParameters
-        destroyParameters.argtypes = [c_void_p]          
         destroyParameters( self._mlParameters )
 
     # Set the key value pair
@@ -33,7 +31,6 @@ class MassLynxParameters(object):
         bytes = str.encode(str(value))     
             
         setParameterValue = MassLynxProvider.MassLynxDll.setParameterValue
-        setParameterValue.argtypes = [c_void_p, c_int, c_char_p]          
         setParameterValue( self._mlParameters, key, bytes )
 
         return self
@@ -42,7 +39,6 @@ class MassLynxParameters(object):
         # call the dll
         value = c_char_p()
         getParameterValue = MassLynxProvider.MassLynxDll.getParameterValue
-        getParameterValue.argtypes = [c_void_p, c_int, POINTER(c_char_p)]
         getParameterValue(self._mlParameters, key, value )
 
         return self._stringHandler.ToString(value, False)
@@ -56,7 +52,6 @@ class MassLynxParameters(object):
 
         # get the keys
         getParameterKeys = MassLynxProvider.MassLynxDll.getParameterKeys
-        getParameterKeys.argtypes = [c_void_p, POINTER(c_void_p), POINTER(c_int)]
         getParameterKeys(self._mlParameters,pKeys,size)
 
         # fill the array
@@ -2,7 +2,8 @@
     MassLynx Python SDK
 '''
 
-from ctypes import POINTER, c_char_p, c_int
+import threading
+from ctypes import c_char_p
 
 from .MassLynxRawReader import MassLynxRawReader
 from .Providers.MassLynxProvider import MassLynxProvider
@@ -24,6 +25,9 @@ class MassLynxException(Exception):
 # string handler
 class MassLynxStringHandler(object):
 
+    # set by MassLynxInstrumentation while enabled
+    _recorder = None
+
     def __init__(self):
         return
 
@@ -31,6 +35,11 @@ class MassLynxStringHandler(object):
         if (None == chString):
             return ""
 
+        if (None != MassLynxStringHandler._recorder):
+            return MassLynxStringHandler._recorder( self._ToString, chString, release )
+        return self._ToString( chString, release )
+
+    def _ToString(self, chString, release):
         strValue  = chString.value.decode()
         if (release ):
             MassLynxRawReader.ReleaseMemory(chString)
@@ -41,32 +50,35 @@ class MassLynxStringHandler(object):
 
 class MassLynxCodeHandler(object):
     def __init__(self):
-        self._code = 0
+        # the last code is kept per thread so a handle can be shared between threads
+        self._last = threading.local()
         self._stringHandler = MassLynxStringHandler()
         return
 
     # three option true, false, throw exception
     def CheckReturnCode( self, code, throw = True ):
-        self._code = code
+        self._last.code = code
         if (0 == code):
             return True
 
         if (throw):
-            raise MassLynxException( self.GetLastCode(), self.GetLastMessage() )
+            raise MassLynxException( code, self.GetMessage( code ) )
 
         # get last error
         return False
 
     def GetLastCode(self):
-        return self._code
+        return getattr( self._last, 'code', 0 )
 
     def GetLastMessage(self):
+        return self.GetMessage( self.GetLastCode() )
+
+    def GetMessage(self, code):
         # load the dll
         getErrorMessage = MassLynxProvider.MassLynxDll.getErrorMessage
-        getErrorMessage.argtypes = [ c_int, POINTER(c_char_p)]
 
         message = (c_char_p)()
-        getErrorMessage( self.GetLastCode(), message )
+        getErrorMessage( code, message )
 
         # release the memory
         return self._stringHandler.ToString(message, True)
@@ -93,7 +105,27 @@ class MassLynxProcessorBase():
         # did we fall through
         else:
             self._codeHandler.CheckReturnCode( 1 )
-    
+
+    def SetArrayMode( self, arrayMode = True ):
+        """
+        Selects how processed spectra are returned
+        In array mode masses and intensities are returned as float32 numpy arrays, otherwise as python lists
+
+        @param  arrayMode True to return numpy arrays (requires numpy)
+
+        @return self
+        """
+        self._provider.SetArrayMode( arrayMode )
+        return self
+
+    def GetArrayMode( self ):
+        """
+        Returns True if the processor returns numpy arrays
+
+        @return bool
+        """
+        return self._provider.GetArrayMode()
+
     def GetLastCode( self):
         """
         Returns the last code
@@ -0,0 +1,254 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .MassLynxRawReader import MassLynxException
+from .MassLynxRawSession import MassLynxRawSession
+from .MassLynxRawInfoReader import MassLynxRawInfoReaderEx
+from .MassLynxRawChromatogramReader import MassLynxRawChromatogramReaderEx
+from .MassLynxRawScanReader import MassLynxRawScanReaderEx
+
+class MassLynxAsyncRawFile(object):
+    """
+    asyncio front-end for one raw file
+    Reads run on a bounded thread pool shared by every file (the dll is called without the GIL),
+    at most maxConcurrency reads of the file run at the same time, each on its own session,
+    so one busy file cannot take every worker from the others.
+    Cancelling a task that is still waiting removes it from the queue, a read already inside
+    the dll runs to completion and its result is dropped.
+    """
+
+    DefaultWorkers = min( 32, (os.cpu_count() or 1) + 4 )
+
+    _defaultExecutor = None
+    _defaultLock = threading.Lock()
+
+    def __init__(self, path, userlicense = "", arrayMode = False, maxConcurrency = 1, executor = None ):
+        if (maxConcurrency < 1):
+            raise MassLynxException( 1, "maxConcurrency must be at least 1" )
+
+        self._path = path
+        self._license = userlicense
+        self._arrayMode = arrayMode
+        self._maxConcurrency = maxConcurrency
+        self._executor = executor
+        self._semaphore = None
+        self._lock = threading.Lock()
+        self._idle = []
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        await self.Close()
+
+    @staticmethod
+    def DefaultExecutor():
+        """
+        Returns the thread pool shared by files created without an executor
+
+        @return ThreadPoolExecutor with DefaultWorkers threads
+        """
+        with MassLynxAsyncRawFile._defaultLock:
+            if (None == MassLynxAsyncRawFile._defaultExecutor):
+                MassLynxAsyncRawFile._defaultExecutor = ThreadPoolExecutor( max_workers = MassLynxAsyncRawFile.DefaultWorkers, thread_name_prefix = "masslynx" )
+            return MassLynxAsyncRawFile._defaultExecutor
+
+    def GetPath( self ):
+        """
+        Returns the path of the raw file
+
+        @return string
+        """
+        return self._path
+
+    def GetInfoReader( self ):
+        """
+        Returns the async info reader
+
+        @return MassLynxAsyncRawInfoReader
+        """
+        return MassLynxAsyncRawInfoReader( self )
+
+    def GetChromatogramReader( self ):
+        """
+        Returns the async chromatogram reader
+
+        @return MassLynxAsyncRawChromatogramReader
+        """
+        return MassLynxAsyncRawChromatogramReader( self )
+
+    def GetScanReader( self ):
+        """
+        Returns the async scan reader
+
+        @return MassLynxAsyncRawScanReader
+        """
+        return MassLynxAsyncRawScanReader( self )
+
+    async def Run( self, function, *args ):
+        """
+        Runs function( session, *args ) on the executor with a session of the file
+
+        @param  function callable taking a MassLynxRawSession
+        @param  args arguments passed after the session
+
+        @return result of function
+        """
+        if (self._closed):
+            raise MassLynxException( 1, "Raw file is closed" )
+
+        loop = asyncio.get_running_loop()
+        if (None == self._semaphore):
+            self._semaphore = asyncio.Semaphore( self._maxConcurrency )
+
+        await self._semaphore.acquire()
+        try:
+            executor = self._executor or MassLynxAsyncRawFile.DefaultExecutor()
+            future = executor.submit( self._Call, function, args )
+        except:
+            self._semaphore.release()
+            raise
+
+        # the slot is given back when the read leaves the executor, not when the task is cancelled
+        future.add_done_callback( functools.partial( MassLynxAsyncRawFile._ReleaseSlot, loop, self._semaphore ) )
+
+        try:
+            return await asyncio.wrap_future( future )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    async def Close( self ):
+        """
+        Closes the sessions of the file, sessions in use are closed when their read returns
+
+        @return void
+        """
+        with self._lock:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+        if (idle):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor( self._executor or MassLynxAsyncRawFile.DefaultExecutor(), self._CloseSessions, idle )
+
+    ## \cond
+    def _Call( self, function, args ):
+        # runs on an executor thread
+        session = self._TakeSession()
+        try:
+            return function( session, *args )
+        finally:
+            self._GiveSession( session )
+
+    def _TakeSession( self ):
+        with self._lock:
+            if (self._closed):
+                raise MassLynxException( 1, "Raw file is closed" )
+            if (self._idle):
+                return self._idle.pop()
+
+        # the semaphore guarantees there are never more than maxConcurrency sessions
+        return MassLynxRawSession( self._path, self._license, self._arrayMode )
+
+    def _GiveSession( self, session ):
+        with self._lock:
+            if (not self._closed):
+                self._idle.append( session )
+                return
+        session.Close()
+
+    @staticmethod
+    def _ReleaseSlot( loop, semaphore, future ):
+        try:
+            loop.call_soon_threadsafe( semaphore.release )
+        except RuntimeError:
+            pass    # the loop is closed
+
+    @staticmethod
+    def _CloseSessions( sessions ):
+        for session in sessions:
+            session.Close()
+    ## \endcond
+
+## \cond
+def _ReadOnSession( readerName, methodName, session, *args, **kwargs ):
+    reader = getattr( session, readerName )()
+    return getattr( reader, methodName )( *args, **kwargs )
+
+class _MassLynxAsyncReader(object):
+
+    _readerType = None
+    _readerName = None
+    _readMethods = frozenset()
+
+    def __init__(self, rawFile ):
+        self._file = rawFile
+
+    def GetFile( self ):
+        return self._file
+
+    def __getattr__(self, name):
+        # every read method of the synchronous reader becomes a coroutine; iterators, setters and
+        # Update would act on a pooled session that is handed to another task once the call returns
+        if (name not in self._readMethods):
+            raise AttributeError( "%s has no method %s" % (type(self).__name__, name) )
+
+        @functools.wraps( getattr( self._readerType, name ) )
+        async def method( *args, **kwargs ):
+            # keyword arguments travel with the function, Run only passes positional ones
+            return await self._file.Run( functools.partial( _ReadOnSession, self._readerName, name, **kwargs ), *args )
+        return method
+## \endcond
+
+class MassLynxAsyncRawInfoReader(_MassLynxAsyncReader):
+    """
+    Async counterpart of MassLynxRawInfoReaderEx
+    Every read method of MassLynxRawInfoReaderEx is available as a coroutine with the same arguments
+    e.g. await reader.GetMRMCount( 0 )
+    """
+    _readerType = MassLynxRawInfoReaderEx
+    _readerName = 'GetInfoReader'
+    _readMethods = frozenset( (
+        'GetNumberofFunctions', 'GetScansInFunction', 'GetAcquisitionMassRange', 'GetAcquisitionTimeRange',
+        'GetFunctionType', 'GetFunctionTypeString', 'IsContinuum', 'GetIonMode', 'GetIonModeString',
+        'GetRetentionTime', 'GetDriftTime', 'GetDriftTimeFromCCS', 'GetCollisionalCrossSection',
+        'GetDriftScanCount', 'GetMRMCount', 'GetMRMMassRanges', 'IsLockMassCorrected', 'CanLockMassCorrect',
+        'GetLockMassFunction', 'GetAcquisitionInfo', 'GetHeaderItemValue', 'GetHeaderSnapshot',
+        'GetScanItemValue', 'GetScanItemTable', 'GetScanIndex', 'HasScanIndex', 'GetScanItemName', 'GetItemsInFunction',
+        'GetScanRange', 'GetDriftRange', 'GetSonarRange', 'GetPrecursorMass', 'GetIndexPrecursorMassRange',
+        'GetFunctionPrecursorMassRange' ) )
+
+class MassLynxAsyncRawChromatogramReader(_MassLynxAsyncReader):
+    """
+    Async counterpart of MassLynxRawChromatogramReaderEx
+    Every read method of MassLynxRawChromatogramReaderEx is available as a coroutine with the same arguments
+    e.g. await reader.ReadMRMChromatograms( 0, [0, 1, 2] )
+    """
+    _readerType = MassLynxRawChromatogramReaderEx
+    _readerName = 'GetChromatogramReader'
+    _readMethods = frozenset( (
+        'ReadTIC', 'ReadBPI', 'ReadMassChromatogram', 'ReadMassChromatograms', 'ReadMRMChromatogram',
+        'ReadMRMChromatograms', 'ReadSonarChromatogram', 'ReadMobillogram', 'ExtractByBins' ) )
+
+class MassLynxAsyncRawScanReader(_MassLynxAsyncReader):
+    """
+    Async counterpart of MassLynxRawScanReaderEx
+    Every read method of MassLynxRawScanReaderEx is available as a coroutine with the same arguments
+    e.g. await reader.ReadScan( 0, 10 )
+    IterScans and the other iterators are not available, await ReadScan for each scan instead
+    """
+    _readerType = MassLynxRawScanReaderEx
+    _readerName = 'GetScanReader'
+    _readMethods = frozenset( (
+        'ReadScan', 'ReadScanFlags', 'ReadDriftScan', 'ReadProductScan', 'GetMassScale',
+        'ReadDriftScanIndex', 'ReadDriftScanFlagsIndex' ) )
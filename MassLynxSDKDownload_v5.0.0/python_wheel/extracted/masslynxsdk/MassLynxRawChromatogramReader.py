@@ -2,6 +2,11 @@
     MassLynx Python Chromatogram reader SDK
 '''
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from .MassLynxRawReader import MassLynxRawReader
 from .MassLynxRawDefs import MassLynxBaseType
 
@@ -9,6 +14,9 @@ from .Providers.MassLynxRawChromatogramProvider import MassLynxRawChromatogramPr
 
 class MassLynxRawChromatogramReader(MassLynxRawReader):
     """Read masslynx chromatogram data"""
+    # maximum number of MRM chromatograms read in one dll call
+    MRMChunkSize = 256
+
     def __init__(self, source, userlicense = "" ):
         super().__init__(source, MassLynxBaseType.CHROM, MassLynxRawChromatogramProvider(), userlicense)
    
@@ -41,9 +49,43 @@ class MassLynxRawChromatogramReader(MassLynxRawReader):
         super().CheckReturnCode( code )
         return times, intensities[0]
 
-    def ReadMRMChromatograms( self, whichFunction, whichMRMs ):
-        code, times, intensities =  self._provider.ReadMRMChromatograms( whichFunction, whichMRMs )
-        super().CheckReturnCode( code )
+    def ReadMRMChromatograms( self, whichFunction, whichMRMs, chunkSize = 0 ):
+        """
+        Reads the chromatograms of several MRM transitions of a function
+        All transitions share one time axis, in array mode the intensities are a float32 matrix (transitions x points)
+        Large panels are read chunkSize transitions at a time to bound the memory allocated by the dll
+
+        @param  whichFunction function index
+        @param  whichMRMs list of MRM indexes
+        @param  chunkSize maximum transitions per dll call, 0 for MRMChunkSize
+
+        @return times, intensities (one row per MRM)
+        """
+        if (0 >= chunkSize):
+            chunkSize = self.MRMChunkSize
+
+        # small panel - one call
+        whichMRMs = list(whichMRMs)
+        if (len(whichMRMs) <= chunkSize):
+            code, times, intensities =  self._provider.ReadMRMChromatograms( whichFunction, whichMRMs )
+            super().CheckReturnCode( code )
+            return times, intensities
+
+        # large panel - fill the rows chunk by chunk
+        times = None
+        intensities = None
+        for start in range(0, len(whichMRMs), chunkSize):
+            code, chunkTimes, chunkIntensities = self._provider.ReadMRMChromatograms( whichFunction, whichMRMs[start:start + chunkSize] )
+            super().CheckReturnCode( code )
+            if (None is times):
+                times = chunkTimes
+                intensities = numpy.empty( (len(whichMRMs), len(times)), dtype=numpy.float32 ) if self.GetArrayMode() else []
+
+            if self.GetArrayMode():
+                intensities[start:start + len(chunkIntensities)] = chunkIntensities
+            else:
+                intensities.extend( chunkIntensities )
+
         return times, intensities
 
     def ReadSonarChromatogram( self, whichFunction, precursorMass, precursorMassWindow, mass, massWindow  ):
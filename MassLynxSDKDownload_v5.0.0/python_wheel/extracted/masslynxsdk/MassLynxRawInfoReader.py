@@ -3,8 +3,11 @@
     MassLynx Python SDK
 '''
 
-from .MassLynxRawReader import MassLynxRawReader
-from. MassLynxRawDefs import MassLynxBaseType
+from .MassLynxRawReader import MassLynxRawReader, MassLynxException
+from. MassLynxRawDefs import MassLynxBaseType, MassLynxHeaderItem
+from .MassLynxHeaderSnapshot import MassLynxHeaderSnapshot
+from .MassLynxScanItemTable import MassLynxScanItemTable
+from .MassLynxScanIndex import MassLynxScanIndex
 
 from .Providers.MassLynxRawInfoReaderProvider import MassLynxRawInfoReaderProvider
 
@@ -12,7 +15,12 @@ class MassLynxRawInfoReader(MassLynxRawReader):
 
     def __init__(self, source, userlicense = "" ):
         super().__init__(source, MassLynxBaseType.INFO, MassLynxRawInfoReaderProvider(), userlicense)
-        
+        self._scanIndexes = {}
+
+    def Update( self ):
+        super().Update()
+        self._scanIndexes = {}
+
     def GetNumberofFunctions( self ):
         code, size = self._provider.GetNumberofFunctions()
         super().CheckReturnCode( code )
@@ -88,6 +96,18 @@ class MassLynxRawInfoReader(MassLynxRawReader):
         super().CheckReturnCode( code )
         return count
 
+    def GetMRMMassRanges( self, whichFunction ):
+        """
+        Returns the precursor (Q1) and product (Q3) mass of every MRM transition of a function
+
+        @param  whichFunction function index
+
+        @return list of Q1, list of Q3 - empty for a function that is not MRM, nan for a transition that could not be read
+        """
+        code, lowMasses, highMasses = self._provider.GetMRMMassRanges( whichFunction )
+        super().CheckReturnCode( code )
+        return lowMasses, highMasses
+
     def IsLockMassCorrected( self ):
         code, corrected = self._provider.IsLockMassCorrected()
         super().CheckReturnCode( code )
@@ -113,11 +133,90 @@ class MassLynxRawInfoReader(MassLynxRawReader):
         super().CheckReturnCode( code )
         return params
 
+    def GetHeaderSnapshot( self ):
+        """
+        Reads every header item in one call
+        If the dll rejects the call the items are read one at a time; items that still fail
+        are left out of the snapshot with their message in GetErrors
+
+        @return MassLynxHeaderSnapshot - immutable, picklable copy of the header
+        """
+        whichItems = list(MassLynxHeaderItem)
+        try:
+            params = self.GetHeaderItemValue( whichItems )
+            return MassLynxHeaderSnapshot( { item : params.Get(item) for item in whichItems } )
+        except MassLynxException:
+            pass
+
+        values = {}
+        errors = {}
+        for item in whichItems:
+            try:
+                values[ item ] = self.GetHeaderItemValue( [item] ).Get( item )
+            except MassLynxException as e:
+                errors[ item ] = e
+        return MassLynxHeaderSnapshot( values, errors )
+
     def GetScanItemValue( self, whichFunction, whichScan, whichItems ):
         code, params = self._provider.GetScanItemValue( whichFunction, whichScan, whichItems )
         super().CheckReturnCode( code )
         return params
 
+    def GetScanItemTable( self, whichFunction, whichItems, startScan = 0, endScan = -1 ):
+        """
+        Reads scan items for a range of scans in one pass, reusing a single parameter handle
+
+        @param  whichFunction function index
+        @param  whichItems list of MassLynxScanItem
+        @param  startScan first scan
+        @param  endScan last scan (inclusive), -1 for the last scan in the function
+
+        @return MassLynxScanItemTable - one column per item
+        """
+        if (0 > endScan):
+            endScan = self.GetScansInFunction( whichFunction ) - 1
+        whichScans = range(startScan, endScan + 1)
+        code, values = self._provider.GetScanItemValues( whichFunction, whichScans, whichItems )
+        super().CheckReturnCode( code )
+        return MassLynxScanItemTable( whichFunction, whichScans, whichItems, values, self.GetArrayMode() )
+
+    def GetScanIndex( self, whichFunction ):
+        """
+        Returns the scan index of a function, built on first use and kept by the reader
+        Retention time lookups, scan ranges, TIC and BPI are then answered from the index without the dll
+
+        @param  whichFunction function index
+
+        @return MassLynxScanIndex
+        """
+        index = self._scanIndexes.get( whichFunction )
+        if (None == index):
+            code, columns = self._provider.GetScanIndex( whichFunction )
+            super().CheckReturnCode( code )
+            index = MassLynxScanIndex.FromColumns( whichFunction, columns )
+            self._scanIndexes[ whichFunction ] = index
+        return index
+
+    def HasScanIndex( self, whichFunction ):
+        """
+        Returns whether the reader already holds the scan index of a function
+
+        @param  whichFunction function index
+
+        @return bool
+        """
+        return whichFunction in self._scanIndexes
+
+    def SetScanIndex( self, index ):
+        """
+        Gives the reader an index built elsewhere, e.g. loaded from a sidecar file
+
+        @param  index MassLynxScanIndex
+
+        @return void
+        """
+        self._scanIndexes[ index.GetFunction() ] = index
+
     def GetScanItemName(self, whichItems):
         code, params = self._provider.GetScanItemName( whichItems )
         super().CheckReturnCode( code )
@@ -2,7 +2,14 @@
     MassLynx Python SDK
 '''
 
-from ctypes import POINTER, c_char_p, c_int, c_void_p
+import os
+import threading
+from ctypes import POINTER, c_char_p, c_float, c_void_p, cast, sizeof
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from .Providers.MassLynxProvider import MassLynxProvider
 
@@ -23,6 +30,9 @@ class MassLynxException(Exception):
 # string handler
 class MassLynxStringHandler(object):
 
+    # set by MassLynxInstrumentation while enabled
+    _recorder = None
+
     def __init__(self):
         return
 
@@ -30,6 +40,11 @@ class MassLynxStringHandler(object):
         if (None == chString):
             return ""
 
+        if (None != MassLynxStringHandler._recorder):
+            return MassLynxStringHandler._recorder( self._ToString, chString, release )
+        return self._ToString( chString, release )
+
+    def _ToString(self, chString, release):
         strValue  = chString.value.decode()
         if (release ):
             MassLynxRawReader.ReleaseMemory(chString)
@@ -38,40 +53,270 @@ class MassLynxStringHandler(object):
 
         return strValue
 
+# buffer returned by the dll
+class MassLynxBuffer(object):
+    """
+    Array pointer filled in by the dll
+    If release is True the memory was allocated for the caller and is released exactly once,
+    by Release, at the end of a with block or when the buffer is finalized.
+    Otherwise the memory belongs to the reader / processor handle, it is only valid until the
+    next call on that handle and is never released here (same as the C++ SDK ToVector).
+    """
+
+    _lock = threading.Lock()
+    _liveCount = 0
+
+    # set by MassLynxInstrumentation while enabled, receives the bytes copied out of each buffer
+    _recorder = None
+
+    def __init__(self, dataType = c_float, release = False):
+        self._pData = c_void_p()
+        self._dataType = dataType
+        self._release = release
+        self._live = False
+
+    def __del__(self):
+        self.Release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.Release()
+
+    def Pointer(self):
+        # passed by reference to the dll
+        return self._pData
+
+    def IsNull(self):
+        return None == self._pData.value
+
+    def Release(self):
+        self._Track()
+        if (self._live):
+            MassLynxRawReader.ReleaseMemory( self._pData )
+            self._pData = c_void_p()
+            self._live = False
+            with MassLynxBuffer._lock:
+                MassLynxBuffer._liveCount -= 1
+
+    # rows is None for a single array, otherwise the number of size long rows
+    def ToList(self, size, rows = None):
+        values = []
+        if (self.IsNull() or 0 >= size):
+            values = [] if (None == rows) else [ [] for index in range(0, rows) ]
+        else:
+            self._Record(size, rows)
+            pD = cast(self._pData, POINTER(self._dataType))
+            if (None == rows):
+                values = pD[0:size]
+            else:
+                values = [ pD[index * size :(index + 1) * size] for index in range(0, rows) ]
+
+        self.Release()
+        return values
+
+    def ToNumpy(self, size, rows = None):
+        shape = (size,) if (None == rows) else (rows, size)
+        if (self.IsNull() or 0 >= size):
+            self.Release()
+            return numpy.zeros( (0,) if (None == rows) else (rows, 0), dtype=self._dataType )
+
+        self._Record(size, rows)
+
+        # borrowed memory is overwritten by the next call so take a copy
+        if (not self._release):
+            pD = cast(self._pData, POINTER(self._dataType))
+            return numpy.ctypeslib.as_array(pD, shape=shape).copy()
+
+        # owned memory is handed to the array, released when the array is freed
+        self._Track()
+        self.__array_interface__ = { 'data': (self._pData.value, False), 'shape': shape,
+                                     'typestr': numpy.dtype(self._dataType).str, 'version': 3 }
+        return numpy.asarray(self)
+
+    @staticmethod
+    def LiveCount():
+        """
+        Returns the number of dll allocations currently held by buffers or arrays
+
+        @return int
+        """
+        with MassLynxBuffer._lock:
+            return MassLynxBuffer._liveCount
+
+    def _Record(self, size, rows):
+        if (None != MassLynxBuffer._recorder):
+            MassLynxBuffer._recorder( size * (1 if None == rows else rows) * sizeof(self._dataType) )
+
+    def _Track(self):
+        if (self._release and not self._live and not self.IsNull()):
+            self._live = True
+            with MassLynxBuffer._lock:
+                MassLynxBuffer._liveCount += 1
+
+# array handler
+class MassLynxArrayHandler(object):
+
+    def __init__(self):
+        self._arrayMode = False
+        return
+
+    def SetArrayMode(self, arrayMode):
+        if (arrayMode and None == numpy):
+            raise ImportError( "numpy is required for array mode" )
+        self._arrayMode = bool(arrayMode)
+
+    def GetArrayMode(self):
+        return self._arrayMode
+
+    def ToArray(self, buffer, size, rows = None):
+        # list mode - one python object per value
+        if (not self._arrayMode):
+            return buffer.ToList(size, rows)
+
+        # array mode - numpy array over the native buffer
+        return buffer.ToNumpy(size, rows)
+
 
 class MassLynxCodeHandler(object):
     def __init__(self):
-        self._code = 0
+        # the last code is kept per thread so a handle can be shared between threads
+        self._last = threading.local()
         self._stringHandler = MassLynxStringHandler()
         return
 
     # three options true, false, throw exception
     def CheckReturnCode( self, code, throw = True ):
-        self._code = code
+        self._last.code = code
         if (0 == code):
             return True
 
         if (throw):
-            raise MassLynxException( self.GetLastCode(), self.GetLastMessage() )
+            raise MassLynxException( code, self.GetMessage( code ) )
 
         # get last error
         return False
 
     def GetLastCode(self):
-        return self._code
+        return getattr( self._last, 'code', 0 )
 
     def GetLastMessage(self):
+        return self.GetMessage( self.GetLastCode() )
+
+    def GetMessage(self, code):
         # load the dll
         getErrorMessage = MassLynxProvider.MassLynxDll.getErrorMessage
-        getErrorMessage.argtypes = [ c_int, POINTER(c_char_p)]
 
         message = (c_char_p)()
-        getErrorMessage( self.GetLastCode(), message )
+        getErrorMessage( code, message )
 
         # release the memory
         return self._stringHandler.ToString(message, True)
 ## \endcond
     
+class MassLynxRawBackend(object):
+    """
+    Selects how raw files opened from a path are read
+    DLL - MassLynxRaw library (default)
+    MMAP - read-only python parser of the .raw directory (numpy), for the info, scan and chromatogram readers
+           experimental: its peak decoding has not been checked against the dll on reference files
+           (benchmarks/bench_backends.py), it must be enabled with Set( MMAP, experimental = True )
+           or MASSLYNX_EXPERIMENTAL=1
+    SYNTHETIC - generated data for benchmarks and tests without the dll or real files, same readers as MMAP
+    The default can also be set with the MASSLYNX_BACKEND environment variable.
+    Paths made by SyntheticPath always use the synthetic backend.
+    Readers created from another reader always use the backend of that reader.
+    """
+
+    DLL = "dll"
+    MMAP = "mmap"
+    SYNTHETIC = "synthetic"
+
+    _backend = os.environ.get( "MASSLYNX_BACKEND", DLL ).lower()
+    _experimental = "1" == os.environ.get( "MASSLYNX_EXPERIMENTAL", "0" )
+
+    @staticmethod
+    def Set( backend, experimental = False ):
+        """
+        Sets the backend used for readers opened from a path
+
+        @param  backend MassLynxRawBackend.DLL, MMAP or SYNTHETIC
+        @param  experimental True to allow the experimental MMAP backend
+
+        @return void
+        """
+        backend = str(backend).lower()
+        if (backend not in (MassLynxRawBackend.DLL, MassLynxRawBackend.MMAP, MassLynxRawBackend.SYNTHETIC)):
+            raise MassLynxException( 1, "unknown backend: %s" % backend )
+        if (experimental):
+            MassLynxRawBackend._experimental = True
+        MassLynxRawBackend._CheckExperimental( backend )
+        MassLynxRawBackend._backend = backend
+
+    @staticmethod
+    def Get():
+        """
+        Returns the backend used for readers opened from a path
+
+        @return string
+        """
+        return MassLynxRawBackend._backend
+
+    @staticmethod
+    def SyntheticPath( **parameters ):
+        """
+        Returns a path that opens a generated run, e.g. SyntheticPath( functions=2, scans=600, mrm=40 )
+        Parameters: functions, scans, points, mrm, drift, compounds, runtime, lowmass, highmass, noise, seed
+
+        @return string
+        """
+        return "synthetic:" + ",".join( "%s=%s" % (name, value) for name, value in sorted( parameters.items() ) )
+
+    @staticmethod
+    def IsSyntheticPath( path ):
+        """
+        Returns True for paths made by SyntheticPath
+
+        @return bool
+        """
+        return isinstance(path, str) and path.startswith( "synthetic:" )
+
+    ## \cond
+    @staticmethod
+    def _CheckExperimental( backend ):
+        if (MassLynxRawBackend.MMAP == backend and not MassLynxRawBackend._experimental):
+            raise MassLynxException( 1, "the mmap backend is experimental, check it with benchmarks/bench_backends.py "
+                                        "and enable it with Set( MMAP, experimental = True ) or MASSLYNX_EXPERIMENTAL=1" )
+
+    @staticmethod
+    def _SelectProvider( source, mlType, mlProvider ):
+        from .Providers.MassLynxMmapProvider import MassLynxMmapReaderBaseProvider, MassLynxMmapProviders
+
+        if (isinstance(source, MassLynxRawReader)):
+            if (not isinstance(source._provider, MassLynxMmapReaderBaseProvider)):
+                return mlProvider
+            backend = source._provider._backendName
+        elif (MassLynxRawBackend.IsSyntheticPath( source )):
+            backend = MassLynxRawBackend.SYNTHETIC
+        else:
+            backend = MassLynxRawBackend._backend
+
+        if (MassLynxRawBackend.SYNTHETIC == backend):
+            from .Providers.MassLynxSyntheticProvider import MassLynxSyntheticProviders
+            providers = MassLynxSyntheticProviders
+        elif (MassLynxRawBackend.MMAP == backend):
+            MassLynxRawBackend._CheckExperimental( backend )
+            providers = MassLynxMmapProviders
+        else:
+            return mlProvider
+
+        providerType = providers.get( mlType )
+        if (None == providerType):
+            raise MassLynxException( 1, "%s readers are not supported by the %s backend" % (getattr( mlType, "name", mlType ), backend) )
+        return providerType()
+    ## \endcond
+
 class MassLynxRawReader():
     """basic functionality to read raw files"""
             
@@ -79,8 +324,8 @@ class MassLynxRawReader():
 
         self._codeHandler = MassLynxCodeHandler()
         
-        # provider - link to the dll
-        self._provider = mlProvider
+        # provider - link to the dll, or to the python parser / generator of the mmap and synthetic backends
+        self._provider = MassLynxRawBackend._SelectProvider( source, mlType, mlProvider )
 
         # create scan reader from a path
         if (isinstance(source, str) ):
@@ -94,6 +339,9 @@ class MassLynxRawReader():
             # pass the provider
             code = self._provider.createRawReaderFromReader(source._provider, mlType)
             self._codeHandler.CheckReturnCode(code)
+
+            # derived readers return the same data representation
+            self._provider.SetArrayMode(source.GetArrayMode())
         
         # did we fall through
         else:
@@ -102,6 +350,27 @@ class MassLynxRawReader():
     def Update( self ):
         code = self._provider.updateRawReader()
         self.CheckReturnCode(code)
+
+    def SetArrayMode( self, arrayMode = True ):
+        """
+        Selects how data arrays are returned by the reader
+        In array mode masses, times and intensities are returned as float32 numpy arrays
+        copied once from the native buffer, otherwise as python lists
+
+        @param  arrayMode True to return numpy arrays (requires numpy)
+
+        @return self
+        """
+        self._provider.SetArrayMode(arrayMode)
+        return self
+
+    def GetArrayMode( self ):
+        """
+        Returns True if the reader returns numpy arrays
+
+        @return bool
+        """
+        return self._provider.GetArrayMode()
     
     ## \cond
     def CheckReturnCode(self, code, throw = True):
@@ -111,6 +380,5 @@ class MassLynxRawReader():
     @staticmethod
     def ReleaseMemory( address):
         releaseMemory = MassLynxProvider.MassLynxDll.releaseMemory
-        releaseMemory.argtypes = [ c_void_p]
         releaseMemory( address )
     ## \endcond
\ No newline at end of file
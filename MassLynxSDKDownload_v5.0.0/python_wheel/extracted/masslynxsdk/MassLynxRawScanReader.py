@@ -4,6 +4,8 @@
 
 from .MassLynxRawReader import MassLynxRawReader
 from .MassLynxRawDefs import MassLynxBaseType
+from .MassLynxRawInfoReader import MassLynxRawInfoReader
+from .MassLynxScanIterator import MassLynxScanIterator
 
 from .Providers.MassLynxRawScanReaderProvider import MassLynxRawScanReaderProvider
 
@@ -66,6 +68,57 @@ class MassLynxRawScanReader(MassLynxRawReader):
         super().CheckReturnCode( code )
         return masses, intensities, productMasses
 
+    def IterScans( self, whichFunction, startScan = 0, endScan = -1, prefetch = 8 ):
+        """
+        Streams the scans of a function, read ahead on a background thread
+
+        @param  whichFunction requested function
+        @param  startScan first scan
+        @param  endScan last scan (inclusive), -1 for the last scan of the function
+        @param  prefetch maximum number of scans read ahead
+
+        @return MassLynxScanIterator yielding (scan, retention time, masses, intensities)
+        """
+        return self._Iterate( whichFunction, startScan, endScan, prefetch, 'scan' )
+
+    def IterScanFlags( self, whichFunction, startScan = 0, endScan = -1, prefetch = 8 ):
+        """
+        Streams the scans of a function with their flags, read ahead on a background thread
+
+        @param  whichFunction requested function
+        @param  startScan first scan
+        @param  endScan last scan (inclusive), -1 for the last scan of the function
+        @param  prefetch maximum number of scans read ahead
+
+        @return MassLynxScanIterator yielding (scan, retention time, masses, intensities, flags)
+        """
+        return self._Iterate( whichFunction, startScan, endScan, prefetch, 'flags' )
+
+    def IterDriftScans( self, whichFunction, startScan = 0, endScan = -1, prefetch = 8 ):
+        """
+        Streams every drift scan of the scans of a function, read ahead on a background thread
+
+        @param  whichFunction requested function
+        @param  startScan first scan
+        @param  endScan last scan (inclusive), -1 for the last scan of the function
+        @param  prefetch maximum number of drift scans read ahead
+
+        @return MassLynxScanIterator yielding (scan, drift, retention time, masses, intensities)
+        """
+        return self._Iterate( whichFunction, startScan, endScan, prefetch, 'drift' )
+
+    ## \cond
+    def _Iterate( self, whichFunction, startScan, endScan, prefetch, mode ):
+        # the iterator reads through its own handles, derived from this reader
+        scanReader = MassLynxRawScanReader( self )
+        try:
+            infoReader = MassLynxRawInfoReader( self )
+        except:
+            scanReader._provider.destroyRawReader()
+            raise
+        return MassLynxScanIterator( scanReader, infoReader, whichFunction, startScan, endScan, prefetch, mode )
+    ## \endcond
+
 ## \cond    
 class MassLynxRawScanReaderEx(MassLynxRawScanReader):
     def __init__(self, source, userlicense = ""):
@@ -0,0 +1,254 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import os
+import threading
+
+from .MassLynxRawReader import MassLynxException
+from .MassLynxRawInfoReader import MassLynxRawInfoReaderEx
+from .MassLynxRawChromatogramReader import MassLynxRawChromatogramReaderEx
+from .MassLynxRawScanReader import MassLynxRawScanReaderEx
+from .MassLynxRawAnalogReader import MassLynxRawAnalogReader
+from .MassLynxScanIndex import MassLynxScanIndex
+from .MassLynxTransitionTable import MassLynxTransitionTable
+
+class MassLynxRawSession(object):
+    """
+    Opens a raw file once and shares the handle between readers
+    The info reader is opened from the path, the chromatogram, scan and analog readers are created
+    from it on first use, so the raw directory is only parsed once.
+    Readers returned by the session must not be used after Close, use the session as a context manager.
+    Readers of one session share native buffers, to use a session from several threads hold Lock()
+    around each read, or give every thread its own session with MassLynxRawThreadSessions.
+    """
+
+    def __init__(self, path, userlicense = "", arrayMode = False ):
+        self._path = path
+        self._lock = threading.Lock()
+        self._useLock = threading.RLock()
+        self._readers = {}
+        self._transitionTable = None
+
+        # the only reader opened from the path
+        info = MassLynxRawInfoReaderEx( path, userlicense )
+        info.SetArrayMode( arrayMode )
+        self._readers[ MassLynxRawInfoReaderEx ] = info
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.Close()
+
+    def GetPath( self ):
+        """
+        Returns the path of the raw file
+
+        @return string
+        """
+        return self._path
+
+    def GetInfoReader( self ):
+        """
+        Returns the info reader of the session
+
+        @return MassLynxRawInfoReaderEx
+        """
+        return self._GetReader( MassLynxRawInfoReaderEx )
+
+    def GetChromatogramReader( self ):
+        """
+        Returns the chromatogram reader, created from the session handle on first use
+
+        @return MassLynxRawChromatogramReaderEx
+        """
+        return self._GetReader( MassLynxRawChromatogramReaderEx )
+
+    def GetScanReader( self ):
+        """
+        Returns the scan reader, created from the session handle on first use
+
+        @return MassLynxRawScanReaderEx
+        """
+        return self._GetReader( MassLynxRawScanReaderEx )
+
+    def GetAnalogReader( self ):
+        """
+        Returns the analog reader, created from the session handle on first use
+
+        @return MassLynxRawAnalogReader
+        """
+        return self._GetReader( MassLynxRawAnalogReader )
+
+    def GetScanIndex( self, whichFunction, sidecar = False ):
+        """
+        Returns the scan index of a function, see MassLynxRawInfoReader.GetScanIndex
+        With sidecar the index is read from GetScanIndexPath( whichFunction ) when it matches the raw files,
+        otherwise built and written there for the next session (a read-only or missing location is ignored)
+
+        @param  whichFunction function index
+        @param  sidecar use a sidecar file next to the raw directory
+
+        @return MassLynxScanIndex
+        """
+        info = self.GetInfoReader()
+        if (not sidecar or info.HasScanIndex( whichFunction ) or not os.path.isdir( self._path )):
+            return info.GetScanIndex( whichFunction )
+
+        path = self.GetScanIndexPath( whichFunction )
+        try:
+            signature = MassLynxScanIndex.Signature( self._path )
+            index = MassLynxScanIndex.Load( path, signature )
+        except OSError:
+            return info.GetScanIndex( whichFunction )
+        if (None != index):
+            info.SetScanIndex( index )
+            return index
+
+        index = info.GetScanIndex( whichFunction )
+        try:
+            index.Save( path, signature )
+        except OSError:
+            pass
+        return index
+
+    def GetTransitionTable( self ):
+        """
+        Returns the MRM transitions of every function, built on first use and kept by the session
+
+        @return MassLynxTransitionTable
+        """
+        if (None == self._transitionTable):
+            self._transitionTable = MassLynxTransitionTable.Build( self.GetInfoReader(), self._path )
+        return self._transitionTable
+
+    def GetScanIndexPath( self, whichFunction ):
+        """
+        Returns the sidecar file of a function index, next to the raw directory
+
+        @param  whichFunction function index
+
+        @return string - <run>.raw.f<n>.scanindex.npz
+        """
+        return "%s.f%d.scanindex.npz" % ( os.path.normpath( self._path ), whichFunction + 1 )
+
+    def Lock( self ):
+        """
+        Returns the lock that serializes reads on the session handles
+
+        @return threading.RLock - use in a with block
+        """
+        return self._useLock
+
+    def GetHandleCount( self ):
+        """
+        Returns the number of native reader handles held by the session
+
+        @return int
+        """
+        return len(self._readers)
+
+    def IsOpen( self ):
+        """
+        Returns True until the session is closed
+
+        @return bool
+        """
+        return 0 < len(self._readers)
+
+    def Update( self ):
+        """
+        Refreshes every open reader, for files that are still being acquired
+
+        @return void
+        """
+        with self._lock:
+            for reader in self._readers.values():
+                reader.Update()
+            self._transitionTable = None
+
+    def Close( self ):
+        """
+        Destroys every reader of the session, derived readers first
+
+        @return void
+        """
+        with self._lock:
+            readers = list(self._readers.items())
+            self._readers = {}
+
+        for readerType, reader in reversed( readers ):
+            reader._provider.destroyRawReader()
+
+    ## \cond
+    def _GetReader( self, readerType ):
+        with self._lock:
+            if (not self._readers):
+                raise MassLynxException( 1, "Raw session is closed" )
+
+            reader = self._readers.get( readerType )
+            if (None == reader):
+                reader = readerType( self._readers[ MassLynxRawInfoReaderEx ] )
+                self._readers[ readerType ] = reader
+
+            return reader
+    ## \endcond
+
+class MassLynxRawThreadSessions(object):
+    """
+    One MassLynxRawSession per thread for the same raw file
+    Each worker thread gets its own reader handles, so reads run in parallel without locking
+    (the dll is called without the GIL)
+    """
+
+    def __init__(self, path, userlicense = "", arrayMode = False ):
+        self._path = path
+        self._license = userlicense
+        self._arrayMode = arrayMode
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.Close()
+
+    def Get( self ):
+        """
+        Returns the session of the calling thread, opened on first use
+
+        @return MassLynxRawSession
+        """
+        session = getattr( self._local, 'session', None )
+        if (None == session):
+            session = MassLynxRawSession( self._path, self._license, self._arrayMode )
+            self._local.session = session
+            with self._lock:
+                self._sessions.append( session )
+        return session
+
+    def GetSessionCount( self ):
+        """
+        Returns the number of sessions opened so far
+
+        @return int
+        """
+        with self._lock:
+            return len( self._sessions )
+
+    def Close( self ):
+        """
+        Closes the sessions of every thread
+
+        @return void
+        """
+        with self._lock:
+            sessions = self._sessions
+            self._sessions = []
+        for session in sessions:
+            session.Close()
+        self._local = threading.local()
@@ -0,0 +1,268 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .MassLynxRawSession import MassLynxRawSession
+
+## \cond
+class _MassLynxPoolEntry(object):
+    __slots__ = ('key', 'session', 'fingerprint', 'leases', 'retired')
+
+    def __init__(self, key, session, fingerprint):
+        self.key = key
+        self.session = session
+        self.fingerprint = fingerprint
+        self.leases = 0
+        self.retired = False
+## \endcond
+
+class MassLynxRawSessionPool(object):
+    """
+    Keeps raw sessions open between requests, keyed by path
+    Least recently used sessions are closed when the pool holds more than maxHandles reader handles.
+    On every Acquire the raw directory is checked (file sizes and modification times); if it changed
+    the session is refreshed with Update() while holding its Lock(), or reopened if the update fails.
+    Sessions in use are never closed, an evicted session is closed when its last lease is released.
+    """
+
+    _defaultPool = None
+    _defaultLock = threading.Lock()
+
+    def __init__(self, maxHandles = 64, userlicense = "", arrayMode = False, revalidate = True ):
+        self._maxHandles = maxHandles
+        self._license = userlicense
+        self._arrayMode = arrayMode
+        self._revalidate = revalidate
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._leased = {}
+        self._stats = { 'hits' : 0, 'misses' : 0, 'evictions' : 0, 'updates' : 0, 'reopens' : 0 }
+
+    @staticmethod
+    def Default():
+        """
+        Returns the process-wide pool, created on first use
+
+        @return MassLynxRawSessionPool
+        """
+        with MassLynxRawSessionPool._defaultLock:
+            if (None == MassLynxRawSessionPool._defaultPool):
+                MassLynxRawSessionPool._defaultPool = MassLynxRawSessionPool()
+            return MassLynxRawSessionPool._defaultPool
+
+    def SetLicense( self, userlicense ):
+        """
+        Sets the license used to open new sessions
+
+        @param  userlicense the user license key
+
+        @return self
+        """
+        self._license = userlicense
+        return self
+
+    def SetMaxHandles( self, maxHandles ):
+        """
+        Sets the maximum number of reader handles kept open, evicting if needed
+
+        @param  maxHandles handle budget
+
+        @return self
+        """
+        with self._lock:
+            self._maxHandles = maxHandles
+            retired = self._Evict()
+        self._CloseEntries( retired )
+        return self
+
+    def Acquire( self, path ):
+        """
+        Returns an open session for path, must be given back with Release
+
+        @param  path raw file path
+
+        @return MassLynxRawSession
+        """
+        key = os.path.normcase( os.path.abspath( path ) )
+        with self._lock:
+            entry = self._entries.get( key )
+            if (None != entry):
+                self._entries.move_to_end( key )
+                self._stats['hits'] += 1
+                entry.leases += 1
+            else:
+                self._stats['misses'] += 1
+
+        # revalidate or open outside the pool lock
+        retired = []
+        if (None != entry):
+            entry = self._Revalidate( entry, retired )
+        else:
+            entry = self._Open( key, path, retired )
+
+        with self._lock:
+            self._leased[ id(entry.session) ] = entry
+            retired.extend( self._Evict() )
+        self._CloseEntries( retired )
+
+        return entry.session
+
+    def Release( self, session ):
+        """
+        Gives back a session returned by Acquire
+
+        @param  session MassLynxRawSession
+
+        @return void
+        """
+        with self._lock:
+            entry = self._leased.get( id(session) )
+            if (None == entry):
+                return
+            entry.leases -= 1
+            if (0 == entry.leases):
+                del self._leased[ id(session) ]
+            retired = self._Evict()
+            if (entry.retired and 0 == entry.leases):
+                retired.append( entry )
+        self._CloseEntries( retired )
+
+    @contextmanager
+    def Session( self, path, exclusive = True ):
+        """
+        Context manager for Acquire / Release
+        A pooled session can be handed to several threads, by default it is also locked
+        for the duration of the block so reads on its handles are serialized
+
+        @param  path raw file path
+        @param  exclusive hold the session Lock() inside the block
+
+        @return MassLynxRawSession
+        """
+        session = self.Acquire( path )
+        try:
+            if (exclusive):
+                with session.Lock():
+                    yield session
+            else:
+                yield session
+        finally:
+            self.Release( session )
+
+    def Clear( self ):
+        """
+        Closes every idle session, sessions in use are closed when released
+
+        @return void
+        """
+        with self._lock:
+            entries = list( self._entries.values() )
+            self._entries.clear()
+            retired = []
+            for entry in entries:
+                entry.retired = True
+                if (0 == entry.leases):
+                    retired.append( entry )
+        self._CloseEntries( retired )
+
+    def GetStats( self ):
+        """
+        Returns pool statistics: hits, misses, evictions, updates, reopens, sessions and handles
+
+        @return dict
+        """
+        with self._lock:
+            stats = dict( self._stats )
+            stats['sessions'] = len( self._entries )
+            stats['handles'] = self._HandleCount()
+            return stats
+
+    ## \cond
+    @staticmethod
+    def _Fingerprint( path ):
+        # sizes and modification times of the files in the raw directory
+        entries = []
+        try:
+            with os.scandir( path ) as it:
+                for item in it:
+                    if item.is_file():
+                        stat = item.stat()
+                        entries.append( (item.name, stat.st_size, stat.st_mtime_ns) )
+        except OSError:
+            return None
+        return hash( tuple( sorted(entries) ) )
+
+    def _Open( self, key, path, retired ):
+        session = MassLynxRawSession( path, self._license, self._arrayMode )
+        entry = _MassLynxPoolEntry( key, session, self._Fingerprint( path ) )
+        entry.leases = 1
+        with self._lock:
+            # another thread may have opened the same file meanwhile
+            previous = self._entries.pop( key, None )
+            if (None != previous and not previous.retired):
+                previous.retired = True
+                if (0 == previous.leases):
+                    retired.append( previous )
+            self._entries[ key ] = entry
+        return entry
+
+    def _Revalidate( self, entry, retired ):
+        if (not self._revalidate):
+            return entry
+
+        fingerprint = self._Fingerprint( entry.session.GetPath() )
+        if (fingerprint == entry.fingerprint):
+            return entry
+
+        # file changed - refresh in place, reopen if the update fails
+        # other leases may be reading through the same handles, update under the session lock
+        try:
+            with entry.session.Lock():
+                entry.session.Update()
+            entry.fingerprint = fingerprint
+            with self._lock:
+                self._stats['updates'] += 1
+            return entry
+        except Exception:
+            pass
+
+        with self._lock:
+            entry.leases -= 1
+            entry.retired = True
+            if (0 == entry.leases):
+                self._leased.pop( id(entry.session), None )
+                retired.append( entry )
+            self._stats['reopens'] += 1
+        return self._Open( entry.key, entry.session.GetPath(), retired )
+
+    def _HandleCount( self ):
+        return sum( entry.session.GetHandleCount() for entry in self._entries.values() )
+
+    def _Evict( self ):
+        # called with the pool lock held, returns the entries to close
+        retired = []
+        handles = self._HandleCount()
+        for key in list( self._entries.keys() ):
+            if (handles <= self._maxHandles):
+                break
+            entry = self._entries[ key ]
+            if (0 < entry.leases):
+                continue
+            del self._entries[ key ]
+            entry.retired = True
+            handles -= entry.session.GetHandleCount()
+            self._stats['evictions'] += 1
+            retired.append( entry )
+        return retired
+
+    @staticmethod
+    def _CloseEntries( entries ):
+        for entry in entries:
+            entry.session.Close()
+    ## \endcond
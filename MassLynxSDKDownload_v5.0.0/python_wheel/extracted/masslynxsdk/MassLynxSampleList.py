@@ -1,5 +1,5 @@
 
-from ctypes import POINTER, c_char_p, c_void_p
+from ctypes import c_char_p, c_void_p
 from .MassLynxProcessorBase import MassLynxCodeHandler, MassLynxStringHandler
 
 from .Providers.MassLynxProvider import MassLynxProvider
@@ -15,13 +15,11 @@ class MassLynxSampleList(object):
         self._codeHandler = MassLynxCodeHandler()
         self._stringHandler = MassLynxStringHandler()       
         createSampleList = MassLynxProvider.MassLynxDll.createSampleList
-        createSampleList.argtypes = [POINTER(c_void_p)]
         self.CheckReturnCode(createSampleList(self._mlSampleList))
 
     # destroy the samplelist
     def __del__(self):
         destroySampleList = MassLynxProvider.MassLynxDll.destroySampleList
-        destroySampleList.argtypes = [c_void_p]          
         destroySampleList( self._mlSampleList )
 
     # get the sample list in csv
@@ -33,7 +31,6 @@ class MassLynxSampleList(object):
         """
         temp = c_char_p()
         sampleListToString = MassLynxProvider.MassLynxDll.sampleListToString
-        sampleListToString.argtypes = [c_void_p, POINTER(c_char_p)]
         self.CheckReturnCode( sampleListToString(self._mlSampleList, temp) )
         return self._stringHandler.ToString( temp, False )
 
@@ -44,7 +41,6 @@ class MassLynxSampleList(object):
         @param row key value pairs of MassLynxSampleList Items
         """
         addSampleListRow = MassLynxProvider.MassLynxDll.addSampleListRow
-        addSampleListRow.argtypes = [c_void_p, c_void_p]
         return self.CheckReturnCode( addSampleListRow(self._mlSampleList, row.GetParameters()) )
 
     # get the error message
@@ -0,0 +1,203 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import hashlib
+import os
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+## \cond
+MassLynxScanIndexRecord = [ ('rt', '<f4'), ('tic', '<f4'), ('basePeakMass', '<f4'), ('basePeakIntensity', '<f4'), ('offset', '<i8'), ('peaks', '<i4') ]
+## \endcond
+
+class MassLynxScanIndex(object):
+    """
+    Per scan index of one function, held as a structured numpy array
+    Fields: rt, tic, basePeakMass, basePeakIntensity, offset (in _FUNCnnn.DAT) and peaks,
+    offset and peaks are -1 when the backend does not expose them.
+    Built once from the function's index data, then retention time lookups are binary searches
+    and TIC / BPI are slices of the table.
+    """
+
+    def __init__(self, whichFunction, table):
+        self._function = whichFunction
+        self._table = table
+
+    def __len__(self):
+        return len(self._table)
+
+    @staticmethod
+    def FromColumns( whichFunction, columns ):
+        """
+        Creates the index from a dict of columns, missing columns are filled with -1
+
+        @param  whichFunction function index
+        @param  columns dict of field name -> sequence
+
+        @return MassLynxScanIndex
+        """
+        if (None == numpy):
+            raise ImportError( "numpy is required for the scan index" )
+        size = len( columns['rt'] )
+        table = numpy.full( size, -1, dtype=MassLynxScanIndexRecord )
+        for name, values in columns.items():
+            table[ name ] = values
+        return MassLynxScanIndex( whichFunction, table )
+
+    def GetFunction( self ):
+        """
+        Returns the function of the index
+
+        @return int
+        """
+        return self._function
+
+    def GetTable( self ):
+        """
+        Returns the structured array, one record per scan
+
+        @return numpy structured array
+        """
+        return self._table
+
+    def GetRetentionTimes( self ):
+        """
+        Returns the retention time of every scan
+
+        @return float32 array
+        """
+        return self._table['rt']
+
+    def GetRetentionTime( self, whichScan ):
+        """
+        Returns the retention time of a scan
+
+        @param  whichScan requested scan
+
+        @return float
+        """
+        return float( self._table['rt'][ whichScan ] )
+
+    def GetScan( self, retentionTime ):
+        """
+        Returns the scan closest to a retention time
+
+        @param  retentionTime time in minutes
+
+        @return int
+        """
+        rt = self._table['rt']
+        if (0 == len(rt)):
+            return -1
+        retentionTime = rt.dtype.type( retentionTime )
+        scan = int( numpy.searchsorted( rt, retentionTime ) )
+        if (scan >= len(rt)):
+            return len(rt) - 1
+        if (scan > 0 and retentionTime - rt[scan - 1] <= rt[scan] - retentionTime):
+            return scan - 1
+        return scan
+
+    def GetScanRange( self, startTime, endTime ):
+        """
+        Returns the first and last scan acquired between two retention times
+
+        @param  startTime start time in minutes
+        @param  endTime end time in minutes
+
+        @return startScan, endScan (inclusive), endScan < startScan if no scan is in the range
+        """
+        # compare in the precision of the table, 0.1 is not below float32( 0.1 )
+        rt = self._table['rt']
+        startScan = int( numpy.searchsorted( rt, rt.dtype.type( startTime ), side='left' ) )
+        endScan = int( numpy.searchsorted( rt, rt.dtype.type( endTime ), side='right' ) ) - 1
+        return startScan, endScan
+
+    def GetTIC( self, startScan = 0, endScan = -1 ):
+        """
+        Returns the TIC chromatogram of a scan range, views of the table
+
+        @param  startScan first scan
+        @param  endScan last scan (inclusive), -1 for the last scan
+
+        @return times, intensities
+        """
+        rows = self._Rows( startScan, endScan )
+        return rows['rt'], rows['tic']
+
+    def GetBPI( self, startScan = 0, endScan = -1 ):
+        """
+        Returns the BPI chromatogram of a scan range, views of the table
+
+        @param  startScan first scan
+        @param  endScan last scan (inclusive), -1 for the last scan
+
+        @return times, intensities
+        """
+        rows = self._Rows( startScan, endScan )
+        return rows['rt'], rows['basePeakIntensity']
+
+    def Save( self, path, signature = "" ):
+        """
+        Writes the index to a .npz file
+
+        @param  path file to write
+        @param  signature string identifying the raw data, checked by Load
+
+        @return void
+        """
+        # write to a temporary file first so a reader never sees half a file
+        temp = path + ".tmp"
+        with open( temp, 'wb' ) as f:
+            numpy.savez( f, table=self._table, function=self._function, signature=signature )
+        os.replace( temp, path )
+
+    @staticmethod
+    def Load( path, signature = None ):
+        """
+        Reads an index written by Save
+
+        @param  path file to read
+        @param  signature expected signature, None to skip the check
+
+        @return MassLynxScanIndex, or None if the file is missing, unreadable or stale
+        """
+        if (None == numpy):
+            raise ImportError( "numpy is required for the scan index" )
+        try:
+            with numpy.load( path, allow_pickle=False ) as data:
+                if (None != signature and str(data['signature']) != signature):
+                    return None
+                if (data['table'].dtype != numpy.dtype( MassLynxScanIndexRecord )):
+                    return None
+                return MassLynxScanIndex( int(data['function']), data['table'] )
+        except (OSError, KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def Signature( path ):
+        """
+        Returns a stable signature of a raw directory: names, sizes and modification times of its files
+
+        @param  path raw directory
+
+        @return string
+        """
+        entries = []
+        with os.scandir( path ) as it:
+            for item in it:
+                if item.is_file():
+                    stat = item.stat()
+                    entries.append( "%s:%d:%d" % (item.name, stat.st_size, stat.st_mtime_ns) )
+        return hashlib.sha1( "\n".join( sorted(entries) ).encode() ).hexdigest()
+
+    ## \cond
+    def _Rows( self, startScan, endScan ):
+        if (0 > endScan):
+            endScan = len(self._table) - 1
+        return self._table[ startScan : endScan + 1 ]
+    ## \endcond
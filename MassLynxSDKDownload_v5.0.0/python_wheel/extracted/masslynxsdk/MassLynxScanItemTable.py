@@ -0,0 +1,102 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .MassLynxRawDefs import MassLynxScanItem
+
+class MassLynxScanItemTable(object):
+    """
+    Scan item values of a function, one column per MassLynxScanItem
+    Numeric items are float64 columns (nan where the scan has no value), other items are string columns
+    In array mode the columns are numpy arrays, otherwise python lists
+    """
+
+    def __init__(self, whichFunction, whichScans, whichItems, values, arrayMode = False):
+        self._function = whichFunction
+        self._items = [ MassLynxScanItem(item) for item in whichItems ]
+        self._arrayMode = arrayMode
+        if (arrayMode):
+            self._scans = numpy.asarray( whichScans, dtype=numpy.int32 )
+            self._columns = { item : self._ToArray( column ) for item, column in zip(self._items, values) }
+        else:
+            self._scans = list( whichScans )
+            self._columns = { item : self._ToList( column ) for item, column in zip(self._items, values) }
+
+    def __len__(self):
+        return len(self._scans)
+
+    def __getitem__(self, whichItem):
+        return self.GetColumn( whichItem )
+
+    def __contains__(self, whichItem):
+        return whichItem in self._columns
+
+    def GetFunction( self ):
+        """
+        Returns the function the table was read from
+
+        @return int
+        """
+        return self._function
+
+    def GetScans( self ):
+        """
+        Returns the scan index of each row
+
+        @return scans
+        """
+        return self._scans
+
+    def GetItems( self ):
+        """
+        Returns the items in the table
+
+        @return list of MassLynxScanItem
+        """
+        return list( self._items )
+
+    def GetColumn( self, whichItem ):
+        """
+        Returns the values of one item for every scan
+
+        @param  whichItem MassLynxScanItem
+
+        @return column
+        """
+        return self._columns[ MassLynxScanItem(whichItem) ]
+
+    def ToDict( self ):
+        """
+        Returns the columns keyed by item name, with the scan indexes under 'SCAN'
+
+        @return dict
+        """
+        columns = { 'SCAN' : self._scans }
+        for item in self._items:
+            columns[ item.name ] = self._columns[ item ]
+        return columns
+
+    ## \cond
+    @staticmethod
+    def _ToArray( column ):
+        # decode once, numeric conversion in a single pass
+        strings = numpy.array( [ b'' if None == value else value for value in column ], dtype=numpy.bytes_ )
+        try:
+            return numpy.where( strings == b'', b'nan', strings ).astype( numpy.float64 )
+        except ValueError:
+            return numpy.char.decode( strings )
+
+    @staticmethod
+    def _ToList( column ):
+        strings = [ '' if None == value else value.decode() for value in column ]
+        try:
+            return [ float(value) if value else float('nan') for value in strings ]
+        except ValueError:
+            return strings
+    ## \endcond
@@ -0,0 +1,143 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import queue
+import threading
+
+## \cond
+_END = object()
+
+class _MassLynxIteratorError(object):
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+## \endcond
+
+class MassLynxScanIterator(object):
+    """
+    Streams the scans of a function, read ahead on a background thread
+    At most prefetch scans wait in a bounded queue, so memory does not depend on the length of the run.
+    The iterator reads through its own scan and info readers, created from the source reader,
+    so the source reader can still be used while iterating.
+    The background thread starts with the first iteration, so an iterator that is never iterated
+    holds no thread and is collected with its readers.
+    Close the iterator (or leave the with block / the for loop) to stop the background thread.
+    """
+
+    def __init__(self, scanReader, infoReader, whichFunction, startScan = 0, endScan = -1, prefetch = 8, mode = 'scan' ):
+        if (prefetch < 1):
+            prefetch = 1
+
+        self._scanReader = scanReader
+        self._infoReader = infoReader
+        self._function = whichFunction
+        self._mode = mode
+        self._queue = queue.Queue( maxsize = prefetch )
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+
+        # resolve the scan range here so errors are raised by the constructor
+        try:
+            if (endScan < 0):
+                endScan = infoReader.GetScansInFunction( whichFunction ) - 1
+            self._scans = range( startScan, endScan + 1 )
+            self._drifts = range( infoReader.GetDriftScanCount( whichFunction ) ) if ('drift' == mode) else None
+        except:
+            self.Close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.Close()
+
+    def __len__(self):
+        if (None != self._drifts):
+            return len(self._scans) * len(self._drifts)
+        return len(self._scans)
+
+    def __iter__(self):
+        if (self._closed):
+            return
+        if (None == self._thread):
+            # the thread keeps the iterator alive, start it only when someone reads
+            self._thread = threading.Thread( target = self._Produce, name = "masslynx-scan-prefetch", daemon = True )
+            self._thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if (item is _END):
+                    return
+                if (isinstance(item, _MassLynxIteratorError)):
+                    raise item.error
+                yield item
+        finally:
+            self.Close()
+
+    def Close( self ):
+        """
+        Stops the background thread and destroys the readers of the iterator
+
+        @return void
+        """
+        if (self._closed):
+            return
+        self._closed = True
+        self._stop.set()
+
+        thread = self._thread
+        if (None != thread):
+            # unblock the producer if it is waiting for room in the queue
+            while thread.is_alive():
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    thread.join( 0.01 )
+            self._thread = None
+        self._DestroyReaders()
+
+    ## \cond
+    def _DestroyReaders( self ):
+        for reader in (self._scanReader, self._infoReader):
+            reader._provider.destroyRawReader()
+
+    def _Put( self, item ):
+        while not self._stop.is_set():
+            try:
+                self._queue.put( item, timeout = 0.1 )
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _Produce( self ):
+        try:
+            for item in self._Read():
+                if (not self._Put( item )):
+                    return
+            self._Put( _END )
+        except Exception as e:
+            self._Put( _MassLynxIteratorError( e ) )
+
+    def _Read( self ):
+        function = self._function
+        for scan in self._scans:
+            if (self._stop.is_set()):
+                return
+            rt = self._infoReader.GetRetentionTime( function, scan )
+            if ('flags' == self._mode):
+                masses, intensities, flags = self._scanReader.ReadScanFlags( function, scan )
+                yield scan, rt, masses, intensities, flags
+            elif ('drift' == self._mode):
+                for drift in self._drifts:
+                    masses, intensities = self._scanReader.ReadDriftScan( function, scan, drift )
+                    yield scan, drift, rt, masses, intensities
+            else:
+                masses, intensities = self._scanReader.ReadScan( function, scan )
+                yield scan, rt, masses, intensities
+    ## \endcond
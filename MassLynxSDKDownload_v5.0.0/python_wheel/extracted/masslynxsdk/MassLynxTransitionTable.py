@@ -0,0 +1,215 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .MassLynxMRMMetadata import MassLynxMRMMetadata
+from .MassLynxRawReader import MassLynxException
+
+## \cond
+# name is a fixed width unicode field, sized to the longest name of the table
+MassLynxTransitionFields = [ ('function', '<i4'), ('index', '<i4'), ('q1', '<f4'), ('q3', '<f4'), ('name', None), ('cv', '<f4'), ('ce', '<f4'),
+                             ('dwell', '<f4'), ('rtStart', '<f4'), ('rtEnd', '<f4') ]
+
+def MassLynxTransitionRecord( nameLength ):
+    return numpy.dtype( [ (field, 'U%d' % max( 1, nameLength ) if None == kind else kind) for field, kind in MassLynxTransitionFields ] )
+## \endcond
+
+class MassLynxTransitionTable(object):
+    """
+    Every MRM transition of a raw file, held as a structured numpy array
+    Fields: function, index (transition in the function), q1, q3, name, cv, ce, dwell (s),
+    rtStart and rtEnd (min). cv, ce and dwell are nan when unknown.
+    A read that fails only affects its own rows: q1 / q3 of a transition that cannot be read and the
+    times of a function whose time range cannot be read are nan, a function whose transitions cannot
+    be counted is left out.
+    The table is built in one pass over the MRM functions; sorting, filtering, compound lookup
+    and joins are numpy operations on the whole table.
+    """
+
+    def __init__(self, table):
+        self._table = table
+        self._names = None
+
+    def __len__(self):
+        return len(self._table)
+
+    def __iter__(self):
+        return iter( self._table )
+
+    def __getitem__(self, key):
+        # field name -> column, anything else selects rows (mask, slice, indices or one row)
+        if (isinstance(key, str)):
+            return self._table[ key ]
+        return MassLynxTransitionTable( numpy.atleast_1d( self._table[ key ] ) )
+
+    def __repr__(self):
+        return "MassLynxTransitionTable(%d transitions)" % len(self._table)
+
+    @staticmethod
+    def Build( infoReader, path = None ):
+        """
+        Reads the transitions of every MRM function
+        Names and energies come from the _FUNCnnn.CMP / .EE files of path (see MassLynxMRMMetadata),
+        the retention time window is the acquisition time range of the function and dwell is the
+        scan cycle divided by the transitions of the function (includes the inter-channel delay).
+
+        @param  infoReader MassLynxRawInfoReader
+        @param  path .raw directory, None to leave names and energies out
+
+        @return MassLynxTransitionTable
+        """
+        if (None == numpy):
+            raise ImportError( "numpy is required for the transition table" )
+
+        columns = { field : [] for field, kind in MassLynxTransitionFields }
+        for whichFunction in range( infoReader.GetNumberofFunctions() ):
+            # one bad function or transition must not cost the transitions of the others
+            try:
+                q1, q3 = infoReader.GetMRMMassRanges( whichFunction )
+            except MassLynxException:
+                continue
+            count = len(q1)
+            if (0 == count):
+                continue
+
+            metadata = MassLynxMRMMetadata.Read( path, whichFunction ) if (None != path) else MassLynxMRMMetadata( [], [], [] )
+            energies = numpy.array( metadata.GetEnergies( count ), dtype=numpy.float32 )
+            try:
+                rtStart, rtEnd = infoReader.GetAcquisitionTimeRange( whichFunction )
+                scans = infoReader.GetScansInFunction( whichFunction )
+                dwell = (rtEnd - rtStart) * 60.0 / (scans - 1) / count if (1 < scans) else numpy.nan
+            except MassLynxException:
+                rtStart = rtEnd = dwell = numpy.nan
+
+            columns['function'].append( numpy.full( count, whichFunction ) )
+            columns['index'].append( numpy.arange( count ) )
+            columns['q1'].append( q1 )
+            columns['q3'].append( q3 )
+            columns['name'].append( metadata.GetNames( count ) )
+            columns['cv'].append( energies[:, 0] )
+            columns['ce'].append( energies[:, 1] )
+            columns['dwell'].append( numpy.full( count, dwell ) )
+            columns['rtStart'].append( numpy.full( count, rtStart ) )
+            columns['rtEnd'].append( numpy.full( count, rtEnd ) )
+
+        names = [ name for chunk in columns['name'] for name in chunk ]
+        table = numpy.zeros( len(names), dtype=MassLynxTransitionRecord( max( [ len(name) for name in names ], default=1 ) ) )
+        for field, chunks in columns.items():
+            if (chunks):
+                table[ field ] = numpy.concatenate( [ numpy.asarray( chunk ) for chunk in chunks ] )
+        return MassLynxTransitionTable( table )
+
+    def GetTable( self ):
+        """
+        Returns the structured array of the table
+
+        @return numpy structured array
+        """
+        return self._table
+
+    def Sort( self, *fields ):
+        """
+        Returns the table sorted by one or more fields, stable
+
+        @param  fields field names, e.g. Sort( 'name', 'q1' )
+
+        @return MassLynxTransitionTable
+        """
+        order = numpy.lexsort( [ self._table[ field ] for field in reversed( fields ) ] ) if fields else numpy.arange( len(self._table) )
+        return MassLynxTransitionTable( self._table[ order ] )
+
+    def Filter( self, **conditions ):
+        """
+        Returns the transitions that match every condition
+        A value selects equal rows, a (low, high) tuple an inclusive range, e.g. Filter( function=0, q1=(300, 400) )
+
+        @return MassLynxTransitionTable
+        """
+        mask = numpy.ones( len(self._table), dtype=bool )
+        for field, value in conditions.items():
+            column = self._table[ field ]
+            if (isinstance(value, tuple)):
+                mask &= (column >= value[0]) & (column <= value[1])
+            else:
+                mask &= column == value
+        return MassLynxTransitionTable( self._table[ mask ] )
+
+    def Find( self, name ):
+        """
+        Returns the transitions of a compound, from a name index built on first use
+
+        @param  name compound name, exact
+
+        @return MassLynxTransitionTable
+        """
+        if (None == self._names):
+            unique, inverse = numpy.unique( self._table['name'], return_inverse=True )
+            order = numpy.argsort( inverse, kind='stable' )
+            bounds = numpy.searchsorted( inverse[ order ], numpy.arange( len(unique) + 1 ) )
+            self._names = { str(key) : order[ bounds[ i ] : bounds[ i + 1 ] ] for i, key in enumerate( unique ) }
+        return MassLynxTransitionTable( self._table[ self._names.get( name, numpy.zeros( 0, dtype=numpy.intp ) ) ] )
+
+    def FindMass( self, q1, q3 = None, tolerance = 0.5 ):
+        """
+        Returns the transitions within tolerance of a precursor, and product if given
+
+        @param  q1 precursor mass
+        @param  q3 product mass or None
+        @param  tolerance Da
+
+        @return MassLynxTransitionTable
+        """
+        mask = numpy.abs( self._table['q1'] - q1 ) <= tolerance
+        if (None != q3):
+            mask &= numpy.abs( self._table['q3'] - q3 ) <= tolerance
+        return MassLynxTransitionTable( self._table[ mask ] )
+
+    def Join( self, other, on = ('name',), tolerance = None ):
+        """
+        Matches the rows of two tables, e.g. the same panel in two runs
+        With tolerance the float fields are compared on a grid of that width, so masses that differ
+        by less than the tolerance usually match (values either side of a grid line do not).
+
+        @param  other MassLynxTransitionTable
+        @param  on field name or tuple of field names
+        @param  tolerance grid for float fields, None for exact values
+
+        @return int array of rows of this table, int array of the matching rows of other
+        """
+        on = (on,) if isinstance(on, str) else tuple( on )
+        size = len(self._table)
+        keys = []
+        for field in on:
+            column = numpy.concatenate( ( self._table[ field ], other.GetTable()[ field ] ) )
+            if (None != tolerance and numpy.issubdtype( column.dtype, numpy.floating )):
+                column = numpy.round( column / tolerance ).astype( numpy.int64 )
+            keys.append( numpy.unique( column, return_inverse=True )[1] )
+
+        # one integer key per row, then every pair of rows with the same key
+        key = numpy.ravel_multi_index( keys, [ int(k.max()) + 1 for k in keys ] ) if (0 < len(keys[0])) else numpy.zeros( 0, dtype=numpy.int64 )
+        left, right = key[ :size ], key[ size: ]
+        order = numpy.argsort( right, kind='stable' )
+        starts = numpy.searchsorted( right[ order ], left, side='left' )
+        ends = numpy.searchsorted( right[ order ], left, side='right' )
+        counts = ends - starts
+        leftRows = numpy.repeat( numpy.arange( size ), counts )
+        offsets = numpy.arange( counts.sum() ) - numpy.repeat( numpy.cumsum( counts ) - counts, counts )
+        rightRows = order[ numpy.repeat( starts, counts ) + offsets ]
+        return leftRows, rightRows
+
+    def ToRecords( self ):
+        """
+        Returns the table as python values, nan replaced by None
+
+        @return list of dict of field -> value
+        """
+        records = []
+        for row in self._table.tolist():
+            records.append( { field : (None if isinstance(value, float) and value != value else value) for (field, kind), value in zip( MassLynxTransitionFields, row ) } )
+        return records
@@ -15,12 +15,10 @@ class MassLynxAcquisitionProvider(object):
 
     def createAcquisition(self):
         mlMethod = MassLynxProvider.MassLynxDll.createAcquisition
-        mlMethod.argtypes = [POINTER(c_void_p)]
         return mlMethod(self._mlAcquisition)
     
     def destroyAcquisition(self):
         mlMethod = MassLynxProvider.MassLynxDll.destroyAcquisition
-        mlMethod.argtypes = [c_void_p]
         mlMethod(self._mlAcquisition)
 
     def _getAcquisition(self):
@@ -29,7 +27,6 @@ class MassLynxAcquisitionProvider(object):
     def getAutoLynxStatus(self):
         status = c_int(0) 
         mlMethod = MassLynxProvider.MassLynxDll.getAutoLynxStatus
-        mlMethod.argtypes = [c_void_p, POINTER(c_int)]
         code = mlMethod(self._getAcquisition(), status )
         
         return code, status.value
@@ -39,7 +36,6 @@ class MassLynxAcquisitionProvider(object):
 
         # get the settings
         mlMethod = MassLynxProvider.MassLynxDll.getAutoLynxSettings
-        mlMethod.argtypes = [c_void_p, c_void_p]
         code = mlMethod(self._getAcquisition(), params.GetParameters() )
         
         return code, params
@@ -47,14 +43,12 @@ class MassLynxAcquisitionProvider(object):
     def getSampleListStatus(self, bytes):     
         status = c_int(0)
         mlMethod = MassLynxProvider.MassLynxDll.getSampleListStatus
-        mlMethod.argtypes = [c_void_p, c_char_p, POINTER(c_int)]
         code = mlMethod(self._getAcquisition(), bytes, status)
 
         return code, status.value
     
     def abortAutoLynx(self, abort):     
         mlMethod = MassLynxProvider.MassLynxDll.abortAutoLynx
-        mlMethod.argtypes = [c_void_p, c_bool]
         code = mlMethod(self._getAcquisition(), abort)
 
         return code
@@ -65,14 +59,12 @@ class MassLynxAcquisitionProvider(object):
 
         # get the settings
         mlMethod = MassLynxProvider.MassLynxDll.readStatus
-        mlMethod.argtypes = [c_void_p, c_void_p,  c_void_p]
         code = mlMethod(self._getAcquisition(), status.GetParameters(), queue.GetParameters() )
         
         return code, status, queue
     
     def setStatusIniFile(self, bytes):     
         mlMethod = MassLynxProvider.MassLynxDll.setStatusIniFile
-        mlMethod.argtypes = [c_void_p, c_char_p]
         code = mlMethod(self._getAcquisition(), bytes)
 
         return code
@@ -80,7 +72,6 @@ class MassLynxAcquisitionProvider(object):
     def getStatusIniFile(self):
         params = MassLynxParameters()     
         mlMethod = MassLynxProvider.MassLynxDll.getStatusIniFile
-        mlMethod.argtypes = [c_void_p, c_void_p]
         code = mlMethod(self._getAcquisition(), params.GetParameters())
 
         return code, params
@@ -90,14 +81,12 @@ class MassLynxAcquisitionProvider(object):
 
         # get the settings
         mlMethod = MassLynxProvider.MassLynxDll.getMassLynxInjection
-        mlMethod.argtypes = [c_void_p, c_void_p]
         code = mlMethod(self._getAcquisition(), params.GetParameters() )
         
         return code, params
     
     def setMassLynxInjectionFile(self, bytes):     
         mlMethod = MassLynxProvider.MassLynxDll.setMassLynxInjectionFile
-        mlMethod.argtypes = [c_void_p, c_char_p]
         code = mlMethod(self._getAcquisition(), bytes)
 
         return code
@@ -105,7 +94,6 @@ class MassLynxAcquisitionProvider(object):
     def getMassLynxInjectionFile(self):
         params = MassLynxParameters()     
         mlMethod = MassLynxProvider.MassLynxDll.getMassLynxInjectionFile
-        mlMethod.argtypes = [c_void_p, c_void_p]
         code = mlMethod(self._getAcquisition(), params.GetParameters())
 
         return code, params
@@ -116,7 +104,6 @@ class MassLynxAcquisitionProvider(object):
 
         # get the settings
         mlMethod = MassLynxProvider.MassLynxDll.getStatus
-        mlMethod.argtypes = [c_void_p, c_void_p,  c_void_p]
         code = mlMethod(self._getAcquisition(), status.GetParameters(), queue.GetParameters() )
         
         return code, status, queue
\ No newline at end of file
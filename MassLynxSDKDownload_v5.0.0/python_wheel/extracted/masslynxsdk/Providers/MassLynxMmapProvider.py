@@ -0,0 +1,361 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import re
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ..MassLynxRawReader import MassLynxException
+from ..MassLynxRawDefs import RawBase, MassLynxBaseType, MassLynxHeaderItem, MassLynxScanItem, MassLynxIonMode
+
+from .MassLynxRawDirectory import MassLynxRawDirectory
+
+## \cond
+# function types, same values as the dll (the second MassLynxIonMode in MassLynxRawDefs)
+# title keyword in _extern.inf -> (function type, type string), first match wins
+_FunctionTypes = [
+    ( 'MRM', 'MRM', 'MRM' ),
+    ( 'SIR', 'SIR', 'SIR' ),
+    ( 'TOF PARENT', 'TOFP', 'TOF Parent' ),
+    ( 'TOF DAUGHTER', 'TOFD', 'TOF Daughter' ),
+    ( 'TOF MSMS', 'TOFD', 'TOF Daughter' ),
+    ( 'TOF MS', 'TOFM', 'TOF MS' ),
+    ( 'TOF', 'TOF', 'TOF' ),
+    ( 'DAUGHTER', 'DAU', 'Daughter' ),
+    ( 'PARENT', 'PAR', 'Parent' ),
+    ( 'NEUTRAL LOSS', 'NL', 'Neutral Loss' ),
+    ( 'NEUTRAL GAIN', 'NG', 'Neutral Gain' ),
+    ( 'DAD', 'DAD', 'Diode Array' ),
+    ( 'PDA', 'DAD', 'Diode Array' ),
+    ( 'MS', 'MS', 'MS' ),
+]
+
+# ionisation -> (ion mode name, string)
+_IonModes = [
+    ( r'ES\+|ESI\+|ELECTROSPRAY\+', 'ES_POS', 'ES+' ),
+    ( r'ES-|ESI-|ELECTROSPRAY-', 'ES_NEG', 'ES-' ),
+    ( r'APCI\+|AP\+|AI\+', 'AI_POS', 'AP+' ),
+    ( r'APCI-|AP-|AI-', 'AI_NEG', 'AP-' ),
+    ( r'EI\+', 'EI_POS', 'EI+' ),
+    ( r'EI-', 'EI_NEG', 'EI-' ),
+    ( r'CI\+', 'CI_POS', 'CI+' ),
+    ( r'CI-', 'CI_NEG', 'CI-' ),
+    ( r'FAB\+|FB\+', 'FB_POS', 'FB+' ),
+    ( r'FAB-|FB-', 'FB_NEG', 'FB-' ),
+    ( r'LD\+|MALDI\+', 'LD_POS', 'LD+' ),
+    ( r'LD-|MALDI-', 'LD_NEG', 'LD-' ),
+]
+
+# header items whose _HEADER.TXT key is not the item name
+_HeaderKeys = { MassLynxHeaderItem.LAB_NAME : 'laboratoryname' }
+
+_FunctionTypeValues = { member.name : int(member) for member in MassLynxIonMode }
+
+# the ion mode enum is shadowed by the function types, values follow its order from ION_MODE_BASE
+_IonModeNames = [ 'EI_POS', 'EI_NEG', 'CI_POS', 'CI_NEG', 'FB_POS', 'FB_NEG', 'TS_POS', 'TS_NEG', 'ES_POS', 'ES_NEG', 'AI_POS', 'AI_NEG', 'LD_POS', 'LD_NEG' ]
+
+def _IonModeValue( name ):
+    return int( RawBase.ION_MODE_BASE ) + _IonModeNames.index( name )
+
+def _NotSupported( name, backend ):
+    def method( *args ):
+        raise MassLynxException( 1, "%s is not supported by the %s backend" % (name, backend) )
+    return method
+## \endcond
+
+class MassLynxMmapParameters(object):
+    """Read-only parameters returned by the mmap backend, same Get / GetKeys as MassLynxParameters"""
+
+    def __init__(self, values):
+        self._values = dict(values)
+
+    def Get( self, key ):
+        return self._values.get( key, "" )
+
+    def GetKeys( self ):
+        return list( self._values.keys() )
+
+class MassLynxMmapReaderBaseProvider(object):
+    """
+    Provider that reads the .raw directory in python instead of calling the dll
+    Readers created from an mmap reader share its parsed directory
+    """
+
+    _backendName = "mmap"
+
+    def __init__( self ):
+        self._directory = None
+        self._arrayMode = False
+
+    def __getattr__( self, name ):
+        # dll only functionality
+        if (name.startswith( '_' )):
+            raise AttributeError( name )
+        return _NotSupported( name, self._backendName )
+
+    def _getReader(self):
+        raise MassLynxException( 1, "the %s backend has no dll handle" % self._backendName )
+
+    def GetDirectory( self ):
+        if (None == self._directory):
+            raise MassLynxException( 1, "Raw reader is closed" )
+        return self._directory
+
+    def SetArrayMode(self, arrayMode):
+        if (arrayMode and None == numpy):
+            raise ImportError( "numpy is required for array mode" )
+        self._arrayMode = bool(arrayMode)
+
+    def GetArrayMode(self):
+        return self._arrayMode
+
+    def ToArray( self, values, dataType = None ):
+        # float32 copies in array mode, python lists otherwise - same as the dll providers
+        values = numpy.asarray( values, dtype = numpy.float32 if (None == dataType) else dataType )
+        if (self._arrayMode):
+            return numpy.array( values )
+        return values.tolist()
+
+    def createRawReaderFromPath(self, bytes, mlType, license):
+        # no license is needed to read the files
+        try:
+            self._directory = MassLynxRawDirectory( bytes.decode() )
+        except (OSError, ImportError, ValueError) as e:
+            raise MassLynxException( 1, str(e) )
+        return 0
+
+    def createRawReaderFromReader(self, source, mlType):
+        if (not isinstance(source, MassLynxMmapReaderBaseProvider)):
+            raise MassLynxException( 1, "an %s reader can only be created from an %s reader" % (self._backendName, self._backendName) )
+        self._directory = source.GetDirectory()
+        return 0
+
+    def destroyRawReader(self):
+        self._directory = None
+
+    def updateRawReader(self):
+        self.GetDirectory().Refresh()
+        return 0
+
+    ## \cond
+    def _Function( self, whichFunction ):
+        try:
+            return self.GetDirectory().GetFunction( whichFunction )
+        except (IndexError, OSError, ValueError) as e:
+            raise MassLynxException( 1, str(e) )
+    ## \endcond
+
+class MassLynxMmapInfoProvider(MassLynxMmapReaderBaseProvider):
+
+    def GetNumberofFunctions(self):
+        return 0, self.GetDirectory().GetFunctionCount()
+
+    def GetScansInFunction( self, whichFunction ):
+        return 0, self._Function( whichFunction ).GetScanCount()
+
+    def GetAcquisitionMassRange( self, whichFunction ):
+        title, values = self._Info( whichFunction )
+        try:
+            return 0, float( values['startmass'] ), float( values['endmass'] )
+        except (KeyError, ValueError):
+            pass
+        masses = self._Function( whichFunction ).ReadAllPeaks()[0]
+        if (0 == len(masses)):
+            return 0, 0.0, 0.0
+        return 0, float( masses.min() ), float( masses.max() )
+
+    def GetAcquisitionTimeRange( self, whichFunction ):
+        rt = self._Function( whichFunction ).rt
+        if (0 == len(rt)):
+            return 0, 0.0, 0.0
+        return 0, float( rt[0] ), float( rt[-1] )
+
+    def GetFunctionType( self, whichFunction ):
+        return 0, self._FunctionType( whichFunction )[0]
+
+    def GetFunctionTypeString( self, functionType ):
+        for keyword, name, text in _FunctionTypes:
+            if (_FunctionTypeValues[ name ] == functionType):
+                return 0, text
+        return 0, ""
+
+    def IsContinuum( self, whichFunction ):
+        title, values = self._Info( whichFunction )
+        text = " ".join( [title] + list(values.values()) ).upper()
+        return 0, 'CONTINUUM' in text
+
+    def GetIonMode( self, whichFunction ):
+        title, values = self._Info( whichFunction )
+        text = " ".join( [title] + list(values.values()) ).upper()
+        for pattern, name, string in _IonModes:
+            if (re.search( r'(?<![A-Z])(?:%s)' % pattern, text )):
+                return 0, _IonModeValue( name )
+        polarity = values.get( 'polarity', '' ).upper()
+        if (polarity.startswith( 'POS' )):
+            return 0, _IonModeValue( 'ES_POS' )
+        if (polarity.startswith( 'NEG' )):
+            return 0, _IonModeValue( 'ES_NEG' )
+        raise MassLynxException( 1, "ion mode of function %d not found in _extern.inf" % (whichFunction + 1) )
+
+    def GetIonModeString( self, ionMode ):
+        for pattern, name, string in _IonModes:
+            if (_IonModeValue( name ) == ionMode):
+                return 0, string
+        return 0, ""
+
+    def GetHeaderItemValue( self, whichItems ):
+        header = self.GetDirectory().header
+        values = {}
+        for item in whichItems:
+            item = MassLynxHeaderItem( item )
+            key = _HeaderKeys.get( item, item.name.lower().replace( '_', '' ) )
+            values[ int(item) ] = header.get( key, "" )
+        return 0, MassLynxMmapParameters( values )
+
+    def GetScanItemValue( self, whichFunction, whichScan, whichItems ):
+        code, values = self.GetScanItemValues( whichFunction, [whichScan], whichItems )
+        return code, MassLynxMmapParameters( { int(item) : column[0] for item, column in zip(whichItems, values) } )
+
+    def GetScanItemValues( self, whichFunction, whichScans, whichItems ):
+        # only the items stored in the index are available
+        function = self._Function( whichFunction )
+        scans = numpy.asarray( list(whichScans), dtype=numpy.int64 )
+        values = []
+        for item in whichItems:
+            if (MassLynxScanItem.TOTAL_ION_CURRENT == item):
+                values.append( [ repr(float(v)) for v in function.tic[ scans ] ] )
+            else:
+                values.append( [ "" ] * len(scans) )
+        return 0, values
+
+    def GetScanIndex( self, whichFunction ):
+        # everything but the base peak is in _FUNCnnn.IDX, the base peak needs the decoded peaks
+        function = self._Function( whichFunction )
+        masses, intensities, starts = function.ReadAllPeaks()
+        counts = function.counts
+        basePeakMass = numpy.zeros( len(counts), dtype=numpy.float64 )
+        basePeakIntensity = numpy.zeros( len(counts), dtype=numpy.float32 )
+        present = counts > 0
+        if (present.any()):
+            # most intense peak first within each scan
+            scanOfPeak = numpy.repeat( numpy.arange( len(counts) ), counts )
+            order = numpy.lexsort( ( -intensities, scanOfPeak ) )
+            first = order[ starts[ present ] ]
+            basePeakMass[ present ] = masses[ first ]
+            basePeakIntensity[ present ] = intensities[ first ]
+        return 0, { 'rt' : function.rt, 'tic' : function.tic, 'basePeakMass' : basePeakMass, 'basePeakIntensity' : basePeakIntensity,
+                    'offset' : function.offsets, 'peaks' : counts }
+
+    def GetRetentionTime( self, whichFunction, whichScan ):
+        rt = self._Function( whichFunction ).rt
+        if (whichScan < 0 or whichScan >= len(rt)):
+            raise MassLynxException( 1, "scan %d out of range" % whichScan )
+        return 0, float( rt[ whichScan ] )
+
+    def GetDriftScanCount( self, whichFunction ):
+        self._Function( whichFunction )
+        return 0, 0
+
+    def GetMRMCount( self, whichFunction ):
+        function = self._Function( whichFunction )
+        if ('MRM' != self._FunctionType( whichFunction )[1] or 0 == function.GetScanCount()):
+            return 0, 0
+        return 0, int( function.counts.max() )
+
+    def GetScanRangeFromTimeRange( self, whichFunction, startTime, endTime ):
+        rt = self._Function( whichFunction ).rt
+        startScan = int( numpy.searchsorted( rt, startTime, side='left' ) )
+        endScan = int( numpy.searchsorted( rt, endTime, side='right' ) ) - 1
+        return 0, startScan, max( startScan, endScan )
+
+    def IsLockMassCorrected( self ):
+        return 0, False
+
+    def CanLockMassCorrect( self ):
+        return 0, False
+
+    ## \cond
+    def _Info( self, whichFunction ):
+        self._Function( whichFunction )
+        return self.GetDirectory().GetFunctionInfo( whichFunction )
+
+    def _FunctionType( self, whichFunction ):
+        title, values = self._Info( whichFunction )
+        title = title.upper()
+        for keyword, name, text in _FunctionTypes:
+            if (keyword in title):
+                return _FunctionTypeValues[ name ], keyword
+        return _FunctionTypeValues[ 'MS' ], 'MS'
+    ## \endcond
+
+class MassLynxMmapScanProvider(MassLynxMmapReaderBaseProvider):
+
+    def ReadScan( self, whichFunction, whichScan ):
+        masses, intensities = self._ReadScan( whichFunction, whichScan )
+        return 0, self.ToArray( masses ), self.ToArray( intensities )
+
+    def ReadScanFlags( self, whichFunction, whichScan ):
+        # flags are not stored in the compressed peaks
+        masses, intensities = self._ReadScan( whichFunction, whichScan )
+        return 0, self.ToArray( masses ), self.ToArray( intensities ), self.ToArray( [], numpy.int8 )
+
+    ## \cond
+    def _ReadScan( self, whichFunction, whichScan ):
+        try:
+            return self._Function( whichFunction ).ReadScan( whichScan )
+        except IndexError as e:
+            raise MassLynxException( 1, str(e) )
+    ## \endcond
+
+class MassLynxMmapChromatogramProvider(MassLynxMmapReaderBaseProvider):
+
+    def ReadTIC( self, whichFunction ):
+        function = self._Function( whichFunction )
+        return 0, self.ToArray( function.rt ), self.ToArray( function.tic )
+
+    def ReadBPI( self, whichFunction ):
+        function = self._Function( whichFunction )
+        masses, intensities, starts = function.ReadAllPeaks()
+        return 0, self.ToArray( function.rt ), self.ToArray( self._PerScan( numpy.maximum, intensities, starts, function.counts ) )
+
+    def ReadMassChromatograms( self, whichFunction, whichMasses, massWindow, products ):
+        function = self._Function( whichFunction )
+        masses, intensities, starts = function.ReadAllPeaks()
+        rows = numpy.zeros( (len(whichMasses), function.GetScanCount()), dtype=numpy.float32 )
+        for row, mass in enumerate( whichMasses ):
+            inside = numpy.where( numpy.abs( masses - mass ) <= massWindow / 2.0, intensities, 0 )
+            rows[ row ] = self._PerScan( numpy.add, inside, starts, function.counts )
+        return 0, self.ToArray( function.rt ), self.ToArray( rows )
+
+    def ReadMRMChromatograms( self, whichFunction, whichMRMs ):
+        # one peak per transition in every scan
+        function = self._Function( whichFunction )
+        masses, intensities, starts = function.ReadAllPeaks()
+        rows = numpy.zeros( (len(whichMRMs), function.GetScanCount()), dtype=numpy.float32 )
+        for row, mrm in enumerate( whichMRMs ):
+            present = function.counts > mrm
+            rows[ row, present ] = intensities[ starts[ present ] + mrm ]
+        return 0, self.ToArray( function.rt ), self.ToArray( rows )
+
+    ## \cond
+    @staticmethod
+    def _PerScan( ufunc, values, starts, counts ):
+        # reduce the peaks of every scan, empty scans give 0
+        result = numpy.zeros( len(counts), dtype=numpy.float32 )
+        present = counts > 0
+        if (present.any()):
+            result[ present ] = ufunc.reduceat( values, starts[ present ] )
+        return result
+    ## \endcond
+
+# reader type -> provider class
+MassLynxMmapProviders = {
+    MassLynxBaseType.INFO : MassLynxMmapInfoProvider,
+    MassLynxBaseType.SCAN : MassLynxMmapScanProvider,
+    MassLynxBaseType.CHROM : MassLynxMmapChromatogramProvider,
+}
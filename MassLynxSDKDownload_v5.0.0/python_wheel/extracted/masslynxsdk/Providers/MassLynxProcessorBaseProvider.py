@@ -5,12 +5,15 @@
 
 from ctypes import*
 
+from ..MassLynxRawReader import MassLynxArrayHandler
+
 from .MassLynxProvider import MassLynxProvider
 
 class MassLynxProcessorBaseProvider(object):
 
     def __init__(self):
         self._mlProcessor = c_void_p()
+        self._arrayHandler = MassLynxArrayHandler()
 
     # destroy the processor
     def __del__(self):
@@ -20,25 +23,30 @@ class MassLynxProcessorBaseProvider(object):
     def _getProcessor(self):
         return self._mlProcessor
 
+    def SetArrayMode(self, arrayMode):
+        self._arrayHandler.SetArrayMode(arrayMode)
+
+    def GetArrayMode(self):
+        return self._arrayHandler.GetArrayMode()
+
+    def ToArray(self, buffer, size, rows = None):
+        return self._arrayHandler.ToArray(buffer, size, rows)
+
     def createRawProcessor(self, mlType):
         createRawProcessor = MassLynxProvider.MassLynxDll.createRawProcessor
-        createRawProcessor.argtypes = [POINTER(c_void_p), c_int, c_void_p, POINTER(c_void_p)]
         return createRawProcessor(self._getProcessor(), mlType, c_void_p(0), c_void_p(0) )
 
     def destroyRawProcessor(self):
         destroyRawProcessor = MassLynxProvider.MassLynxDll.destroyRawProcessor
-        destroyRawProcessor.argtypes = [c_void_p]
         destroyRawProcessor(self._getProcessor())
 
     def setRawPath( self, path ):
         bytes = str.encode(path)
         setRawPath = MassLynxProvider.MassLynxDll.setRawPath
-        setRawPath.argtypes = [c_void_p, c_char_p]
         return setRawPath(self._getProcessor(), bytes)
 
     def setRawReader( self, mlReader ):
         setRawReader = MassLynxProvider.MassLynxDll.setRawReader
-        setRawReader.argtypes = [c_void_p, c_void_p]
         return setRawReader(self._getProcessor(), mlReader._provider._getReader() )
 
   
\ No newline at end of file
@@ -0,0 +1,153 @@
+'''
+     Waters
+    MassLynx Python SDK
+'''
+
+from ctypes import*
+
+## \cond
+# function prototypes exported by the MassLynxRaw library
+# every export returns an int error code, only the argument types are listed
+# the table is applied once when the library is loaded, see MassLynxProvider.BindPrototypes
+MassLynxPrototypes = {
+
+    # common
+    'getErrorMessage' : [c_int, POINTER(c_char_p)],
+    'releaseMemory' : [c_void_p],
+    'getLicenseInfo' : [c_char_p, c_void_p],
+
+    # parameters
+    'createParameters' : [POINTER(c_void_p)],
+    'createParametersFromParameters' : [c_void_p, POINTER(c_void_p)],
+    'destroyParameters' : [c_void_p],
+    'setParameterValue' : [c_void_p, c_int, c_char_p],
+    'getParameterValue' : [c_void_p, c_int, POINTER(c_char_p)],
+    'getParameterKeys' : [c_void_p, POINTER(c_void_p), POINTER(c_int)],
+
+    # reader
+    'createRawReaderFromPath' : [c_char_p, POINTER(c_void_p), c_int, c_char_p],
+    'createRawReaderFromReader' : [c_void_p, POINTER(c_void_p), c_int],
+    'destroyRawReader' : [c_void_p],
+    'updateRawReader' : [c_void_p],
+
+    # info reader
+    'getFunctionCount' : [c_void_p, POINTER(c_int)],
+    'getScanCount' : [c_void_p, c_int, POINTER(c_int)],
+    'getAcquisitionMassRange' : [c_void_p, c_int, c_int, POINTER(c_float), POINTER(c_float)],
+    'getAcquisitionTimeRange' : [c_void_p, c_int, POINTER(c_float), POINTER(c_float)],
+    'getFunctionType' : [c_void_p, c_int, POINTER(c_int)],
+    'getFunctionTypeString' : [c_void_p, c_int, POINTER(c_char_p)],
+    'isContinuum' : [c_void_p, c_int, POINTER(c_bool)],
+    'getIonMode' : [c_void_p, c_int, POINTER(c_int)],
+    'getIonModeString' : [c_void_p, c_int, POINTER(c_char_p)],
+    'getRetentionTime' : [c_void_p, c_int, c_int, POINTER(c_float)],
+    'getDriftTime' : [c_void_p, c_int, POINTER(c_float)],
+    'getDriftTime_CCS' : [c_void_p, c_float, c_float, c_int, POINTER(c_float)],
+    'getCollisionalCrossSection' : [c_void_p, c_float, c_float, c_int, POINTER(c_float)],
+    'getDriftScanCount' : [c_void_p, c_int, POINTER(c_int)],
+    'getMRMCount' : [c_void_p, c_int, POINTER(c_int)],
+    'isLockMassCorrected' : [c_void_p, POINTER(c_bool)],
+    'canLockMassCorrect' : [c_void_p, POINTER(c_bool)],
+    'getLockMassFunction' : [c_void_p, POINTER(c_bool), POINTER(c_int)],
+    'getAcquisitionInfo' : [c_void_p, c_void_p],
+    'getHeaderItemValue' : [c_void_p, POINTER(c_int), c_int, c_void_p],
+    'getScanItemValue' : [c_void_p, c_int, c_int, POINTER(c_int), c_int, c_void_p],
+    'getScanItemName' : [c_void_p, POINTER(c_int), c_int, c_void_p],
+    'getScanItemsInFunction' : [c_void_p, c_int, c_void_p],
+    'getScanRangeFromTimeRange' : [c_void_p, c_int, c_float, c_float, POINTER(c_int), POINTER(c_int)],
+    'getDriftRangeFromTimeRange' : [c_void_p, c_int, c_float, c_float, POINTER(c_int), POINTER(c_int)],
+    'getIndexRange' : [c_void_p, c_int, c_float, c_float, POINTER(c_int), POINTER(c_int)],
+    'getPrecursorMass' : [c_void_p, c_int, c_int, POINTER(c_float)],
+    'getIndexPrecursorMassRange' : [c_void_p, c_int, c_int, POINTER(c_float), POINTER(c_float)],
+    'getFunctionPrecursorMassRange' : [c_void_p, c_int, POINTER(c_float), POINTER(c_float)],
+
+    # scan reader
+    'readScan' : [c_void_p, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'readScanFlags' : [c_void_p, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'readDriftScan' : [c_void_p, c_int, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'readProductScan' : [c_void_p, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int), POINTER(c_int)],
+    'readDriftScanIndex' : [c_void_p, c_int, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'readDriftScanFlagsIndex' : [c_void_p, c_int, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'getDriftMassScale' : [c_void_p, c_int, c_int, POINTER(c_void_p), POINTER(c_int), POINTER(c_int)],
+
+    # chromatogram reader
+    'readTICChromatogram' : [c_void_p, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'readBPIChromatogram' : [c_void_p, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'readMassChromatograms' : [c_void_p, c_int, POINTER(c_float), c_int, POINTER(c_void_p), POINTER(c_void_p), c_float, c_bool, POINTER(c_int)],
+    'readSonarMassChromatogram' : [c_void_p, c_int, c_float, c_float, POINTER(c_void_p), POINTER(c_void_p), c_float, c_float, POINTER(c_int)],
+    'readMRMChromatograms' : [c_void_p, c_int, POINTER(c_int), c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'readMobillogram' : [c_void_p, c_int, c_int, c_int, c_float, c_float, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'extractByBins' : [c_void_p, c_int, c_float, c_float, c_int, c_int, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+
+    # analog reader
+    'getChannelCount' : [c_void_p, POINTER(c_int)],
+    'readChannel' : [c_void_p, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'getChannelDesciption' : [c_void_p, c_int, POINTER(c_char_p)],
+    'getChannelUnits' : [c_void_p, c_int, POINTER(c_char_p)],
+
+    # processor
+    'createRawProcessor' : [POINTER(c_void_p), c_int, c_void_p, POINTER(c_void_p)],
+    'destroyRawProcessor' : [c_void_p],
+    'getProcessorMessage' : [c_void_p, c_int, POINTER(c_char_p)],
+    'setRawPath' : [c_void_p, c_char_p],
+    'setRawReader' : [c_void_p, c_void_p],
+
+    # lock mass processor
+    'setLockMassParameters' : [c_void_p, c_void_p],
+    'getLockMassParameters' : [c_void_p, c_void_p],
+    'getLockMassValuesParams' : [c_void_p, c_void_p],
+    'lockMassCorrect' : [c_void_p, POINTER(c_bool)],
+    'removeLockMassCorrection' : [c_void_p],
+    'getLockMassCandidates' : [c_void_p, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'LMP_isLockMassCorrected' : [c_void_p, POINTER(c_int)],
+    'LMP_canLockMassCorrect' : [c_void_p, POINTER(c_int)],
+    'getLockMassCorrection' : [c_void_p, c_float, POINTER(c_float)],
+    'autoLockMassCorrect' : [c_void_p, c_bool, POINTER(c_bool)],
+
+    # scan processor
+    'getScan' : [c_void_p, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)],
+    'setScan' : [c_void_p, POINTER(c_float), POINTER(c_float), c_int, c_int],
+    'combineScan' : [c_void_p, c_int, c_int, c_int],
+    'combineDriftScan' : [c_void_p, c_int, c_int, c_int, c_int, c_int],
+    'smoothScan' : [c_void_p],
+    'setSmoothParameter' : [c_void_p, c_void_p],
+    'getSmoothParameter' : [c_void_p, c_void_p],
+    'centroidScan' : [c_void_p],
+    'setCentroidParameter' : [c_void_p, c_void_p],
+    'getCentroidParameter' : [c_void_p, c_void_p],
+    'thresholdScan' : [c_void_p],
+    'setThresholdParameter' : [c_void_p, c_void_p],
+
+    # dda processor
+    'ddaGetNextScan' : [c_void_p, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int), c_void_p, POINTER(c_bool)],
+    'ddaResetScan' : [c_void_p],
+    'ddaGetScanCount' : [c_void_p, POINTER(c_int)],
+    'ddaGetScan' : [c_void_p, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int), c_void_p],
+    'ddaGetScanInfo' : [c_void_p, c_int, c_void_p],
+    'setQuadIsolationWindowParameters' : [c_void_p, c_void_p],
+    'getQuadIsolationWindowParameters' : [c_void_p, c_void_p],
+    'setDDAParameters' : [c_void_p, c_void_p],
+    'getDDAParameters' : [c_void_p, c_void_p],
+
+    # sample list
+    'createSampleList' : [POINTER(c_void_p)],
+    'destroySampleList' : [c_void_p],
+    'addSampleListRow' : [c_void_p, c_void_p],
+    'sampleListToString' : [c_void_p, POINTER(c_char_p)],
+
+    # acquisition
+    'createAcquisition' : [POINTER(c_void_p)],
+    'destroyAcquisition' : [c_void_p],
+    'getAutoLynxSettings' : [c_void_p, c_void_p],
+    'getSampleListStatus' : [c_void_p, c_char_p, POINTER(c_int)],
+    'getAutoLynxStatus' : [c_void_p, POINTER(c_int)],
+    'abortAutoLynx' : [c_void_p, c_bool],
+    'setStatusIniFile' : [c_void_p, c_char_p],
+    'getStatusIniFile' : [c_void_p, c_void_p],
+    'getStatus' : [c_void_p, c_void_p, c_void_p],
+    'readStatus' : [c_void_p, c_void_p, c_void_p],
+    'setMassLynxInjectionFile' : [c_void_p, c_char_p],
+    'getMassLynxInjectionFile' : [c_void_p, c_void_p],
+    'getMassLynxInjection' : [c_void_p, c_void_p],
+}
+## \endcond
@@ -6,20 +6,113 @@
 import ctypes
 import os
 import sys
+import threading
 
-class MassLynxProvider(object):
+from .MassLynxPrototypes import MassLynxPrototypes
 
-    # load the dll
-    MassLynxDll = None
+## \cond
+class _MassLynxProviderType(type):
+
+    # MassLynxDll is only looked up here until the library has been loaded
+    def __getattr__(cls, name):
+        if ('MassLynxDll' != name):
+            raise AttributeError( name )
+        return cls.Load()
+## \endcond
+
+class MassLynxProvider(object, metaclass=_MassLynxProviderType):
+
+    # the dll is loaded by the first native call, see Load
     MassLynxPath = None
 
+    _lock = threading.Lock()
+
+    # the loaded library, and the wrapper applied to it (see SetWrapper)
+    _library = None
+    _wrapper = None
+
     dir = os.path.dirname(sys.modules['masslynxsdk'].__file__)
 
     if sys.platform.startswith('linux'):
-        # load the shared library
+        # shared library
         MassLynxPath = os.path.join(dir, 'Providers','lib','libMassLynxRaw.so')
-        MassLynxDll = ctypes.CDLL(MassLynxPath)
     else:
-        # load the dll
+        # dll
         MassLynxPath = os.path.join(dir, 'Providers','lib','MassLynxRaw.dll')
-        MassLynxDll = ctypes.WinDLL(MassLynxPath)
+
+    @staticmethod
+    def Load():
+        """
+        Loads the MassLynxRaw library and binds the prototypes, once
+        Called by the first access to MassLynxProvider.MassLynxDll, so importing the sdk
+        or reading with the mmap and synthetic backends never loads the library.
+
+        @return the loaded library
+        """
+        with MassLynxProvider._lock:
+            if (None == MassLynxProvider._library):
+                if sys.platform.startswith('linux'):
+                    dll = ctypes.CDLL(MassLynxProvider.MassLynxPath)
+                else:
+                    dll = ctypes.WinDLL(MassLynxProvider.MassLynxPath)
+
+                # bind the prototypes when the library is loaded
+                MassLynxProvider.BindPrototypes( dll )
+                MassLynxProvider._library = dll
+                MassLynxProvider._Publish()
+            return MassLynxProvider.__dict__[ 'MassLynxDll' ]
+
+    @staticmethod
+    def SetWrapper( wrapper ):
+        """
+        Sets an object that stands in for the library, e.g. to time every call
+        Applied now if the library is loaded, otherwise when it is loaded - setting it never loads the library
+
+        @param  wrapper callable( dll ) returning the object used as MassLynxDll, None to use the library itself
+
+        @return void
+        """
+        with MassLynxProvider._lock:
+            MassLynxProvider._wrapper = wrapper
+            if (None != MassLynxProvider._library):
+                MassLynxProvider._Publish()
+
+    @staticmethod
+    def IsLoaded():
+        """
+        Returns True once the library has been loaded
+
+        @return bool
+        """
+        return None != MassLynxProvider._library
+
+    ## \cond
+    @staticmethod
+    def _Publish():
+        # called with the lock held
+        dll = MassLynxProvider._library
+        if (None != MassLynxProvider._wrapper):
+            dll = MassLynxProvider._wrapper( dll )
+        MassLynxProvider.MassLynxDll = dll
+    ## \endcond
+
+    @staticmethod
+    def BindPrototypes( dll ):
+        """
+        Sets the argument and return types of every known export once
+        Bound functions are cached by ctypes, so callers can use them without redefining argtypes
+
+        @param  dll the loaded MassLynxRaw library
+
+        @return list of prototypes not exported by the library
+        """
+        missing = []
+        for name, argtypes in MassLynxPrototypes.items():
+            mlMethod = getattr(dll, name, None)
+            if mlMethod is None:
+                missing.append(name)
+                continue
+            mlMethod.argtypes = argtypes
+            mlMethod.restype = ctypes.c_int
+
+        return missing
@@ -0,0 +1,282 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import os
+import re
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+## \cond
+# _FUNCnnn.IDX - one 22 byte record per scan
+#   0  uint32  offset of the scan in _FUNCnnn.DAT
+#   4  uint32  bits 0-21 number of peaks, upper bits are flags
+#   8  float32 total ion current
+#   12 float32 retention time (minutes)
+#   16 6 bytes base peak (not decoded, BPI is computed from the peaks)
+MassLynxIdxRecord = [ ('offset', '<u4'), ('packed', '<u4'), ('tic', '<f4'), ('rt', '<f4'), ('basePeak', 'V6') ]
+MassLynxIdxPeakMask = 0x3FFFFF
+
+def _Decode6( peaks ):
+    # int16 intensity mantissa, base 4 exponent in the low nibble of byte 2,
+    # mass in the upper 28 bits of bytes 2-5 in 1/65536 Da
+    mantissa = peaks[:, 0:2].copy().view('<i2')[:, 0].astype(numpy.float32)
+    exponent = (peaks[:, 2] & 0x0F).astype(numpy.float32)
+    mass = (peaks[:, 2:6].copy().view('<u4')[:, 0] >> 4).astype(numpy.float64) / 65536.0
+    return mass, mantissa * numpy.power(numpy.float32(4), exponent)
+
+def _Decode8( peaks ):
+    # uncompressed float32 intensity, float32 mass
+    values = peaks.copy().view('<f4')
+    return values[:, 1].astype(numpy.float64), values[:, 0]
+
+# bytes per peak -> decoder( uint8 array (peaks, bytes) ) -> (masses, intensities)
+# the DAT encodings come from the publicly reverse-engineered format: check them against the
+# dll backend on a reference file (benchmarks/bench_backends.py) and register others here
+MassLynxPeakDecoders = { 6 : _Decode6, 8 : _Decode8 }
+
+def _Key( text ):
+    return re.sub( r'[^0-9a-z]', '', text.lower() )
+## \endcond
+
+class MassLynxRawFunctionData(object):
+    """
+    Memory mapped _FUNCnnn.IDX / _FUNCnnn.DAT of one function
+    Retention times, TIC and peak counts are numpy views over the index, peaks are decoded on demand
+    """
+
+    def __init__(self, directory, number):
+        self._directory = directory
+        self._number = number
+        self._lock = threading.Lock()
+        self._peaks = None
+
+        base = os.path.join( directory.GetPath(), "_FUNC%03d" % number )
+        self._idxPath = base + ".IDX"
+        self._datPath = base + ".DAT"
+        self._signature = self.GetSignature()
+        self.idx = self._Map( self._idxPath, numpy.dtype( MassLynxIdxRecord ) )
+        self.dat = self._Map( self._datPath, numpy.uint8 )
+
+        self.counts = (self.idx['packed'] & MassLynxIdxPeakMask).astype(numpy.int64)
+        self.offsets = self.idx['offset'].astype(numpy.int64)
+        self.rt = self.idx['rt']
+        self.tic = self.idx['tic']
+        self.peakBytes = self._PeakBytes()
+
+    def GetScanCount( self ):
+        return len(self.idx)
+
+    def GetSignature( self ):
+        # file sizes, to detect a file still being acquired
+        return ( os.path.getsize( self._idxPath ), os.path.getsize( self._datPath ) )
+
+    def HasChanged( self ):
+        """
+        Returns True if the files grew or shrank since they were mapped
+
+        @return bool
+        """
+        return self.GetSignature() != self._signature
+
+    def ReadScan( self, whichScan ):
+        """
+        Decodes the peaks of one scan
+
+        @return float64 masses, float32 intensities
+        """
+        if (whichScan < 0 or whichScan >= len(self.idx)):
+            raise IndexError( "scan %d out of range" % whichScan )
+        start = self.offsets[ whichScan ]
+        count = self.counts[ whichScan ]
+        return self._Decode( self.dat[ start : start + count * self.peakBytes ], count )
+
+    def ReadAllPeaks( self ):
+        """
+        Decodes every peak of the function once, cached
+
+        @return float64 masses, float32 intensities, int64 index of the first peak of each scan
+        """
+        with self._lock:
+            if (None == self._peaks):
+                total = int( self.counts.sum() )
+                starts = numpy.zeros( len(self.counts), dtype=numpy.int64 )
+                numpy.cumsum( self.counts[:-1], out=starts[1:] )
+                if (numpy.array_equal( self.offsets, starts * self.peakBytes )):
+                    # scans are stored back to back - one pass over the file
+                    raw = self.dat[ 0 : total * self.peakBytes ]
+                else:
+                    raw = numpy.concatenate( [ self.dat[ o : o + c * self.peakBytes ] for o, c in zip(self.offsets, self.counts) ] ) if total else self.dat[0:0]
+                masses, intensities = self._Decode( raw, total )
+                self._peaks = (masses, intensities, starts)
+            return self._peaks
+
+    ## \cond
+    @staticmethod
+    def _Map( path, dtype ):
+        # only whole records are mapped, the last one may still be being written
+        count = os.path.getsize( path ) // numpy.dtype( dtype ).itemsize
+        # numpy cannot map an empty file
+        if (0 == count):
+            return numpy.zeros( 0, dtype=dtype )
+        return numpy.memmap( path, dtype=dtype, mode='r', shape=(count,) )
+
+    def _PeakBytes( self ):
+        total = int( self.counts.sum() )
+        if (0 == total):
+            return 0
+        size = len(self.dat)
+        # the last scan with peaks ends the .dat file, trailing empty scans say nothing about the size
+        last = int( numpy.flatnonzero( self.counts )[-1] )
+        fits = [ peakBytes for peakBytes in sorted( MassLynxPeakDecoders )
+                 if (int(self.offsets[last]) + int(self.counts[last]) * peakBytes == size) ]
+        if (0 == len(fits)):
+            fits = [ peakBytes for peakBytes in sorted( MassLynxPeakDecoders ) if (total * peakBytes == size) ]
+        if (1 == len(fits)):
+            return fits[0]
+        if (len(fits) > 1):
+            raise ValueError( "%s: ambiguous peak encoding (%d bytes for %d peaks fits %s bytes per peak)" % (self._datPath, size, total, fits) )
+        raise ValueError( "%s: unsupported peak encoding (%d bytes for %d peaks)" % (self._datPath, size, total) )
+
+    def _Decode( self, raw, count ):
+        if (0 == count):
+            return numpy.zeros( 0, dtype=numpy.float64 ), numpy.zeros( 0, dtype=numpy.float32 )
+        masses, intensities = MassLynxPeakDecoders[ self.peakBytes ]( numpy.asarray(raw).reshape( count, self.peakBytes ) )
+        return self._directory.Calibrate( self._number, masses ), intensities
+    ## \endcond
+
+class MassLynxRawDirectory(object):
+    """
+    Read-only view of a .raw directory parsed in python
+    _HEADER.TXT and _extern.inf are parsed once, functions are mapped on first use
+    """
+
+    def __init__(self, path):
+        if (None == numpy):
+            raise ImportError( "numpy is required for the mmap backend" )
+        if (not os.path.isdir( path )):
+            raise FileNotFoundError( "raw directory not found: %s" % path )
+
+        self._path = path
+        self._lock = threading.Lock()
+        self._functions = {}
+        self.header = self._ReadHeader()
+        self.extern = self._ReadExtern()
+        self.calibration = self._ReadCalibration()
+        self.numbers = self._FindFunctions()
+
+    def GetPath( self ):
+        return self._path
+
+    def GetFunctionCount( self ):
+        return len(self.numbers)
+
+    def GetFunction( self, whichFunction ):
+        """
+        Returns the mapped data of a function (0 based)
+
+        @return MassLynxRawFunctionData
+        """
+        if (whichFunction < 0 or whichFunction >= len(self.numbers)):
+            raise IndexError( "function %d out of range" % whichFunction )
+        with self._lock:
+            function = self._functions.get( whichFunction )
+            if (None == function):
+                function = MassLynxRawFunctionData( self, self.numbers[ whichFunction ] )
+                self._functions[ whichFunction ] = function
+            return function
+
+    def GetFunctionInfo( self, whichFunction ):
+        """
+        Returns the _extern.inf title and values of a function
+
+        @return title, dict of normalised key -> value
+        """
+        return self.extern.get( whichFunction + 1, ("", {}) )
+
+    def Refresh( self ):
+        """
+        Drops functions whose files changed, for files that are still being acquired
+
+        @return void
+        """
+        with self._lock:
+            self.numbers = self._FindFunctions()
+            for key, function in list( self._functions.items() ):
+                if (function.HasChanged()):
+                    del self._functions[ key ]
+
+    def Calibrate( self, number, masses ):
+        coefficients, sqrt = self.calibration.get( number, (None, False) )
+        if (None == coefficients):
+            return masses
+        if (sqrt):
+            return numpy.square( numpy.polynomial.polynomial.polyval( numpy.sqrt( masses ), coefficients ) )
+        return numpy.polynomial.polynomial.polyval( masses, coefficients )
+
+    ## \cond
+    def _Read( self, name ):
+        path = os.path.join( self._path, name )
+        if (not os.path.exists( path )):
+            return ""
+        with open( path, 'r', encoding='latin-1' ) as f:
+            return f.read()
+
+    def _ReadHeader( self ):
+        # $$ Acquired Name: value
+        header = {}
+        for line in self._Read( "_HEADER.TXT" ).splitlines():
+            match = re.match( r'\$\$\s*([^:]+):\s?(.*)$', line )
+            if (match):
+                header[ _Key( match.group(1) ) ] = match.group(2).strip()
+        return header
+
+    def _ReadExtern( self ):
+        # sections start with "Function n - title", values are "key<tab>value"
+        sections = {}
+        current = None
+        for line in self._Read( "_extern.inf" ).splitlines():
+            match = re.search( r'Function\s+(\d+)\s*-\s*(.*)$', line )
+            if (match and '\t' not in line):
+                current = ( match.group(2).strip(), {} )
+                sections[ int(match.group(1)) ] = current
+                continue
+            if (None == current):
+                continue
+            parts = re.split( r'\t+|\s{2,}', line.strip(), maxsplit=1 )
+            if (2 == len(parts)):
+                current[1][ _Key( parts[0] ) ] = parts[1].strip()
+        return sections
+
+    def _ReadCalibration( self ):
+        # $$ Cal Function 1: c0,c1,c2,...,T1 - T1 is a polynomial in sqrt(mass)
+        calibration = {}
+        for key, value in self.header.items():
+            match = re.match( r'calfunction(\d+)$', key )
+            if (not match or not value):
+                continue
+            coefficients = []
+            sqrt = False
+            for token in value.split( ',' ):
+                token = token.strip()
+                try:
+                    coefficients.append( float(token) )
+                except ValueError:
+                    sqrt = sqrt or token.upper().startswith( 'T' )
+            if (coefficients):
+                calibration[ int(match.group(1)) ] = (coefficients, sqrt)
+        return calibration
+
+    def _FindFunctions( self ):
+        numbers = []
+        for name in os.listdir( self._path ):
+            match = re.match( r'_FUNC(\d{3})\.IDX$', name, re.IGNORECASE )
+            if (match and os.path.exists( os.path.join( self._path, "_FUNC%s.DAT" % match.group(1) ) )):
+                numbers.append( int(match.group(1)) )
+        return sorted( numbers )
+    ## \endcond
@@ -6,6 +6,7 @@ from ctypes import*
 
 from ..MassLynxRawReader import MassLynxStringHandler
 from ..MassLynxParameters import MassLynxParameters
+from ..MassLynxRawDefs import MassLynxScanItem
 
 from .MassLynxProvider import MassLynxProvider
 from .MassLynxReaderBaseProvider import MassLynxReaderBaseProvider
@@ -22,14 +23,12 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
     def GetNumberofFunctions(self):
         size = c_int(0)
         getFunctionCount =  MassLynxProvider.MassLynxDll.getFunctionCount
-        getFunctionCount.argtypes = [c_void_p, POINTER(c_int)]
         code = getFunctionCount(self._getReader(),size)
         return code, size.value
 
     def GetScansInFunction( self, whichFunction ):
         size = c_int(0)   
         getScanCount = MassLynxProvider.MassLynxDll.getScanCount
-        getScanCount.argtypes = [c_void_p, c_int, POINTER(c_int)]
         code = getScanCount(self._getReader(),whichFunction,size)
         return code, size.value
 
@@ -37,7 +36,6 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
         lowMass = c_float(0)
         highMass = c_float(0)
         getAcquisitionMassRange = MassLynxProvider.MassLynxDll.getAcquisitionMassRange
-        getAcquisitionMassRange.argtypes = [c_void_p, c_int, c_int, POINTER(c_float), POINTER(c_float)]
         code = getAcquisitionMassRange(self._getReader(),whichFunction, 0,lowMass,highMass)
         return code, lowMass.value, highMass.value
 
@@ -45,42 +43,36 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
         startTime = c_float(0)
         endTime = c_float(0)
         getAcquisitionTimeRange = MassLynxProvider.MassLynxDll.getAcquisitionTimeRange
-        getAcquisitionTimeRange.argtypes = [c_void_p, c_int, POINTER(c_float), POINTER(c_float)]
         code = getAcquisitionTimeRange(self._getReader(),whichFunction,startTime,endTime)
         return code, startTime.value, endTime.value
 
     def GetFunctionType( self, whichFunction ):
         functionType = c_int(0)
         getFunctionType = MassLynxProvider.MassLynxDll.getFunctionType
-        getFunctionType.argtypes = [c_void_p, c_int, POINTER(c_int)]
         code = getFunctionType(self._getReader(),whichFunction, functionType)
         return code, functionType.value
 
     def GetFunctionTypeString( self, functionType ):
         temp = c_char_p()
         getFunctionTypeString = MassLynxProvider.MassLynxDll.getFunctionTypeString
-        getFunctionTypeString.argtypes = [c_void_p, c_int, POINTER(c_char_p)]
         code =  getFunctionTypeString(self._getReader(),functionType, temp)
         return code, self.ToString( temp )
 
     def IsContinuum( self, whichFunction ):
         continuum = c_bool(0)
         isContinuum = MassLynxProvider.MassLynxDll.isContinuum
-        isContinuum.argtypes = [c_void_p, c_int, POINTER(c_bool)]
         code =  isContinuum(self._getReader(),whichFunction, continuum)
         return code, continuum.value
 
     def GetIonMode( self, whichFunction ):
         ionMode = c_int()
         getIonMode = MassLynxProvider.MassLynxDll.getIonMode
-        getIonMode.argtypes = [c_void_p, c_int, POINTER(c_int)]
         code = getIonMode(self._getReader(),whichFunction, ionMode )
         return code, ionMode.value
 
     def GetIonModeString( self, ionMode ):
         temp = c_char_p()
         getIonModeString = MassLynxProvider.MassLynxDll.getIonModeString
-        getIonModeString.argtypes = [c_void_p, c_int, POINTER(c_char_p)]
         code = getIonModeString(self._getReader(),ionMode, temp )
         return code, self.ToString( temp )
 
@@ -89,7 +81,6 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
         items = (c_int * nItems)(*whichItems)
         params = MassLynxParameters()
         getHeaderItemValue = MassLynxProvider.MassLynxDll.getHeaderItemValue
-        getHeaderItemValue.argtypes = [c_void_p, POINTER(c_int), c_int, c_void_p]
         code = getHeaderItemValue(self._getReader(), items, nItems, params.GetParameters())
         return code, params
 
@@ -98,86 +89,144 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
         items = (c_int * nItems)(*whichItems)
         params = MassLynxParameters()
         getHeaderItemValue = MassLynxProvider.MassLynxDll.getScanItemValue
-        getHeaderItemValue.argtypes = [c_void_p, c_int, c_int, POINTER(c_int), c_int, c_void_p]
         code = getHeaderItemValue(self._getReader(), whichFunction, whichScan, items, nItems, params.GetParameters())
         return code, params
 
+    def GetScanItemValues( self, whichFunction, whichScans, whichItems ):
+        # one item array and one parameter handle for every scan
+        nItems = len(whichItems )
+        items = (c_int * nItems)(*whichItems)
+        params = MassLynxParameters()
+        getScanItemValue = MassLynxProvider.MassLynxDll.getScanItemValue
+        getParameterValue = MassLynxProvider.MassLynxDll.getParameterValue
+
+        # one column of strings per item
+        values = [ [] for index in range(0, nItems) ]
+        value = c_char_p()
+        for whichScan in whichScans:
+            code = getScanItemValue(self._getReader(), whichFunction, whichScan, items, nItems, params.GetParameters())
+            if (0 != code):
+                return code, values
+
+            for index in range(0, nItems):
+                getParameterValue(params.GetParameters(), items[index], value)
+                values[index].append( value.value )
+
+        return 0, values
+
+    def GetScanIndex( self, whichFunction ):
+        # retention time of every scan, TIC and base peak from the scan items
+        # the dll does not expose the data offsets or peak counts
+        code, size = self.GetScansInFunction( whichFunction )
+        if (0 != code):
+            return code, None
+
+        retentionTime = c_float(0)
+        getRetentionTime = MassLynxProvider.MassLynxDll.getRetentionTime
+        rt = []
+        for whichScan in range(0, size):
+            code = getRetentionTime(self._getReader(), whichFunction, whichScan, retentionTime)
+            if (0 != code):
+                return code, None
+            rt.append( retentionTime.value )
+
+        whichItems = [ MassLynxScanItem.TOTAL_ION_CURRENT, MassLynxScanItem.BASE_PEAK_MASS, MassLynxScanItem.BASE_PEAK_INTENSITY ]
+        code, values = self.GetScanItemValues( whichFunction, range(0, size), whichItems )
+        if (0 != code):
+            return code, None
+
+        columns = { 'rt' : rt }
+        for name, column in zip( ('tic', 'basePeakMass', 'basePeakIntensity'), values ):
+            columns[ name ] = [ float(value) if value else float('nan') for value in column ]
+        return 0, columns
+
     def GetScanItemName( self, whichItems ):
         nItems = len(whichItems)
         items = (c_int * nItems)(*whichItems)
         params = MassLynxParameters()
         getScanItemName = MassLynxProvider.MassLynxDll.getScanItemName
-        getScanItemName.argtypes = [c_void_p, POINTER(c_int), c_int, c_void_p]
         code = getScanItemName(self._getReader(), items, nItems, params.GetParameters())
         return code, params
 
     def GetAcquisitionInfo( self ):
         params = MassLynxParameters()
         mlMethod = MassLynxProvider.MassLynxDll.getAcquisitionInfo
-        mlMethod.argtypes = [c_void_p, c_void_p]
         code = mlMethod(self._getReader(), params.GetParameters())
         return code, params
 
     def GetItemsInFunction( self, whichFunction ):
         params = MassLynxParameters()
         mlMethod = MassLynxProvider.MassLynxDll.getScanItemsInFunction
-        mlMethod.argtypes = [c_void_p, c_int, c_void_p]
         code =  mlMethod(self._getReader(),whichFunction,params.GetParameters())
         return code, params
 
     def GetCollisionalCrossSection( self, driftTime, mass, charge ):
         ccs = c_float(0)
         mlMethod = MassLynxProvider.MassLynxDll.getCollisionalCrossSection
-        mlMethod.argtypes = [c_void_p, c_float,c_float,c_int, POINTER(c_float)]
         code =  mlMethod(self._getReader(),driftTime,mass,charge,ccs)
         return code, ccs.value
 
     def GetDriftScanCount( self, whichFunction ):
         count = c_int(0)   
         mlMethod = MassLynxProvider.MassLynxDll.getDriftScanCount
-        mlMethod.argtypes = [c_void_p, c_int, POINTER(c_int)]
         code = mlMethod(self._getReader(),whichFunction,count)
         return code, count.value
 
     def GetMRMCount( self, whichFunction ):
         count = c_int(0)   
         mlMethod = MassLynxProvider.MassLynxDll.getMRMCount
-        mlMethod.argtypes = [c_void_p, c_int, POINTER(c_int)]
         code = mlMethod(self._getReader(),whichFunction,count)
         return code, count.value
 
+    def GetMRMMassRanges( self, whichFunction ):
+        # precursor / product of every transition, whichMRM selects the transition
+        # a transition that cannot be read is nan, the others are still returned
+        code, count = self.GetMRMCount( whichFunction )
+        if (0 != code):
+            return code, None, None
+
+        lowMass = c_float(0)
+        highMass = c_float(0)
+        getAcquisitionMassRange = MassLynxProvider.MassLynxDll.getAcquisitionMassRange
+        lowMasses = []
+        highMasses = []
+        for whichMRM in range(0, count):
+            code = getAcquisitionMassRange(self._getReader(), whichFunction, whichMRM, lowMass, highMass)
+            if (0 != code):
+                lowMasses.append( float('nan') )
+                highMasses.append( float('nan') )
+                continue
+            lowMasses.append( lowMass.value )
+            highMasses.append( highMass.value )
+        return 0, lowMasses, highMasses
+
     def GetRetentionTime( self, whichFunction, whichScan ):
         retentionTime = c_float(0)
         mlMethod = MassLynxProvider.MassLynxDll.getRetentionTime
-        mlMethod.argtypes = [c_void_p, c_int, c_int, POINTER(c_float)]
         code = mlMethod(self._getReader(),whichFunction,whichScan,retentionTime)
         return code, retentionTime.value
 
     def GetDriftTime( self, whichDrift ):
         driftTime = c_float(0)
         mlMethod = MassLynxProvider.MassLynxDll.getDriftTime
-        mlMethod.argtypes = [c_void_p, c_int, POINTER(c_float)]
         code = mlMethod(self._getReader(),whichDrift,driftTime)
         return code, driftTime.value
 
     def GetDriftTimeFromCCS( self, ccs, mass, charge ):
         driftTime = c_float(0)
         mlMethod = MassLynxProvider.MassLynxDll.getDriftTime_CCS
-        mlMethod.argtypes = [c_void_p, c_float, c_float, c_int, POINTER(c_float)]
         code = mlMethod(self._getReader(),ccs, mass, charge, driftTime)
         return code, driftTime.value
 
     def CanLockMassCorrect( self ):
         canApply = c_bool(0)
         mlMethod =  MassLynxProvider.MassLynxDll.canLockMassCorrect
-        mlMethod.argtypes = [c_void_p, POINTER(c_bool)]
         code = mlMethod(self._getReader(), canApply)
         return code, canApply.value
 
     def IsLockMassCorrected( self ):
         corrected = c_bool(0)
         mlMethod =  MassLynxProvider.MassLynxDll.isLockMassCorrected
-        mlMethod.argtypes = [c_void_p, POINTER(c_bool)]
         code =  mlMethod(self._getReader(), corrected)
         return code, corrected.value
 
@@ -185,7 +234,6 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
         hasLockMass = c_bool()
         whichFunction = c_int()
         mlMethod =  MassLynxProvider.MassLynxDll.getLockMassFunction
-        mlMethod.argtypes = [c_void_p, POINTER(c_bool), POINTER(c_int)]
         code =  mlMethod(self._getReader(), hasLockMass, whichFunction)
         return code, hasLockMass.value, whichFunction.value
 
@@ -193,7 +241,6 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
         startScan = c_int()
         endScan = c_int()
         mlMethod =  MassLynxProvider.MassLynxDll.getScanRangeFromTimeRange
-        mlMethod.argtypes = [c_void_p, c_int, c_float,c_float, POINTER(c_int), POINTER(c_int)]
         code =  mlMethod(self._getReader(), whichFunction, startTime, endTime, startScan, endScan)
         return code, startScan.value, endScan.value
 
@@ -201,7 +248,6 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
         startDrift = c_int()
         endDrift = c_int()
         mlMethod =  MassLynxProvider.MassLynxDll.getDriftRangeFromTimeRange
-        mlMethod.argtypes = [c_void_p, c_int, c_float,c_float, POINTER(c_int), POINTER(c_int)]
         code =  mlMethod(self._getReader(), whichFunction, startTime, endTime, startDrift, endDrift)
         return code, startDrift.value, endDrift.value
     
@@ -209,14 +255,12 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
         startIndex = c_int()
         endIndex = c_int()
         mlMethod =  MassLynxProvider.MassLynxDll.getIndexRange
-        mlMethod.argtypes = [c_void_p, c_int, c_float,c_float, POINTER(c_int), POINTER(c_int)]
         code =  mlMethod(self._getReader(), whichFunction, preCursorMass, preCursorTolerance * 2, startIndex, endIndex)
         return code, startIndex.value, endIndex.value
 
     def GetPrecursorMass( self, whichFunction, whichIndex ):
         mass = c_float()
         mlMethod =  MassLynxProvider.MassLynxDll.getPrecursorMass
-        mlMethod.argtypes = [c_void_p, c_int, c_int, POINTER(c_float)]
         code =  mlMethod(self._getReader(), whichFunction, whichIndex, mass)
         return code, mass.value
     
@@ -224,7 +268,6 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
         startMass = c_float()
         endMass = c_float()
         mlMethod =  MassLynxProvider.MassLynxDll.getIndexPrecursorMassRange
-        mlMethod.argtypes = [c_void_p, c_int, c_int, POINTER(c_float), POINTER(c_float)]
         code =  mlMethod(self._getReader(), whichFunction, whichIndex, startMass, endMass)
         return code, startMass.value, endMass.value
 
@@ -232,7 +275,6 @@ class MassLynxRawInfoReaderProvider(MassLynxReaderBaseProvider):
         startMass = c_float()
         endMass = c_float()
         mlMethod =  MassLynxProvider.MassLynxDll.getFunctionPrecursorMassRange
-        mlMethod.argtypes = [c_void_p, c_int, POINTER(c_float), POINTER(c_float)]
         code =  mlMethod(self._getReader(), whichFunction, startMass, endMass)
         return code, startMass.value, endMass.value
 
@@ -5,6 +5,8 @@
 
 from ctypes import*
 
+from ..MassLynxRawReader import MassLynxBuffer
+
 from .MassLynxProvider import MassLynxProvider
 from .MassLynxReaderBaseProvider import MassLynxReaderBaseProvider
 
@@ -12,90 +14,70 @@ class MassLynxRawScanReaderProvider(MassLynxReaderBaseProvider):
      
     def ReadScan(self, whichFunction, whichScan):
         size = c_int(0)
-        pMasses = c_void_p()
-        pIntensities = c_void_p()
+        pMasses = MassLynxBuffer()
+        pIntensities = MassLynxBuffer()
 
         # read scan
         readScan = MassLynxProvider.MassLynxDll.readScan
-        readScan.argtypes = [c_void_p, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)]
-        code = readScan(self._getReader(),whichFunction, whichScan,pMasses,pIntensities,size)
+        code = readScan(self._getReader(),whichFunction, whichScan,pMasses.Pointer(),pIntensities.Pointer(),size)
 
         # fill the array
-        pM = cast(pMasses,POINTER(c_float))
-        pI = cast(pIntensities,POINTER(c_float))
-
-        masses = pM[0:size.value]
-        intensities = pI[0:size.value]
+        masses = self.ToArray(pMasses, size.value)
+        intensities = self.ToArray(pIntensities, size.value)
         
         return code, masses, intensities
 
     def ReadScanFlags( self, whichFunction, whichScan ):               
         # create the retrun values
         size = c_int(0)
-        pMasses = c_void_p()
-        pIntensities = c_void_p()
-        pFlags = c_void_p()
+        pMasses = MassLynxBuffer()
+        pIntensities = MassLynxBuffer()
+        pFlags = MassLynxBuffer(c_byte)
 
         # read scan
         readScanFlags = MassLynxProvider.MassLynxDll.readScanFlags
-        readScanFlags.argtypes = [c_void_p, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)]
-        code= readScanFlags(self._getReader(),whichFunction,whichScan,pMasses,pIntensities,pFlags,size)
+        code= readScanFlags(self._getReader(),whichFunction,whichScan,pMasses.Pointer(),pIntensities.Pointer(),pFlags.Pointer(),size)
 
         # fill the array
-        pM = cast(pMasses,POINTER(c_float))
-        pI = cast(pIntensities,POINTER(c_float))
+        masses = self.ToArray(pMasses, size.value)
+        intensities = self.ToArray(pIntensities, size.value)
 
-        masses = pM[0:size.value]
-        intensities = pI[0:size.value]
-
-        # check for flags
-        flags = []
-        if None != pFlags.value:
-            pF = cast(pFlags,POINTER(c_byte))
-            flags = pF[0:size.value]
+        # check for flags - empty if none returned
+        flags = self.ToArray(pFlags, size.value)
 
         return code, masses, intensities, flags
 
     def ReadDriftScan( self, whichFunction, whichScan, whichDrift ):             
         # create the retrun values
         size = c_int(0)
-        pMasses = c_void_p()
-        pIntensities = c_void_p()
+        pMasses = MassLynxBuffer()
+        pIntensities = MassLynxBuffer()
 
         # read scan
         readDriftScan = MassLynxProvider.MassLynxDll.readDriftScan
-        readDriftScan.argtypes = [c_void_p, c_int, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)]
-        code =  readDriftScan(self._getReader(),whichFunction, whichScan, whichDrift, pMasses,pIntensities,size)
+        code =  readDriftScan(self._getReader(),whichFunction, whichScan, whichDrift, pMasses.Pointer(),pIntensities.Pointer(),size)
 
         # fill the array
-        pM = cast(pMasses,POINTER(c_float))
-        pI = cast(pIntensities,POINTER(c_float))
-
-        masses = pM[0:size.value]
-        intensities = pI[0:size.value]
+        masses = self.ToArray(pMasses, size.value)
+        intensities = self.ToArray(pIntensities, size.value)
    
         return code, masses, intensities
 
     def ReadProductScan(self, whichFunction, whichScan):
         # create the retrun values
         size = c_int(0)
-        pMasses = c_void_p()
-        pIntensities = c_void_p()
-        pProductMasses = c_void_p()
+        pMasses = MassLynxBuffer()
+        pIntensities = MassLynxBuffer()
+        pProductMasses = MassLynxBuffer()
         productSize = c_int(0)
 
         readProductScan = MassLynxProvider.MassLynxDll.readProductScan
-        readProductScan.argtypes = [c_void_p, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int), POINTER(c_int)]
-        code =  readProductScan(self._getReader(),whichFunction, whichScan, pMasses, pIntensities, pProductMasses, size, productSize)
+        code =  readProductScan(self._getReader(),whichFunction, whichScan, pMasses.Pointer(), pIntensities.Pointer(), pProductMasses.Pointer(), size, productSize)
 
         # fill the array
-        pM = cast(pMasses,POINTER(c_float))
-        pI = cast(pIntensities,POINTER(c_float))
-        pPM = cast(pProductMasses,POINTER(c_float))
-
-        masses = pM[0:size.value]
-        intensities = pI[0:size.value]
-        productMasses = pPM[0:productSize.value]
+        masses = self.ToArray(pMasses, size.value)
+        intensities = self.ToArray(pIntensities, size.value)
+        productMasses = self.ToArray(pProductMasses, productSize.value)
 
         return code, masses, intensities, productMasses
 
@@ -103,57 +85,43 @@ class MassLynxRawScanReaderProvider(MassLynxReaderBaseProvider):
         # create the retrun values
         size = c_int(0)
         offset = c_int(0)
-        pMasses = c_void_p()
+        pMasses = MassLynxBuffer()
         mlMethod = MassLynxProvider.MassLynxDll.getDriftMassScale
-        mlMethod.argtypes = [c_void_p, c_int, c_int, POINTER(c_void_p), POINTER(c_int), POINTER(c_int)]
-        code =  mlMethod(self._getReader(),whichFunction, whichScan, pMasses, size, offset)
+        code =  mlMethod(self._getReader(),whichFunction, whichScan, pMasses.Pointer(), size, offset)
 
         # fill the array
-        pM = cast(pMasses,POINTER(c_float))
-
-        masses = pM[0:size.value]
+        masses = self.ToArray(pMasses, size.value)
 
         return code, masses, offset.value
     
     def ReadDriftScanIndex(self, whichFunction, whichScan, whichDrift):
         size = c_int(0)
-        pMasses = c_void_p()
-        pIntensities = c_void_p()
+        pMasses = MassLynxBuffer(c_int)
+        pIntensities = MassLynxBuffer()
         mlMethod =  MassLynxProvider.MassLynxDll.readDriftScanIndex
-        mlMethod.argtypes = [c_void_p, c_int, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)]
-        code =  mlMethod(self._getReader(), whichFunction, whichScan, whichDrift,  pMasses, pIntensities, size)
+        code =  mlMethod(self._getReader(), whichFunction, whichScan, whichDrift,  pMasses.Pointer(), pIntensities.Pointer(), size)
 
         # fill the array
-        pM = cast(pMasses,POINTER(c_int))
-        pI = cast(pIntensities,POINTER(c_float))
-
-        masses = pM[0:size.value]
-        intensities = pI[0:size.value]
+        masses = self.ToArray(pMasses, size.value)
+        intensities = self.ToArray(pIntensities, size.value)
     
         return code, masses, intensities
     
     def ReadDriftScanFlagsIndex(self, whichFunction, whichScan, whichDrift):
         size = c_int(0)
-        pMasses = c_void_p()
-        pIntensities = c_void_p()
-        pFlags = c_void_p()
+        pMasses = MassLynxBuffer(c_int)
+        pIntensities = MassLynxBuffer()
+        pFlags = MassLynxBuffer(c_byte)
 
         mlMethod =  MassLynxProvider.MassLynxDll.readDriftScanFlagsIndex
-        mlMethod.argtypes = [c_void_p, c_int, c_int, c_int, POINTER(c_void_p), POINTER(c_void_p), POINTER(c_void_p), POINTER(c_int)]
-        code =  mlMethod(self._getReader(), whichFunction, whichScan, whichDrift,  pMasses, pIntensities, pFlags, size)
+        code =  mlMethod(self._getReader(), whichFunction, whichScan, whichDrift,  pMasses.Pointer(), pIntensities.Pointer(), pFlags.Pointer(), size)
 
         # fill the array
-        pM = cast(pMasses,POINTER(c_int))
-        pI = cast(pIntensities,POINTER(c_float))
-
-        masses = pM[0:size.value]
-        intensities = pI[0:size.value]
+        masses = self.ToArray(pMasses, size.value)
+        intensities = self.ToArray(pIntensities, size.value)
 
-        # check for flags
-        flags = []
-        if None != pFlags.value:
-            pF = cast(pFlags,POINTER(c_byte))
-            flags = pF[0:size.value]
+        # check for flags - empty if none returned
+        flags = self.ToArray(pFlags, size.value)
 
         return code, masses, intensities, flags
         
\ No newline at end of file
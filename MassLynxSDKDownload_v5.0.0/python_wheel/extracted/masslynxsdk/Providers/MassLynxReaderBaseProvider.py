@@ -5,12 +5,15 @@
 
 from ctypes import*
 
+from ..MassLynxRawReader import MassLynxArrayHandler
+
 from .MassLynxProvider import MassLynxProvider
 
 class MassLynxReaderBaseProvider(object):
 
     def __init__( self ):
         self._mlRawReader = c_void_p()
+        self._arrayHandler = MassLynxArrayHandler()
 
     # destroy the reader
     def __del__(self):
@@ -19,25 +22,34 @@ class MassLynxReaderBaseProvider(object):
 
     def _getReader(self):
         return self._mlRawReader
+
+    def SetArrayMode(self, arrayMode):
+        self._arrayHandler.SetArrayMode(arrayMode)
+
+    def GetArrayMode(self):
+        return self._arrayHandler.GetArrayMode()
+
+    def ToArray(self, buffer, size, rows = None):
+        return self._arrayHandler.ToArray(buffer, size, rows)
         
     def createRawReaderFromPath(self, bytes, mlType, license):
         mlMethod = MassLynxProvider.MassLynxDll.createRawReaderFromPath
-        mlMethod.argtypes = [ c_char_p, POINTER(c_void_p), c_int, c_char_p]
         return mlMethod(bytes, self._getReader(), mlType, license)
 
     def createRawReaderFromReader(self, source, mlType):
         mlMethod = MassLynxProvider.MassLynxDll.createRawReaderFromReader
-        mlMethod.argtypes = [ c_void_p, POINTER(c_void_p), c_int]
         return mlMethod(source._getReader(),self._getReader(),mlType)
 
     def destroyRawReader(self):
+        # destroy once - the handle is cleared so later calls are ignored
+        if (None == self._mlRawReader.value):
+            return
         mlMethod = MassLynxProvider.MassLynxDll.destroyRawReader
-        mlMethod.argtypes = [c_void_p]          
         mlMethod( self._getReader() )
+        self._mlRawReader = c_void_p()
 
     def updateRawReader(self):
         mlMethod = MassLynxProvider.MassLynxDll.updateRawReader
-        mlMethod.argtypes = [c_void_p]          
         return mlMethod( self._getReader() )
 
   
\ No newline at end of file
@@ -0,0 +1,76 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ..MassLynxRawReader import MassLynxException
+from ..MassLynxRawDefs import MassLynxBaseType
+
+from .MassLynxMmapProvider import MassLynxMmapReaderBaseProvider, MassLynxMmapInfoProvider, MassLynxMmapScanProvider, MassLynxMmapChromatogramProvider
+from .MassLynxSyntheticRun import MassLynxSyntheticRun, MassLynxSyntheticDriftBin
+
+class MassLynxSyntheticReaderBaseProvider(MassLynxMmapReaderBaseProvider):
+    """
+    Provider that generates the data of a run instead of reading it
+    The generated run has the same interface as the parsed .raw directory, so the readers
+    go through the same code as the mmap backend, plus drift scans.
+    """
+
+    _backendName = "synthetic"
+
+    def createRawReaderFromPath(self, bytes, mlType, license):
+        try:
+            self._directory = MassLynxSyntheticRun( bytes.decode() )
+        except (ImportError, ValueError) as e:
+            raise MassLynxException( 1, str(e) )
+        return 0
+
+    def createRawReaderFromReader(self, source, mlType):
+        if (not isinstance(source, MassLynxSyntheticReaderBaseProvider)):
+            raise MassLynxException( 1, "a synthetic reader can only be created from a synthetic reader" )
+        self._directory = source.GetDirectory()
+        return 0
+
+class MassLynxSyntheticInfoProvider(MassLynxSyntheticReaderBaseProvider, MassLynxMmapInfoProvider):
+
+    def GetDriftScanCount( self, whichFunction ):
+        return 0, self._Function( whichFunction ).drift
+
+    def GetDriftTime( self, whichDrift ):
+        return 0, whichDrift * MassLynxSyntheticDriftBin
+
+    def GetDriftRangeFromTimeRange( self, whichFunction, startTime, endTime ):
+        drift = self._Function( whichFunction ).drift
+        startDrift = min( drift, max( 0, int( numpy.ceil( startTime / MassLynxSyntheticDriftBin ) ) ) )
+        endDrift = min( drift - 1, int( numpy.floor( endTime / MassLynxSyntheticDriftBin ) ) )
+        return 0, startDrift, max( startDrift, endDrift )
+
+    def GetMRMMassRanges( self, whichFunction ):
+        function = self._Function( whichFunction )
+        if (0 == function.mrm):
+            return 0, [], []
+        return 0, function.precursors.tolist(), function.masses.tolist()
+
+class MassLynxSyntheticScanProvider(MassLynxSyntheticReaderBaseProvider, MassLynxMmapScanProvider):
+
+    def ReadDriftScan( self, whichFunction, whichScan, whichDrift ):
+        try:
+            masses, intensities = self._Function( whichFunction ).ReadDriftScan( whichScan, whichDrift )
+        except IndexError as e:
+            raise MassLynxException( 1, str(e) )
+        return 0, self.ToArray( masses ), self.ToArray( intensities )
+
+class MassLynxSyntheticChromatogramProvider(MassLynxSyntheticReaderBaseProvider, MassLynxMmapChromatogramProvider):
+    pass
+
+# reader type -> provider class
+MassLynxSyntheticProviders = {
+    MassLynxBaseType.INFO : MassLynxSyntheticInfoProvider,
+    MassLynxBaseType.SCAN : MassLynxSyntheticScanProvider,
+    MassLynxBaseType.CHROM : MassLynxSyntheticChromatogramProvider,
+}
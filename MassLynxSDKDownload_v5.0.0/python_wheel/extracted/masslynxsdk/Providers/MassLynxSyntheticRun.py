@@ -0,0 +1,228 @@
+'''
+     Waters 
+    MassLynx Python SDK
+'''
+
+import re
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+## \cond
+# parameter -> (type, default)
+MassLynxSyntheticParameters = {
+    'functions' : ( int, 1 ),       # number of functions
+    'scans' : ( int, 1000 ),        # scans per function
+    'points' : ( int, 1000 ),       # peaks per spectrum of a scanning function
+    'mrm' : ( int, 0 ),             # transitions per function, every function is MRM when > 0
+    'drift' : ( int, 0 ),           # drift bins per scan, 0 for no mobility
+    'compounds' : ( int, 30 ),      # chromatographic peaks per function
+    'runtime' : ( float, 10.0 ),    # minutes
+    'lowmass' : ( float, 50.0 ),
+    'highmass' : ( float, 1200.0 ),
+    'noise' : ( float, 100.0 ),     # mean intensity of the noise peaks
+    'seed' : ( int, 0 ),
+}
+
+# ms per drift bin, a 200 bin mobility cycle lasts ~14 ms
+MassLynxSyntheticDriftBin = 0.0695
+## \endcond
+
+class MassLynxSyntheticFunctionData(object):
+    """
+    Data of one synthetic function, same attributes as MassLynxRawFunctionData
+    Each scan is generated from its own random stream, so a scan read alone or through ReadAllPeaks
+    gives the same peaks, and two runs with the same parameters give the same data.
+    Compounds elute as gaussian peaks over the run, on top of exponential noise.
+    """
+
+    def __init__(self, run, number):
+        parameters = run.parameters
+        self._run = run
+        self._number = number
+        self._lock = threading.Lock()
+        self._peaks = None
+        self._tic = None
+
+        scans = parameters['scans']
+        self.mrm = parameters['mrm']
+        self.drift = parameters['drift']
+        self.rt = numpy.linspace( 0.0, parameters['runtime'], scans, dtype=numpy.float32 )
+        self.counts = numpy.full( scans, self.mrm if self.mrm > 0 else parameters['points'], dtype=numpy.int64 )
+        self.peakBytes = 8
+        self.offsets = numpy.zeros( scans, dtype=numpy.int64 )
+        numpy.cumsum( self.counts[:-1] * self.peakBytes, out=self.offsets[1:] )
+
+        # compounds of the function
+        rng = numpy.random.default_rng( [ parameters['seed'], number ] )
+        compounds = max( 1, self.mrm if self.mrm > 0 else parameters['compounds'] )
+        runtime = parameters['runtime']
+        self.centers = rng.uniform( 0.05, 0.95, compounds ) * runtime
+        self.widths = rng.uniform( 0.003, 0.01, compounds ) * runtime
+        self.heights = numpy.exp( rng.uniform( numpy.log(1e4), numpy.log(1e7), compounds ) )
+        self.masses = numpy.sort( rng.uniform( parameters['lowmass'], parameters['highmass'], compounds ) )
+        # MRM precursors, each product ion comes from a heavier precursor
+        self.precursors = self.masses + rng.uniform( 20.0, 250.0, compounds )
+
+    def GetScanCount( self ):
+        return len(self.rt)
+
+    @property
+    def tic( self ):
+        # computed once, scan by scan so a large run never needs all its peaks in memory
+        with self._lock:
+            if (self._tic is None):
+                tic = numpy.zeros( len(self.rt), dtype=numpy.float32 )
+                for whichScan in range( len(self.rt) ):
+                    tic[ whichScan ] = self._Generate( whichScan )[1].sum()
+                self._tic = tic
+            return self._tic
+
+    def ReadScan( self, whichScan ):
+        """
+        Generates the peaks of one scan
+
+        @return float64 masses, float32 intensities
+        """
+        if (whichScan < 0 or whichScan >= len(self.rt)):
+            raise IndexError( "scan %d out of range" % whichScan )
+        return self._Generate( whichScan )
+
+    def ReadDriftScan( self, whichScan, whichDrift ):
+        """
+        Generates the peaks of one drift bin, every peak drifts around a bin that grows with its mass
+
+        @return float64 masses, float32 intensities
+        """
+        if (whichDrift < 0 or whichDrift >= self.drift):
+            raise IndexError( "drift %d out of range" % whichDrift )
+        masses, intensities = self.ReadScan( whichScan )
+        parameters = self._run.parameters
+        center = (masses - parameters['lowmass']) / (parameters['highmass'] - parameters['lowmass']) * self.drift
+        weights = numpy.exp( -0.5 * numpy.square( (whichDrift - center) / max( 1.0, self.drift / 40.0 ) ) ).astype( numpy.float32 )
+        keep = weights > 1e-3
+        return masses[ keep ], intensities[ keep ] * weights[ keep ]
+
+    def ReadAllPeaks( self ):
+        """
+        Generates every peak of the function once, cached
+
+        @return float64 masses, float32 intensities, int64 index of the first peak of each scan
+        """
+        with self._lock:
+            if (None == self._peaks):
+                starts = self.offsets // self.peakBytes
+                if (0 == len(self.rt)):
+                    self._peaks = ( numpy.zeros( 0 ), numpy.zeros( 0, dtype=numpy.float32 ), starts )
+                else:
+                    scans = [ self._Generate( whichScan ) for whichScan in range( len(self.rt) ) ]
+                    self._peaks = ( numpy.concatenate( [ scan[0] for scan in scans ] ), numpy.concatenate( [ scan[1] for scan in scans ] ), starts )
+            return self._peaks
+
+    ## \cond
+    def _Generate( self, whichScan ):
+        parameters = self._run.parameters
+        rng = numpy.random.default_rng( [ parameters['seed'], self._number, whichScan ] )
+        elution = self.heights * numpy.exp( -0.5 * numpy.square( (self.rt[ whichScan ] - self.centers) / self.widths ) )
+
+        if (self.mrm > 0):
+            # one product ion per transition
+            intensities = rng.exponential( parameters['noise'], self.mrm ) + elution
+            return self.masses.copy(), intensities.astype( numpy.float32 )
+
+        # noise peaks with the compounds mixed in, sorted by mass
+        points = parameters['points']
+        compounds = min( points, len(self.masses) )
+        masses = numpy.concatenate( ( rng.uniform( parameters['lowmass'], parameters['highmass'], points - compounds ), self.masses[ :compounds ] ) )
+        intensities = numpy.concatenate( ( rng.exponential( parameters['noise'], points - compounds ), elution[ :compounds ] ) )
+        order = numpy.argsort( masses, kind='stable' )
+        return masses[ order ], intensities[ order ].astype( numpy.float32 )
+    ## \endcond
+
+class MassLynxSyntheticRun(object):
+    """
+    Generated stand-in for a .raw directory, same interface as MassLynxRawDirectory
+    Opened from a path such as "synthetic:functions=2,scans=600,points=2000,drift=200",
+    see MassLynxSyntheticParameters for the parameters and their defaults.
+    """
+
+    Prefix = "synthetic:"
+
+    def __init__(self, path):
+        if (None == numpy):
+            raise ImportError( "numpy is required for the synthetic backend" )
+
+        self._path = path
+        self._lock = threading.Lock()
+        self._functions = {}
+        self.parameters = MassLynxSyntheticRun.Parse( path )
+        self.header = {
+            'acquiredname' : "synthetic",
+            'acquireddate' : "01-Jan-2000",
+            'acquiredtime' : "00:00:00",
+            'instrument' : "Synthetic",
+            'sampledescription' : path,
+            'sampleid' : "seed %d" % self.parameters['seed'],
+            'bottlenumber' : "1:1",
+        }
+        self.numbers = list( range( 1, self.parameters['functions'] + 1 ) )
+
+    @staticmethod
+    def Parse( path ):
+        """
+        Reads the parameters of a synthetic path
+
+        @param  path "synthetic:" followed by name=value pairs separated by , ; or &
+
+        @return dict of parameter -> value
+        """
+        parameters = { name : default for name, (kind, default) in MassLynxSyntheticParameters.items() }
+        text = path[ len(MassLynxSyntheticRun.Prefix) : ] if path.startswith( MassLynxSyntheticRun.Prefix ) else ""
+        for pair in re.split( r'[,;&]', text ):
+            if (not pair.strip()):
+                continue
+            name, sep, value = pair.partition( '=' )
+            name = name.strip().lower()
+            if (name not in MassLynxSyntheticParameters):
+                raise ValueError( "unknown synthetic parameter: %s" % name )
+            parameters[ name ] = MassLynxSyntheticParameters[ name ][0]( value.strip() )
+        if (parameters['functions'] < 1 or parameters['scans'] < 0 or parameters['points'] < 0 or parameters['mrm'] < 0 or parameters['drift'] < 0):
+            raise ValueError( "synthetic parameters must be positive: %s" % path )
+        return parameters
+
+    def GetPath( self ):
+        return self._path
+
+    def GetFunctionCount( self ):
+        return len(self.numbers)
+
+    def GetFunction( self, whichFunction ):
+        """
+        Returns the data of a function (0 based), generated on first use
+
+        @return MassLynxSyntheticFunctionData
+        """
+        if (whichFunction < 0 or whichFunction >= len(self.numbers)):
+            raise IndexError( "function %d out of range" % whichFunction )
+        with self._lock:
+            function = self._functions.get( whichFunction )
+            if (None == function):
+                function = MassLynxSyntheticFunctionData( self, whichFunction )
+                self._functions[ whichFunction ] = function
+            return function
+
+    def GetFunctionInfo( self, whichFunction ):
+        """
+        Returns the title and values of a function, as read from _extern.inf
+
+        @return title, dict of normalised key -> value
+        """
+        title = "Function %d - MRM of %d channels, ES+" % (whichFunction + 1, self.parameters['mrm']) if (self.parameters['mrm'] > 0) else "Function %d - TOF MS FUNCTION, ES+, Centroid" % (whichFunction + 1)
+        return title, { 'startmass' : str(self.parameters['lowmass']), 'endmass' : str(self.parameters['highmass']) }
+
+    def Refresh( self ):
+        # generated data never changes
+        pass
@@ -1,17 +1,68 @@
-from .MassLynxRawDefs import ( MassLynxIonMode, MassLynxIonMode, MassLynxHeaderItem, MassLynxScanItem, MassLynxSampleListItem, LockMassParameter, AnalogParameter, 
-    AnalogTraceType, AutoLynxStatus, AutoLynxSettings, CentroidParameter, SmoothParameter, SmoothType, ThresholdParameter, ThresholdType, AcquisitionParameter,
-    MassLynxAcquisitionType, MassLynxScanType, MassLynxStatusType, MassLynxDDAIndexInfo, DDAIsolationWindowParameter, DDAParameter, LicenseParameter )
-from .MassLynxRawReader import MassLynxException, MassLynxStringHandler, MassLynxCodeHandler, MassLynxRawReader
-from .MassLynxParameters import MassLynxParameters
-from .MassLynxLicense import MassLynxLicense
-from .MassLynxAcquisition import MassLynxAcquisition
-from .MassLynxDDAProcessor import MassLynxDDAProcessor, MassLynxDDAProcessorEx
-from .MassLynxLockMassProcessor import MassLynxLockMassProcessor
-from .MassLynxProcessorBase import MassLynxException, MassLynxStringHandler, MassLynxCodeHandler, MassLynxProcessorBase
-from .MassLynxRawAnalogReader import MassLynxRawAnalogReader
-from .MassLynxRawChromatogramReader import MassLynxRawChromatogramReader, MassLynxRawChromatogramReaderEx
-from .MassLynxRawInfoReader import MassLynxRawInfoReader, MassLynxRawInfoReaderEx
-from .MassLynxRawScanReader import MassLynxRawScanReader, MassLynxRawScanReaderEx
-from .MassLynxSampleList import MassLynxSampleList
-from .MassLynxScanProcessor import MassLynxScanProcessor
+import importlib
+import sys
+import types
 
+# the modules are imported by the first access to one of their names, so importing the package
+# does not pay for numpy, asyncio or the MassLynxRaw library until they are used
+## \cond
+_MassLynxExports = {
+    'MassLynxRawDefs' : ( 'MassLynxIonMode', 'MassLynxHeaderItem', 'MassLynxScanItem', 'MassLynxSampleListItem', 'LockMassParameter', 'AnalogParameter',
+        'AnalogTraceType', 'AutoLynxStatus', 'AutoLynxSettings', 'CentroidParameter', 'SmoothParameter', 'SmoothType', 'ThresholdParameter', 'ThresholdType', 'AcquisitionParameter',
+        'MassLynxAcquisitionType', 'MassLynxScanType', 'MassLynxStatusType', 'MassLynxDDAIndexInfo', 'DDAIsolationWindowParameter', 'DDAParameter', 'LicenseParameter' ),
+    'MassLynxRawReader' : ( 'MassLynxBuffer', 'MassLynxRawBackend', 'MassLynxRawReader' ),
+    'MassLynxParameters' : ( 'MassLynxParameters', ),
+    'MassLynxLicense' : ( 'MassLynxLicense', ),
+    'MassLynxAcquisition' : ( 'MassLynxAcquisition', ),
+    'MassLynxDDAProcessor' : ( 'MassLynxDDAProcessor', 'MassLynxDDAProcessorEx' ),
+    'MassLynxHeaderSnapshot' : ( 'MassLynxHeaderSnapshot', ),
+    'MassLynxInstrumentation' : ( 'MassLynxInstrumentation', ),
+    'MassLynxLockMassProcessor' : ( 'MassLynxLockMassProcessor', ),
+    'MassLynxMetadataCache' : ( 'MassLynxMetadataCache', ),
+    'MassLynxMRMMetadata' : ( 'MassLynxMRMMetadata', ),
+    'MassLynxProcessorBase' : ( 'MassLynxException', 'MassLynxStringHandler', 'MassLynxCodeHandler', 'MassLynxProcessorBase' ),
+    'MassLynxRawAnalogReader' : ( 'MassLynxRawAnalogReader', ),
+    'MassLynxRawAsync' : ( 'MassLynxAsyncRawFile', 'MassLynxAsyncRawInfoReader', 'MassLynxAsyncRawChromatogramReader', 'MassLynxAsyncRawScanReader' ),
+    'MassLynxRawChromatogramReader' : ( 'MassLynxRawChromatogramReader', 'MassLynxRawChromatogramReaderEx' ),
+    'MassLynxRawInfoReader' : ( 'MassLynxRawInfoReader', 'MassLynxRawInfoReaderEx' ),
+    'MassLynxRawScanReader' : ( 'MassLynxRawScanReader', 'MassLynxRawScanReaderEx' ),
+    'MassLynxRawSession' : ( 'MassLynxRawSession', 'MassLynxRawThreadSessions' ),
+    'MassLynxRawSessionPool' : ( 'MassLynxRawSessionPool', ),
+    'MassLynxSampleList' : ( 'MassLynxSampleList', ),
+    'MassLynxScanIndex' : ( 'MassLynxScanIndex', ),
+    'MassLynxScanItemTable' : ( 'MassLynxScanItemTable', ),
+    'MassLynxScanIterator' : ( 'MassLynxScanIterator', ),
+    'MassLynxScanProcessor' : ( 'MassLynxScanProcessor', ),
+    'MassLynxTransitionTable' : ( 'MassLynxTransitionTable', ),
+}
+
+# name -> module, MassLynxException, MassLynxStringHandler and MassLynxCodeHandler come from
+# MassLynxProcessorBase as they did when every module was imported here
+_MassLynxModules = { name : module for module, names in _MassLynxExports.items() for name in names }
+
+__all__ = sorted( _MassLynxModules )
+
+def __getattr__( name ):
+    module = _MassLynxModules.get( name )
+    if (None == module):
+        raise AttributeError( "module %r has no attribute %r" % (__name__, name) )
+
+    value = getattr( importlib.import_module( "." + module, __name__ ), name )
+
+    # later lookups find the name directly
+    globals()[ name ] = value
+    return value
+
+def __dir__():
+    return sorted( set( globals() ) | set( __all__ ) )
+
+class _MassLynxPackage( types.ModuleType ):
+
+    # the import system sets each submodule on the package, most of them share their name
+    # with the class they define, the name must keep resolving to the class
+    def __setattr__( self, name, value ):
+        if (isinstance( value, types.ModuleType ) and name in _MassLynxModules):
+            return
+        super().__setattr__( name, value )
+
+sys.modules[ __name__ ].__class__ = _MassLynxPackage
+## \endcond
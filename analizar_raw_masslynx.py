@@ -8,13 +8,15 @@ Autor: Análisis del SDK de MassLynx v5.0.0
 
 import sys
 import os
-import struct
-import re
 from pathlib import Path
-from ctypes import *
 
-# Agregar el path del SDK de MassLynx
-sdk_path = r"c:\Damico\Laboratorio\Software\Prueba\MassLynxSDKDownload_v5.0.0\python_wheel\extracted"
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Agregar el path del SDK de MassLynx (relativo a este archivo)
+sdk_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "MassLynxSDKDownload_v5.0.0", "python_wheel", "extracted")
 sys.path.insert(0, sdk_path)
 
 # Importar las clases necesarias del SDK
@@ -23,31 +25,98 @@ from masslynxsdk import (
     MassLynxRawInfoReaderEx,
     MassLynxRawChromatogramReader,
     MassLynxRawScanReader,
+    MassLynxRawSession,
+    MassLynxRawBackend,
     MassLynxHeaderItem,
     MassLynxScanItem,
+    MassLynxMetadataCache,
     MassLynxException
 )
-from masslynxsdk.Providers.MassLynxProvider import MassLynxProvider
+
+from resultados_analisis import (
+    Cromatograma,
+    CromatogramasFuncion,
+    Espectro,
+    InfoFuncion,
+    ResultadoAnalisis,
+    Transicion,
+    a_float32,
+    matriz_float32
+)
+from exportar_tablas import agrupar_por_tiempos, escribir_tabla
+from renderizar_resultados import (
+    imprimir,
+    imprimir_resultado,
+    lineas_cromatogramas,
+    lineas_encabezado,
+    lineas_espectro,
+    lineas_funciones,
+    lineas_parametros,
+    lineas_transiciones
+)
+
+
+# Versión del formato de lo que el analizador guarda en la caché de metadatos;
+# cambiarla cuando cambie el contenido de los resultados del header o de las funciones
+VERSION_CACHE = 4
+
+# Items del header que se leen, con su descripción
+ITEMS_HEADER = {
+    MassLynxHeaderItem.ACQUIRED_NAME: "Nombre de adquisición",
+    MassLynxHeaderItem.ACQUIRED_DATE: "Fecha de adquisición",
+    MassLynxHeaderItem.ACQUIRED_TIME: "Hora de adquisición",
+    MassLynxHeaderItem.SAMPLE_ID: "ID de muestra",
+    MassLynxHeaderItem.INSTRUMENT: "Instrumento",
+    MassLynxHeaderItem.JOB_CODE: "Código de trabajo",
+    MassLynxHeaderItem.USER_NAME: "Usuario",
+    MassLynxHeaderItem.SAMPLE_DESCRIPTION: "Descripción de muestra",
+    MassLynxHeaderItem.BOTTLE_NUMBER: "Número de vial"
+}
+
+# Parámetros de scan que se leen, con su descripción
+ITEMS_SCAN = {
+    MassLynxScanItem.COLLISION_ENERGY: "Energía de colisión (eV)",
+    MassLynxScanItem.SAMPLING_CONE_VOLTAGE: "Voltaje de cono (V)",
+    MassLynxScanItem.SOURCE_TEMPERATURE: "Temperatura de fuente (°C)",
+    MassLynxScanItem.PROBE_TEMPERATURE: "Temperatura de sonda (°C)",
+    MassLynxScanItem.RF_VOLTAGE: "Voltaje RF",
+    MassLynxScanItem.MULTIPLIER1: "Multiplicador 1",
+    MassLynxScanItem.MULTIPLIER2: "Multiplicador 2",
+    MassLynxScanItem.SET_MASS: "Masa configurada",
+    MassLynxScanItem.ION_ENERGY: "Energía de iones",
+    MassLynxScanItem.BASE_PEAK_MASS: "Masa del pico base",
+    MassLynxScanItem.BASE_PEAK_INTENSITY: "Intensidad del pico base",
+    MassLynxScanItem.TOTAL_ION_CURRENT: "Corriente iónica total (TIC)"
+}
 
 
 class AnalizadorRawMassLynx:
     """Clase para analizar archivos .raw de MassLynx y extraer toda la información"""
     
-    def __init__(self, ruta_raw, ruta_licencia=None):
+    def __init__(self, ruta_raw, ruta_licencia=None, cache=True, silencioso=False):
         """
         Inicializa el analizador con la ruta del archivo .raw
         
         Args:
-            ruta_raw: Ruta completa al archivo .raw (carpeta)
+            ruta_raw: Ruta completa al archivo .raw (carpeta), o ruta sintética
+                      ("synthetic:scans=600,mrm=40", ver MassLynxRawBackend.SyntheticPath)
             ruta_licencia: Ruta al archivo license.key (opcional, busca automáticamente)
+            cache: True para guardar header y funciones en la caché de metadatos por defecto
+                   (MassLynxMetadataCache, desactivable con MASSLYNX_CACHE=0), False para no
+                   usarla, o una MassLynxMetadataCache
+            silencioso: no imprimir los avisos de licencia, apertura y exportación
+                        (para lotes que usan analizar())
         """
         self.ruta_raw = ruta_raw
-        self.info_reader = None
-        self.chrom_reader = None
-        self.scan_reader = None
-        
-        # Validar que existe el archivo
-        if not os.path.exists(ruta_raw):
+        self.silencioso = silencioso
+        self.sesion = None
+        self._huella = None
+        if cache is True:
+            cache = MassLynxMetadataCache() if os.environ.get("MASSLYNX_CACHE", "1") != "0" else None
+        self.cache = cache or None
+        
+        # Validar que existe el archivo (las rutas sintéticas no son carpetas)
+        if not MassLynxRawBackend.IsSyntheticPath(ruta_raw) and not os.path.exists(ruta_raw):
             raise FileNotFoundError(f"No se encontró el archivo: {ruta_raw}")
         
         # Buscar archivo de licencia
@@ -67,517 +136,597 @@ class AnalizadorRawMassLynx:
             try:
                 with open(ruta_licencia, 'r') as f:
                     licencia = f.read().strip()
-                print(f"✓ Licencia cargada desde: {ruta_licencia}")
+                self._avisar(f"✓ Licencia cargada desde: {ruta_licencia}")
             except Exception as e:
-                print(f"Advertencia: No se pudo leer licencia: {e}")
+                self._avisar(f"Advertencia: No se pudo leer licencia: {e}")
         else:
-            print(f"Advertencia: No se encontró archivo de licencia en: {ruta_licencia}")
+            self._avisar(f"Advertencia: No se encontró archivo de licencia en: {ruta_licencia}")
         
-        # Inicializar los lectores con licencia (usar versión extendida para MRM)
+        # Abrir el archivo una sola vez; los lectores de cromatogramas y scans se crean
+        # a partir del mismo handle la primera vez que se usan
         try:
-            self.info_reader = MassLynxRawInfoReaderEx(ruta_raw, licencia)
-            self.chrom_reader = MassLynxRawChromatogramReader(ruta_raw, licencia)
-            self.scan_reader = MassLynxRawScanReader(ruta_raw, licencia)
-            print("✓ Lectores inicializados correctamente")
+            self.sesion = MassLynxRawSession(ruta_raw, licencia)
+            self._avisar("✓ Lectores inicializados correctamente")
         except Exception as e:
-            print(f"Error al inicializar lectores: {e}")
+            self._avisar(f"Error al inicializar lectores: {e}")
             raise
     
-    def extraer_informacion_header(self):
-        """Extrae información del encabezado del archivo"""
-        print("=" * 80)
-        print("INFORMACIÓN DEL ENCABEZADO")
-        print("=" * 80)
-        
-        headers_importantes = {
-            MassLynxHeaderItem.ACQUIRED_NAME: "Nombre de adquisición",
-            MassLynxHeaderItem.ACQUIRED_DATE: "Fecha de adquisición",
-            MassLynxHeaderItem.ACQUIRED_TIME: "Hora de adquisición",
-            MassLynxHeaderItem.SAMPLE_ID: "ID de muestra",
-            MassLynxHeaderItem.INSTRUMENT: "Instrumento",
-            MassLynxHeaderItem.JOB_CODE: "Código de trabajo",
-            MassLynxHeaderItem.USER_NAME: "Usuario",
-            MassLynxHeaderItem.SAMPLE_DESCRIPTION: "Descripción de muestra",
-            MassLynxHeaderItem.BOTTLE_NUMBER: "Número de vial"
-        }
-        
-        info_header = {}
-        for header_item, descripcion in headers_importantes.items():
-            try:
-                params = self.info_reader.GetHeaderItemValue([header_item])
-                valor = params.Get(header_item)
-                info_header[descripcion] = valor
-                print(f"{descripcion}: {valor}")
-            except Exception as e:
-                print(f"{descripcion}: No disponible ({e})")
-        
-        print()
-        return info_header
+    def _avisar(self, mensaje):
+        """Imprime un aviso, salvo en modo silencioso"""
+        if not self.silencioso:
+            print(mensaje)
     
-    def extraer_informacion_funciones(self):
-        """Extrae información de todas las funciones"""
-        print("=" * 80)
-        print("INFORMACIÓN DE FUNCIONES")
-        print("=" * 80)
-        
-        try:
-            num_funciones = self.info_reader.GetNumberofFunctions()
-            print(f"Número total de funciones: {num_funciones}\n")
-            
-            info_funciones = []
-            
-            for func in range(num_funciones):
-                print(f"\n--- FUNCIÓN {func + 1} ---")
-                
-                info_func = {
-                    'numero': func + 1,
-                    'indice': func
-                }
-                
-                # Tipo de función
-                try:
-                    tipo_func = self.info_reader.GetFunctionType(func)
-                    tipo_func_str = self.info_reader.GetFunctionTypeString(tipo_func)
-                    info_func['tipo'] = tipo_func_str
-                    print(f"Tipo de función: {tipo_func_str}")
-                except Exception as e:
-                    print(f"Tipo de función: No disponible ({e})")
-                
-                # Modo de ionización
-                try:
-                    ion_mode = self.info_reader.GetIonMode(func)
-                    ion_mode_str = self.info_reader.GetIonModeString(ion_mode)
-                    info_func['modo_ion'] = ion_mode_str
-                    print(f"Modo de ionización: {ion_mode_str}")
-                except Exception as e:
-                    print(f"Modo de ionización: No disponible ({e})")
-                
-                # Número de scans
-                try:
-                    num_scans = self.info_reader.GetScansInFunction(func)
-                    info_func['num_scans'] = num_scans
-                    print(f"Número de scans: {num_scans}")
-                except Exception as e:
-                    print(f"Número de scans: No disponible ({e})")
-                
-                # Rango de masas
-                try:
-                    low_mass, high_mass = self.info_reader.GetAcquisitionMassRange(func)
-                    info_func['rango_masas'] = (low_mass, high_mass)
-                    print(f"Rango de masas: {low_mass:.2f} - {high_mass:.2f} Da")
-                except Exception as e:
-                    print(f"Rango de masas: No disponible ({e})")
-                
-                # Rango de tiempo
-                try:
-                    start_time, end_time = self.info_reader.GetAcquisitionTimeRange(func)
-                    info_func['rango_tiempo'] = (start_time, end_time)
-                    print(f"Rango de tiempo: {start_time:.2f} - {end_time:.2f} min")
-                except Exception as e:
-                    print(f"Rango de tiempo: No disponible ({e})")
-                
-                # Continuum o centroide
-                try:
-                    is_continuum = self.info_reader.IsContinuum(func)
-                    info_func['continuum'] = is_continuum
-                    print(f"Modo: {'Continuum' if is_continuum else 'Centroide'}")
-                except Exception as e:
-                    print(f"Modo: No disponible ({e})")
-                
-                # Información específica de MRM
-                try:
-                    num_mrm = self.info_reader.GetMRMCount(func)
-                    if num_mrm > 0:
-                        info_func['num_transiciones'] = num_mrm
-                        print(f"\n*** Función MRM con {num_mrm} transiciones ***")
-                        info_func['transiciones'] = self.extraer_transiciones_mrm(func, num_mrm)
-                except Exception as e:
-                    print(f"MRM: No aplicable ({e})")
-                
-                info_funciones.append(info_func)
-            
-            return info_funciones
-            
-        except Exception as e:
-            print(f"Error al extraer información de funciones: {e}")
-            return []
+    def __enter__(self):
+        return self
     
-    def _extraer_masas_mrm_dll(self, funcion, num_transiciones):
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+    
+    def cerrar(self):
+        """Cierra el archivo .raw y libera los lectores"""
+        if self.sesion is not None:
+            self.sesion.Close()
+        if self.cache is not None:
+            self.cache.Close()
+    
+    @property
+    def info_reader(self):
+        """Lector de información (versión extendida para MRM)"""
+        return self.sesion.GetInfoReader()
+    
+    @property
+    def chrom_reader(self):
+        """Lector de cromatogramas, creado en el primer uso"""
+        reader = self.sesion.GetChromatogramReader()
+        # Con numpy los cromatogramas se devuelven como arrays float32 (matriz para MRM)
+        if np is not None and not reader.GetArrayMode():
+            reader.SetArrayMode(True)
+        return reader
+    
+    @property
+    def scan_reader(self):
+        """Lector de scans, creado en el primer uso"""
+        return self.sesion.GetScanReader()
+    
+    def leer_header(self):
         """
-        Extrae las masas Q1>Q3 de cada transición MRM usando la DLL directamente
-        
-        Args:
-            funcion: Índice de la función (0-based)
-            num_transiciones: Número de transiciones MRM
+        Lee el encabezado del archivo sin imprimir nada (desde la caché si el .raw no cambió)
         
         Returns:
-            Lista de tuplas (Q1, Q3) para cada transición
+            (header, errores): header es {descripción: valor}, con None en los items que no se
+            pudieron leer, y errores {descripción: mensaje} de esos items; lanza la excepción
+            del SDK si no se pudo leer el encabezado
         """
-        # Obtener el puntero interno del reader
-        reader_ptr = self.info_reader._provider._getReader()
-        
-        # Obtener la función getAcquisitionMassRange de la DLL
-        getAcquisitionMassRange = MassLynxProvider.MassLynxDll.getAcquisitionMassRange
-        getAcquisitionMassRange.argtypes = [c_void_p, c_int, c_int, POINTER(c_float), POINTER(c_float)]
-        getAcquisitionMassRange.restype = c_int
-        
-        masas = []
-        for mrm_idx in range(num_transiciones):
-            lowMass = c_float(0)
-            highMass = c_float(0)
-            
-            # Llamar a la DLL con whichMRM específico
-            code = getAcquisitionMassRange(reader_ptr, funcion, mrm_idx, lowMass, highMass)
-            
-            if code == 0:  # 0 = éxito
-                q1 = lowMass.value
-                q3 = highMass.value
-                masas.append((q1, q3))
-            else:
-                masas.append((0.0, 0.0))
-        
-        return masas
+        return self._desde_cache("header", self._leer_header)
+    
+    def _leer_header(self):
+        # Todos los items del header en una sola llamada a la DLL; si la rechaza,
+        # GetHeaderSnapshot los lee uno a uno y guarda el error de los que fallan
+        snapshot = self.info_reader.GetHeaderSnapshot()
+        errores_sdk = snapshot.GetErrors()
+        header = {}
+        errores = {}
+        for item, descripcion in ITEMS_HEADER.items():
+            header[descripcion] = snapshot.Get(item, None)
+            if item in errores_sdk:
+                errores[descripcion] = errores_sdk[item]
+        return header, errores
     
-    def _extraer_nombres_mrm_archivo(self, num_transiciones):
+    def extraer_informacion_header(self):
+        """Extrae información del encabezado del archivo (desde la caché si el .raw no cambió)"""
+        header, errores, error = self._leer_header_o_error()
+        imprimir(lineas_encabezado(header, error, errores))
+        if error is not None:
+            return {}
+        return {descripcion: valor for descripcion, valor in header.items() if descripcion not in errores}
+    
+    def _leer_header_o_error(self):
+        try:
+            return self.leer_header() + (None,)
+        except Exception as e:
+            return dict.fromkeys(ITEMS_HEADER.values()), {}, str(e)
+    
+    def leer_funciones(self):
         """
-        Extrae los nombres de las transiciones MRM desde el archivo _FUNC001.CMP
-        
-        Args:
-            num_transiciones: Número de transiciones MRM esperadas
+        Lee la información de todas las funciones sin imprimir nada (desde la caché si el
+        .raw no cambió). Los datos de una función que no se pueden leer quedan en sus errores.
         
         Returns:
-            Lista de nombres de transiciones
+            lista de InfoFuncion; lanza la excepción del SDK si no se pudo leer el número de funciones
         """
-        archivo_cmp = os.path.join(self.ruta_raw, "_FUNC001.CMP")
+        return self._desde_cache("funciones", self._leer_funciones)
+    
+    def _leer_funciones(self):
+        return [self.leer_funcion(func) for func in range(self.info_reader.GetNumberofFunctions())]
+    
+    def leer_funcion(self, func):
+        """Lee la información de una función (índice 0-based), con sus transiciones MRM, como InfoFuncion"""
+        info = InfoFuncion(indice=func)
+        
+        # Cada dato se lee por separado: uno que falla no impide leer el resto
+        lecturas = (
+            ('tipo', lambda: self.info_reader.GetFunctionTypeString(self.info_reader.GetFunctionType(func))),
+            ('modo_ion', lambda: self.info_reader.GetIonModeString(self.info_reader.GetIonMode(func))),
+            ('num_scans', lambda: self.info_reader.GetScansInFunction(func)),
+            ('rango_masas', lambda: tuple(self.info_reader.GetAcquisitionMassRange(func))),
+            ('rango_tiempo', lambda: tuple(self.info_reader.GetAcquisitionTimeRange(func))),
+            ('continuum', lambda: self.info_reader.IsContinuum(func))
+        )
+        for campo, leer in lecturas:
+            try:
+                setattr(info, campo, leer())
+            except Exception as e:
+                info.errores[campo] = str(e)
         
-        if not os.path.exists(archivo_cmp):
-            return [f"MRM_{i+1}" for i in range(num_transiciones)]
+        # Información específica de MRM
+        try:
+            num_mrm = self.info_reader.GetMRMCount(func)
+            if num_mrm > 0:
+                info.num_transiciones = num_mrm
+                info.transiciones = self.leer_transiciones_mrm(func, num_mrm)
+        except Exception as e:
+            info.errores['mrm'] = str(e)
         
+        return info
+    
+    def extraer_informacion_funciones(self):
+        """Extrae información de todas las funciones (desde la caché si el .raw no cambió)"""
+        funciones, error = self._leer_funciones_o_error()
+        imprimir(lineas_funciones(funciones, error))
+        return [info.a_dict() for info in funciones]
+    
+    def _leer_funciones_o_error(self):
         try:
-            with open(archivo_cmp, 'rb') as f:
-                content = f.read()
-            
-            # Buscar strings imprimibles (ASCII) de al menos 4 caracteres
-            strings_ascii = re.findall(b'([ -~]{4,})', content)
-            nombres = [s.decode('ascii').strip() for s in strings_ascii]
-            
-            # Asegurar que tengamos el número correcto
-            if len(nombres) < num_transiciones:
-                nombres.extend([f"MRM_{i+1}" for i in range(len(nombres), num_transiciones)])
-            
-            return nombres[:num_transiciones]
-        except:
-            return [f"MRM_{i+1}" for i in range(num_transiciones)]
+            return self.leer_funciones(), None
+        except Exception as e:
+            return [], str(e)
     
-    def _extraer_energias_mrm_archivo(self, num_transiciones):
+    def _desde_cache(self, nombre, leer):
         """
-        Extrae CE y CV de cada transición MRM desde el archivo _FUNC001.EE
-        
-        Args:
-            num_transiciones: Número de transiciones MRM esperadas
-        
-        Returns:
-            Lista de tuplas (CV, CE) para cada transición
+        Devuelve el resultado de leer() guardado en la caché para la huella del .raw.
+        Si no está, lo lee y lo guarda; los resultados vacíos no se guardan.
         """
-        archivo_ee = os.path.join(self.ruta_raw, "_FUNC001.EE")
+        if self.cache is None:
+            return leer()
         
-        if not os.path.exists(archivo_ee):
-            return [(None, None)] * num_transiciones
+        if self._huella is None:
+            self._huella = MassLynxMetadataCache.Fingerprint(self.ruta_raw)
+        clave = f"analizador/{VERSION_CACHE}/{MassLynxRawBackend.Get()}/{nombre}"
         
-        try:
-            with open(archivo_ee, 'rb') as f:
-                content = f.read()
-            
-            # Los datos de energía están al final del archivo (offset 128)
-            datos_offset = 128
-            datos = content[datos_offset:]
-            
-            # Leer como enteros de 2 bytes (uint16, little-endian)
-            # Formato: CV1, CE1, CV2, CE2, ..., CVn, CEn
-            energias = []
-            for i in range(0, len(datos) - 1, 2):
-                val = struct.unpack('<H', datos[i:i+2])[0]
-                energias.append(val)
-            
-            # Agrupar en pares (CV, CE)
-            pares_energias = []
-            for i in range(0, len(energias), 2):
-                if i+1 < len(energias):
-                    cv = energias[i]
-                    ce = energias[i+1]
-                    pares_energias.append((cv, ce))
-            
-            # Asegurar que tengamos el número correcto
-            if len(pares_energias) < num_transiciones:
-                pares_energias.extend([(None, None)] * (num_transiciones - len(pares_energias)))
-            
-            return pares_energias[:num_transiciones]
-        except:
-            return [(None, None)] * num_transiciones
+        resultado = self.cache.Get(self._huella, clave)
+        if resultado is not None:
+            return resultado
+        
+        resultado = leer()
+        if resultado:
+            self.cache.Put(self._huella, clave, resultado)
+        return resultado
+    
+    @property
+    def tabla_transiciones(self):
+        """
+        Tabla de transiciones MRM de todas las funciones (MassLynxTransitionTable), creada en
+        el primer uso: Q1, Q3, nombre, CV, CE, dwell y ventana de RT en arrays NumPy
+        """
+        return self.sesion.GetTransitionTable()
+    
+    def leer_transiciones_mrm(self, funcion, num_transiciones):
+        """Lee las transiciones MRM de una función (Q1, Q3, nombre, CV, CE, dwell, ventana de RT) como Transicion"""
+        # Filas de la función en la tabla de transiciones (una sola pasada por todas las funciones)
+        filas = self.tabla_transiciones.Filter(function=funcion).ToRecords()[:num_transiciones]
+        
+        # Las masas que la DLL no pudo leer quedan en 0.0, como al leerlas una a una
+        return [
+            Transicion(
+                indice=fila['index'],
+                q1_precursor=0.0 if fila['q1'] is None else fila['q1'],
+                q3_producto=0.0 if fila['q3'] is None else fila['q3'],
+                nombre=fila['name'],
+                voltaje_cono=None if fila['cv'] is None else int(fila['cv']),
+                energia_colision=None if fila['ce'] is None else int(fila['ce']),
+                dwell=fila['dwell'],
+                ventana_rt=(fila['rtStart'], fila['rtEnd'])
+            )
+            for fila in filas
+        ]
     
     def extraer_transiciones_mrm(self, funcion, num_transiciones):
         """Extrae información COMPLETA de transiciones MRM incluyendo Q1, Q3, nombres, CE y CV"""
-        print(f"\nTRANSICIONES MRM (Función {funcion + 1}):")
-        print("-" * 80)
-        
-        # Extraer toda la información
-        masas = self._extraer_masas_mrm_dll(funcion, num_transiciones)
-        nombres = self._extraer_nombres_mrm_archivo(num_transiciones)
-        energias = self._extraer_energias_mrm_archivo(num_transiciones)
-        
-        transiciones = []
+        transiciones = self.leer_transiciones_mrm(funcion, num_transiciones)
+        imprimir(lineas_transiciones(funcion, transiciones))
+        return [t.a_dict() for t in transiciones]
+    
+    def leer_parametros_scan(self, funcion, scan=0):
+        """Lee los parámetros de un scan, dict {descripción: valor} sin los que no están disponibles"""
+        # Pedir todos los parámetros en una sola llamada; si la DLL la rechaza, uno a uno
+        try:
+            params = self.info_reader.GetScanItemValue(funcion, scan, list(ITEMS_SCAN))
+            lecturas = [(item, params) for item in ITEMS_SCAN]
+        except Exception:
+            lecturas = []
+            for item in ITEMS_SCAN:
+                try:
+                    lecturas.append((item, self.info_reader.GetScanItemValue(funcion, scan, [item])))
+                except Exception:
+                    pass  # Algunos parámetros pueden no estar disponibles
         
-        for mrm_idx in range(num_transiciones):
-            q1, q3 = masas[mrm_idx] if mrm_idx < len(masas) else (0.0, 0.0)
-            nombre = nombres[mrm_idx] if mrm_idx < len(nombres) else f"MRM_{mrm_idx+1}"
-            cv, ce = energias[mrm_idx] if mrm_idx < len(energias) else (None, None)
-            
-            trans_info = {
-                'indice': mrm_idx,
-                'numero': mrm_idx + 1,
-                'q1_precursor': q1,
-                'q3_producto': q3,
-                'transicion': f"{q1:.2f} > {q3:.2f}",
-                'nombre': nombre,
-                'voltaje_cono': cv,
-                'energia_colision': ce
-            }
-            
-            transiciones.append(trans_info)
-            
-            # Imprimir info
-            print(f"\nTransición {trans_info['numero']}: {trans_info['transicion']}")
-            print(f"  Nombre: {nombre}")
-            print(f"  Q1 (precursor): {q1:.4f} Da")
-            print(f"  Q3 (producto): {q3:.4f} Da")
-            if cv is not None:
-                print(f"  Voltaje de cono (CV): {cv} V")
-            if ce is not None:
-                print(f"  Energía de colisión (CE): {ce} V")
-        
-        return transiciones
+        return {ITEMS_SCAN[item]: params.Get(item) for item, params in lecturas}
     
     def extraer_parametros_scan(self, funcion, scan=0):
         """Extrae parámetros específicos de un scan"""
-        print(f"\n--- PARÁMETROS DEL SCAN {scan} (Función {funcion + 1}) ---")
-        
-        parametros = {}
-        
-        # Lista de parámetros importantes
-        items_importantes = {
-            MassLynxScanItem.COLLISION_ENERGY: "Energía de colisión (eV)",
-            MassLynxScanItem.SAMPLING_CONE_VOLTAGE: "Voltaje de cono (V)",
-            MassLynxScanItem.SOURCE_TEMPERATURE: "Temperatura de fuente (°C)",
-            MassLynxScanItem.PROBE_TEMPERATURE: "Temperatura de sonda (°C)",
-            MassLynxScanItem.RF_VOLTAGE: "Voltaje RF",
-            MassLynxScanItem.MULTIPLIER1: "Multiplicador 1",
-            MassLynxScanItem.MULTIPLIER2: "Multiplicador 2",
-            MassLynxScanItem.SET_MASS: "Masa configurada",
-            MassLynxScanItem.ION_ENERGY: "Energía de iones",
-            MassLynxScanItem.BASE_PEAK_MASS: "Masa del pico base",
-            MassLynxScanItem.BASE_PEAK_INTENSITY: "Intensidad del pico base",
-            MassLynxScanItem.TOTAL_ION_CURRENT: "Corriente iónica total (TIC)"
-        }
-        
-        for item, descripcion in items_importantes.items():
-            try:
-                params = self.info_reader.GetScanItemValue(funcion, scan, [item])
-                valor = params.Get(item)
-                parametros[descripcion] = valor
-                print(f"{descripcion}: {valor}")
-            except Exception as e:
-                pass  # Algunos parámetros pueden no estar disponibles
-        
+        parametros = self.leer_parametros_scan(funcion, scan)
+        imprimir(lineas_parametros(funcion, scan, parametros))
         return parametros
     
-    def extraer_cromatogramas(self, funcion):
-        """Extrae cromatogramas TIC, BPI y MRM de una función"""
-        print(f"\n--- CROMATOGRAMAS (Función {funcion + 1}) ---")
+    def leer_cromatogramas(self, funcion):
+        """
+        Lee los cromatogramas TIC, BPI y MRM de una función como CromatogramasFuncion (sin parámetros)
         
-        cromatogramas = {}
+        Los datos se guardan en float32 y los tiempos iguales a los del primer cromatograma
+        comparten su array, para ocupar poco en memoria con muchos archivos.
+        """
+        croms = CromatogramasFuncion(indice=funcion)
         
-        # Extraer TIC (Total Ion Chromatogram)
+        # TIC (Total Ion Chromatogram) y BPI (Base Peak Intensity)
         try:
-            tiempos_tic, intensidades_tic = self.chrom_reader.ReadTIC(funcion)
-            cromatogramas['TIC'] = {
-                'tiempos': tiempos_tic,
-                'intensidades': intensidades_tic,
-                'puntos': len(tiempos_tic)
-            }
-            print(f"TIC extraído: {len(tiempos_tic)} puntos")
-            print(f"  Tiempo: {tiempos_tic[0]:.2f} - {tiempos_tic[-1]:.2f} min")
-            print(f"  Intensidad máxima: {max(intensidades_tic):.2e}")
+            tiempos, intensidades = self.chrom_reader.ReadTIC(funcion)
+            croms.tic = Cromatograma(croms.compartir_tiempos(tiempos), a_float32(intensidades))
         except Exception as e:
-            print(f"No se pudo extraer TIC: {e}")
-        
-        # Extraer BPI (Base Peak Intensity)
+            croms.errores['TIC'] = str(e)
         try:
-            tiempos_bpi, intensidades_bpi = self.chrom_reader.ReadBPI(funcion)
-            cromatogramas['BPI'] = {
-                'tiempos': tiempos_bpi,
-                'intensidades': intensidades_bpi,
-                'puntos': len(tiempos_bpi)
-            }
-            print(f"BPI extraído: {len(tiempos_bpi)} puntos")
-            print(f"  Intensidad máxima: {max(intensidades_bpi):.2e}")
+            tiempos, intensidades = self.chrom_reader.ReadBPI(funcion)
+            croms.bpi = Cromatograma(croms.compartir_tiempos(tiempos), a_float32(intensidades))
         except Exception as e:
-            print(f"No se pudo extraer BPI: {e}")
+            croms.errores['BPI'] = str(e)
         
-        # Extraer MRM cromatogramas si es una función MRM
+        # Cromatogramas MRM si es una función MRM
         try:
             num_mrm = self.info_reader.GetMRMCount(funcion)
             if num_mrm > 0:
-                print(f"\nExtrayendo {num_mrm} cromatogramas MRM...")
-                cromatogramas['MRM'] = []
+                croms.num_mrm = num_mrm
                 
-                for mrm_idx in range(num_mrm):
-                    try:
-                        tiempos_mrm, intensidades_mrm = self.chrom_reader.ReadMRMChromatogram(funcion, mrm_idx)
-                        cromatogramas['MRM'].append({
-                            'transicion': mrm_idx + 1,
-                            'tiempos': tiempos_mrm,
-                            'intensidades': intensidades_mrm,
-                            'puntos': len(tiempos_mrm),
-                            'intensidad_maxima': max(intensidades_mrm) if len(intensidades_mrm) > 0 else 0
-                        })
-                        print(f"  Transición {mrm_idx + 1}: {len(tiempos_mrm)} puntos, Imax = {max(intensidades_mrm):.2e}")
-                    except Exception as e:
-                        print(f"  Error en transición {mrm_idx + 1}: {e}")
+                # Una sola lectura para todas las transiciones (por bloques si el panel es muy grande):
+                # un vector de tiempos compartido y una fila de intensidades por transición
+                tiempos_mrm, matriz_mrm = self.chrom_reader.ReadMRMChromatograms(funcion, list(range(num_mrm)))
+                tiempos_mrm = croms.compartir_tiempos(tiempos_mrm)
+                matriz_mrm = matriz_float32(matriz_mrm)
+                
+                if len(tiempos_mrm) == 0:
+                    maximos = [0.0] * num_mrm
+                elif np is not None and isinstance(matriz_mrm, np.ndarray):
+                    maximos = matriz_mrm.max(axis=1).tolist()
+                else:
+                    maximos = [float(max(fila)) for fila in matriz_mrm]
+                
+                croms.mrm_tiempos = tiempos_mrm
+                croms.mrm_matriz = matriz_mrm
+                croms.mrm_maximos = maximos
         except Exception as e:
-            print(f"No se pudieron extraer cromatogramas MRM: {e}")
+            croms.errores['MRM'] = str(e)
         
-        return cromatogramas
+        return croms
     
-    def extraer_espectro(self, funcion, scan):
-        """Extrae un espectro de masas de un scan específico"""
-        print(f"\n--- ESPECTRO DE MASAS (Función {funcion + 1}, Scan {scan}) ---")
-        
+    def extraer_cromatogramas(self, funcion):
+        """Extrae cromatogramas TIC, BPI y MRM de una función"""
+        croms = self.leer_cromatogramas(funcion)
+        imprimir(lineas_cromatogramas(croms))
+        return croms.cromatogramas_dict()
+    
+    def leer_espectro(self, funcion, scan):
+        """Lee el espectro de masas de un scan como Espectro (con error si no se pudo leer)"""
         try:
             masas, intensidades = self.scan_reader.ReadScan(funcion, scan)
-            
-            espectro = {
-                'masas': masas,
-                'intensidades': intensidades,
-                'num_picos': len(masas)
-            }
-            
-            print(f"Espectro extraído: {len(masas)} picos")
-            if len(masas) > 0:
-                print(f"  Rango de masas: {min(masas):.2f} - {max(masas):.2f} Da")
-                print(f"  Intensidad máxima: {max(intensidades):.2e}")
-                
-                # Mostrar los 5 picos más intensos
-                picos_ordenados = sorted(zip(masas, intensidades), key=lambda x: x[1], reverse=True)
-                print(f"\n  Top 5 picos más intensos:")
-                for i, (masa, intensidad) in enumerate(picos_ordenados[:5]):
-                    print(f"    {i+1}. m/z {masa:.4f}: {intensidad:.2e}")
-            
-            return espectro
+            return Espectro(funcion, scan, masas, intensidades)
         except Exception as e:
-            print(f"Error al extraer espectro: {e}")
-            return None
+            return Espectro(funcion, scan, error=str(e))
     
-    def analisis_completo(self, extraer_espectros=False):
-        """Realiza un análisis completo del archivo .raw"""
-        print("\n")
-        print("╔" + "═" * 78 + "╗")
-        print("║" + " " * 20 + "ANÁLISIS COMPLETO DE ARCHIVO RAW" + " " * 26 + "║")
-        print("║" + " " * 78 + "║")
-        print("║  " + f"Archivo: {os.path.basename(self.ruta_raw)}".ljust(76) + "║")
-        print("╚" + "═" * 78 + "╝")
-        print("\n")
-        
-        resultados = {}
-        
-        # 1. Información del header
-        resultados['header'] = self.extraer_informacion_header()
-        
-        # 2. Información de funciones
-        resultados['funciones'] = self.extraer_informacion_funciones()
-        
-        # 3. Para cada función, extraer cromatogramas
-        print("\n" + "=" * 80)
-        print("EXTRACCIÓN DE CROMATOGRAMAS")
-        print("=" * 80)
-        
-        resultados['cromatogramas'] = []
-        for func_info in resultados['funciones']:
-            func_idx = func_info['indice']
-            
-            # Extraer parámetros del scan
-            parametros = self.extraer_parametros_scan(func_idx, 0)
-            
-            # Extraer cromatogramas
-            croms = self.extraer_cromatogramas(func_idx)
-            resultados['cromatogramas'].append({
-                'funcion': func_idx + 1,
-                'parametros': parametros,
-                'cromatogramas': croms
-            })
-            
-            # Opcionalmente extraer espectros
-            if extraer_espectros and func_info.get('num_scans', 0) > 0:
-                # Extraer un espectro de ejemplo (scan del medio)
-                scan_medio = func_info['num_scans'] // 2
-                espectro = self.extraer_espectro(func_idx, scan_medio)
+    def extraer_espectro(self, funcion, scan):
+        """Extrae un espectro de masas de un scan específico"""
+        espectro = self.leer_espectro(funcion, scan)
+        imprimir(lineas_espectro(espectro))
+        return espectro.a_dict()
+    
+    def iterar_scans(self, funcion, inicio=0, fin=-1, prefetch=8):
+        """
+        Recorre los scans de una función sin cargarlos todos en memoria
+        
+        Un hilo en segundo plano lee por adelantado hasta `prefetch` scans mientras
+        se procesa el actual.
         
-        print("\n" + "=" * 80)
-        print("ANÁLISIS COMPLETADO")
-        print("=" * 80)
+        Args:
+            funcion: Índice de la función (0-based)
+            inicio: primer scan
+            fin: último scan (inclusive), -1 para el último de la función
+            prefetch: número máximo de scans leídos por adelantado
+        
+        Returns:
+            iterador de tuplas (scan, tiempo_retencion, masas, intensidades)
+        """
+        return self.scan_reader.IterScans(funcion, inicio, fin, prefetch)
+    
+    def analizar(self, extraer_espectros=False):
+        """
+        Análisis completo del archivo .raw sin imprimir nada
         
-        return resultados
+        Lee lo mismo que analisis_completo pero devuelve objetos tipados y no formatea
+        texto; para mostrarlo, renderizar_resultados.imprimir_resultado o texto_analisis.
+        
+        Args:
+            extraer_espectros: leer también el espectro del scan del medio de cada función
+        
+        Returns:
+            ResultadoAnalisis
+        """
+        return self.analizar_perezoso(extraer_espectros).prefetch().a_resultado()
+    
+    def analizar_perezoso(self, extraer_espectros=False):
+        """
+        Análisis que lee cada parte (header, funciones, parámetros, cromatogramas) la
+        primera vez que se usa; el analizador tiene que seguir abierto mientras se use
+        
+        Args:
+            extraer_espectros: leer también el espectro del scan del medio de cada función
+                               junto con sus cromatogramas
+        
+        Returns:
+            ResultadoPerezoso
+        """
+        return ResultadoPerezoso(self, extraer_espectros)
+    
+    def analisis_completo(self, extraer_espectros=False):
+        """Realiza un análisis completo del archivo .raw, imprime el resultado y lo devuelve como dict"""
+        resultado = self.analizar(extraer_espectros)
+        imprimir_resultado(resultado)
+        return resultado.a_dict()
     
     def exportar_cromatogramas_csv(self, resultados, carpeta_salida):
-        """Exporta los cromatogramas a archivos CSV"""
-        import csv
+        """
+        Exporta los cromatogramas a CSV: una tabla ancha por función (Funcion_<n>.csv) con
+        el tiempo y una columna por cromatograma (TIC, BPI y cada transición MRM)
+        
+        Si algún cromatograma de la función tiene otro eje de tiempos, va a una tabla aparte
+        por eje (Funcion_<n>_eje2.csv, Funcion_<n>_eje3.csv...).
         
+        Args:
+            resultados: resultado de analisis_completo, analizar o analizar_perezoso
+            carpeta_salida: carpeta de los CSV
+        
+        Returns:
+            lista de rutas escritas
+        """
         os.makedirs(carpeta_salida, exist_ok=True)
         
+        archivos = []
+        for numero, series in self._series_cromatogramas(resultados):
+            for grupo, (tiempos, encabezados, columnas) in enumerate(agrupar_por_tiempos(series)):
+                # sufijo fijo: los encabezados MRM llevan '>' y nombres de compuestos
+                nombre = f"Funcion_{numero}.csv" if grupo == 0 else f"Funcion_{numero}_eje{grupo + 1}.csv"
+                archivo = os.path.join(carpeta_salida, nombre)
+                escribir_tabla(archivo, ['Tiempo (min)'] + encabezados, [tiempos] + columnas)
+                archivos.append(archivo)
+                self._avisar(f"Exportado: {archivo}")
+        return archivos
+    
+    @staticmethod
+    def _series_cromatogramas(resultados):
+        """(número de función, series (encabezados, tiempos, datos)) de cada función con cromatogramas"""
+        if isinstance(resultados, (ResultadoAnalisis, ResultadoPerezoso)):
+            funciones = {info.indice: info for info in resultados.funciones}
+            for croms in resultados.cromatogramas:
+                series = [([nombre], crom.tiempos, crom.intensidades)
+                          for nombre, crom in (('TIC', croms.tic), ('BPI', croms.bpi)) if crom is not None]
+                if croms.mrm_tiempos is not None and len(croms.mrm_maximos) > 0:
+                    transiciones = funciones[croms.indice].transiciones if croms.indice in funciones else []
+                    nombres = [f"{t.nombre} {t.transicion}" for t in transiciones[:croms.num_mrm]]
+                    nombres += [f"MRM_{i + 1}" for i in range(len(nombres), croms.num_mrm)]
+                    series.append((nombres, croms.mrm_tiempos, croms.mrm_matriz))
+                yield croms.numero, series
+            return
+        
+        # diccionarios de analisis_completo
+        funciones = {info['numero']: info for info in resultados['funciones']}
         for func_data in resultados['cromatogramas']:
-            func_num = func_data['funcion']
             croms = func_data['cromatogramas']
+            series = [([nombre], croms[nombre]['tiempos'], croms[nombre]['intensidades'])
+                      for nombre in ('TIC', 'BPI') if nombre in croms]
+            if croms.get('MRM'):
+                transiciones = funciones.get(func_data['funcion'], {}).get('transiciones', [])
+                nombres = [f"{t['nombre']} {t['transicion']}" for t in transiciones[:len(croms['MRM'])]]
+                nombres += [f"MRM_{m['transicion']}" for m in croms['MRM'][len(nombres):]]
+                series.append((nombres, croms['MRM_tiempos'], croms['MRM_matriz']))
+            yield func_data['funcion'], series
+
+class ResultadoPerezoso:
+    """
+    Resultado de un análisis que se lee del archivo a medida que se usa
+    
+    Cada parte se lee la primera vez que se pide y se guarda: el header, la información
+    de cada función (con sus transiciones), los parámetros del primer scan, los
+    cromatogramas de cada función y los cromatogramas de transiciones sueltas. Quien sólo
+    necesita un compuesto paga sólo por ese compuesto; prefetch() lee por adelantado una
+    selección para trabajos por lotes.
+    
+    Tiene la misma interfaz que ResultadoAnalisis (header, funciones, cromatogramas,
+    errores, transiciones, a_dict), así que se renderiza y exporta igual; usar
+    cromatogramas lee los de todas las funciones. No es seguro entre hilos.
+    """
+    
+    def __init__(self, analizador, extraer_espectros=False):
+        self.analizador = analizador
+        self.ruta_raw = analizador.ruta_raw
+        self.extraer_espectros = extraer_espectros
+        self.errores = {}
+        self._header = None
+        self.errores_header = {}
+        self._num_funciones = None
+        self._funciones = None
+        self._info = {}
+        self._parametros = {}
+        self._croms = {}
+        self._mrm = {}
+    
+    @property
+    def header(self):
+        """
+        dict {descripción: valor}; si no se pudo leer, errores['header'] tiene el mensaje y
+        los items que no se pudieron leer tienen el suyo en errores_header
+        """
+        if self._header is None:
+            self._header, self.errores_header, error = self.analizador._leer_header_o_error()
+            if error is not None:
+                self.errores['header'] = error
+        return self._header
+    
+    @property
+    def num_funciones(self):
+        """Número de funciones (0 si no se pudo leer, con el mensaje en errores['funciones'])"""
+        if self._num_funciones is None:
+            if self._funciones is not None:
+                self._num_funciones = len(self._funciones)
+            else:
+                try:
+                    self._num_funciones = self.analizador.info_reader.GetNumberofFunctions()
+                except Exception as e:
+                    self.errores['funciones'] = str(e)
+                    self._num_funciones = 0
+        return self._num_funciones
+    
+    @property
+    def funciones(self):
+        """Lista de InfoFuncion de todas las funciones (desde la caché de metadatos si está)"""
+        if self._funciones is None:
+            self._funciones, error = self.analizador._leer_funciones_o_error()
+            if error is not None:
+                self.errores['funciones'] = error
+            # las que ya se habían leído sueltas se conservan
+            self._funciones = [self._info.setdefault(info.indice, info) for info in self._funciones]
+            self._num_funciones = len(self._funciones)
+        return self._funciones
+    
+    def funcion(self, indice):
+        """InfoFuncion de una función (índice 0-based)"""
+        if indice not in self._info:
+            if not 0 <= indice < self.num_funciones:
+                raise IndexError(f"La función {indice} no existe ({self.num_funciones} funciones)")
+            self._info[indice] = self.analizador.leer_funcion(indice)
+        return self._info[indice]
+    
+    @property
+    def transiciones(self):
+        """Todas las transiciones MRM, en el orden de las funciones"""
+        return [t for info in self.funciones for t in info.transiciones]
+    
+    def buscar(self, nombre):
+        """
+        Transiciones de un compuesto, sin leer las funciones que no lo tienen
+        
+        Returns:
+            lista de (índice de función, Transicion)
+        """
+        filas = self.analizador.tabla_transiciones.Find(nombre)
+        return [(funcion, self.funcion(funcion).transiciones[indice])
+                for funcion, indice in zip(filas['function'].tolist(), filas['index'].tolist())]
+    
+    def parametros_funcion(self, indice, scan=0):
+        """Parámetros de un scan de una función, dict {descripción: valor}"""
+        if (indice, scan) not in self._parametros:
+            self._parametros[(indice, scan)] = self.analizador.leer_parametros_scan(indice, scan)
+        return self._parametros[(indice, scan)]
+    
+    def cromatogramas_funcion(self, indice):
+        """CromatogramasFuncion de una función: TIC, BPI, MRM, parámetros del scan 0 y espectro"""
+        if indice not in self._croms:
+            croms = self.analizador.leer_cromatogramas(indice)
+            croms.parametros = self.parametros_funcion(indice, croms.scan_parametros)
             
-            # Exportar TIC
-            if 'TIC' in croms:
-                archivo_tic = os.path.join(carpeta_salida, f"TIC_Funcion_{func_num}.csv")
-                with open(archivo_tic, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Tiempo (min)', 'Intensidad'])
-                    for t, i in zip(croms['TIC']['tiempos'], croms['TIC']['intensidades']):
-                        writer.writerow([t, i])
-                print(f"Exportado: {archivo_tic}")
-            
-            # Exportar BPI
-            if 'BPI' in croms:
-                archivo_bpi = os.path.join(carpeta_salida, f"BPI_Funcion_{func_num}.csv")
-                with open(archivo_bpi, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Tiempo (min)', 'Intensidad'])
-                    for t, i in zip(croms['BPI']['tiempos'], croms['BPI']['intensidades']):
-                        writer.writerow([t, i])
-                print(f"Exportado: {archivo_bpi}")
+            # Opcionalmente un espectro de ejemplo (scan del medio)
+            num_scans = self.funcion(indice).num_scans or 0
+            if self.extraer_espectros and num_scans > 0:
+                croms.espectro = self.analizador.leer_espectro(indice, num_scans // 2)
             
-            # Exportar MRM
-            if 'MRM' in croms:
-                for mrm_data in croms['MRM']:
-                    trans_num = mrm_data['transicion']
-                    archivo_mrm = os.path.join(carpeta_salida, f"MRM_Funcion_{func_num}_Transicion_{trans_num}.csv")
-                    with open(archivo_mrm, 'w', newline='') as f:
-                        writer = csv.writer(f)
-                        writer.writerow(['Tiempo (min)', 'Intensidad'])
-                        for t, i in zip(mrm_data['tiempos'], mrm_data['intensidades']):
-                            writer.writerow([t, i])
-                    print(f"Exportado: {archivo_mrm}")
+            self._croms[indice] = croms
+        return self._croms[indice]
+    
+    @property
+    def cromatogramas(self):
+        """Lista de CromatogramasFuncion de todas las funciones"""
+        return [self.cromatogramas_funcion(info.indice) for info in self.funciones]
+    
+    def cromatograma_mrm(self, funcion, transicion):
+        """
+        Cromatograma de una transición MRM (índices 0-based); si los de la función ya se
+        leyeron se toma de ahí, si no se lee sólo esa transición
+        
+        Returns:
+            Cromatograma
+        """
+        croms = self._croms.get(funcion)
+        if croms is not None and croms.mrm_matriz is not None:
+            return Cromatograma(croms.mrm_tiempos, croms.mrm_matriz[transicion])
+        if (funcion, transicion) not in self._mrm:
+            self._leer_mrm(funcion, [transicion])
+        return self._mrm[(funcion, transicion)]
+    
+    def prefetch(self, seleccion=None):
+        """
+        Lee por adelantado una selección
+        
+        Args:
+            seleccion: None para todo; si no, una lista de índices de función (información,
+                       parámetros y cromatogramas de la función) y/o de tuplas
+                       (función, transición) (sólo esos cromatogramas MRM, una lectura
+                       por función)
+        
+        Returns:
+            este ResultadoPerezoso
+        """
+        if seleccion is None:
+            seleccion = [info.indice for info in self.funciones]
+        
+        transiciones = {}
+        for elemento in seleccion:
+            if isinstance(elemento, tuple):
+                funcion, transicion = elemento
+                if funcion not in self._croms and (funcion, transicion) not in self._mrm:
+                    transiciones.setdefault(funcion, []).append(transicion)
+            else:
+                self.funcion(elemento)
+                self.cromatogramas_funcion(elemento)
+        
+        for funcion, lista in transiciones.items():
+            self._leer_mrm(funcion, sorted(set(lista)))
+        return self
+    
+    def a_resultado(self):
+        """ResultadoAnalisis con todo el análisis (lee lo que falte)"""
+        header = self.header
+        funciones = self.funciones
+        cromatogramas = self.cromatogramas
+        return ResultadoAnalisis(ruta_raw=self.ruta_raw, header=header, funciones=funciones,
+                                 cromatogramas=cromatogramas, errores=dict(self.errores),
+                                 errores_header=dict(self.errores_header))
+    
+    def a_dict(self):
+        """Diccionario de analisis_completo (lee lo que falte)"""
+        return self.a_resultado().a_dict()
+    
+    def _leer_mrm(self, funcion, transiciones):
+        tiempos, matriz = self.analizador.chrom_reader.ReadMRMChromatograms(funcion, transiciones)
+        tiempos = a_float32(tiempos)
+        matriz = matriz_float32(matriz)
+        for fila, transicion in enumerate(transiciones):
+            self._mrm[(funcion, transicion)] = Cromatograma(tiempos, matriz[fila])
 
 
 def main():
     """Función principal para ejecutar el análisis"""
     
-    # Ruta al archivo .raw de ejemplo
-    ruta_raw = r"c:\Damico\Laboratorio\Software\Prueba\20251002_20250825 QC3.raw"
+    # Ruta al archivo .raw: primer argumento, o el archivo de ejemplo
+    # (p. ej. "synthetic:scans=600,mrm=40" para probar sin DLL ni archivos reales)
+    ruta_raw = sys.argv[1] if len(sys.argv) > 1 else r"c:\Damico\Laboratorio\Software\Prueba\20251002_20250825 QC3.raw"
     
     # Verificar que existe
-    if not os.path.exists(ruta_raw):
+    if not MassLynxRawBackend.IsSyntheticPath(ruta_raw) and not os.path.exists(ruta_raw):
         print(f"ERROR: No se encuentra el archivo {ruta_raw}")
         return
     
@@ -589,7 +738,7 @@ def main():
         resultados = analizador.analisis_completo(extraer_espectros=True)
         
         # Exportar cromatogramas a CSV
-        carpeta_salida = r"c:\Damico\Laboratorio\Software\Prueba\resultados_analisis"
+        carpeta_salida = sys.argv[2] if len(sys.argv) > 2 else r"c:\Damico\Laboratorio\Software\Prueba\resultados_analisis"
         print(f"\n\nExportando cromatogramas a: {carpeta_salida}")
         analizador.exportar_cromatogramas_csv(resultados, carpeta_salida)
         
@@ -0,0 +1,87 @@
+"""
+Benchmark: latencia de apertura de archivos .raw de MassLynx
+
+Compara, para cada archivo:
+  - antes:   abrir info, cromatogramas y scans por separado desde la ruta
+             (como hacía AnalizadorRawMassLynx)
+  - sesión:  abrir una MassLynxRawSession y derivar los mismos tres lectores
+             del handle compartido (createRawReaderFromReader)
+  - sólo info: abrir la sesión sin derivar lectores (coste mínimo por archivo)
+
+Uso:
+    python benchmarks/bench_apertura.py archivo1.raw [archivo2.raw ...] [--repeticiones R]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Agregar el path del SDK de MassLynx (relativo al repositorio)
+dir_repo = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.join(dir_repo, "MassLynxSDKDownload_v5.0.0", "python_wheel", "extracted"))
+sys.path.insert(0, dir_repo)
+
+from masslynxsdk import (
+    MassLynxRawInfoReaderEx,
+    MassLynxRawChromatogramReader,
+    MassLynxRawScanReader,
+    MassLynxRawSession
+)
+from ejemplos_uso_sdk import LICENCIA
+
+
+def abrir_por_separado(ruta_raw):
+    info = MassLynxRawInfoReaderEx(ruta_raw, LICENCIA)
+    chrom = MassLynxRawChromatogramReader(ruta_raw, LICENCIA)
+    scan = MassLynxRawScanReader(ruta_raw, LICENCIA)
+    for lector in (scan, chrom, info):
+        lector._provider.destroyRawReader()
+
+
+def abrir_sesion(ruta_raw):
+    with MassLynxRawSession(ruta_raw, LICENCIA) as sesion:
+        sesion.GetInfoReader()
+        sesion.GetChromatogramReader()
+        sesion.GetScanReader()
+
+
+def abrir_solo_info(ruta_raw):
+    with MassLynxRawSession(ruta_raw, LICENCIA) as sesion:
+        sesion.GetInfoReader()
+
+
+def medir(funcion, ruta_raw, repeticiones):
+    """Devuelve el mejor tiempo y la mediana en milisegundos"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(ruta_raw)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return tiempos[0], tiempos[len(tiempos) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("archivos", nargs="+", help="Archivos .raw (carpetas)")
+    parser.add_argument("--repeticiones", type=int, default=10)
+    args = parser.parse_args()
+
+    casos = [
+        ("antes (3 aperturas)", abrir_por_separado),
+        ("sesión (1 apertura)", abrir_sesion),
+        ("sólo info", abrir_solo_info),
+    ]
+
+    print(f"{args.repeticiones} repeticiones por archivo (mejor / mediana, ms)\n")
+    for ruta_raw in args.archivos:
+        print(os.path.basename(os.path.normpath(ruta_raw)))
+        for nombre, funcion in casos:
+            mejor, mediana = medir(funcion, ruta_raw, args.repeticiones)
+            print(f"  {nombre:<22} {mejor:>9.2f} {mediana:>9.2f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: backend DLL frente a backend mmap (lectura en Python)
+
+Para cada archivo lee con los dos backends el TIC, los cromatogramas MRM
+(o BPI si la función no es MRM) y una muestra de scans, compara los
+resultados y muestra el tiempo de cada uno. Sirve también para validar la
+decodificación de los _FUNCnnn.DAT del backend mmap con archivos del
+laboratorio antes de usarlo en producción.
+
+Uso:
+    python benchmarks/bench_backends.py archivo1.raw [archivo2.raw ...] [--scans N] [--tolerancia T]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Agregar el path del SDK de MassLynx (relativo al repositorio)
+dir_repo = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.join(dir_repo, "MassLynxSDKDownload_v5.0.0", "python_wheel", "extracted"))
+sys.path.insert(0, dir_repo)
+
+from masslynxsdk import MassLynxRawBackend, MassLynxRawSession
+from ejemplos_uso_sdk import LICENCIA
+
+
+def leer(ruta_raw, backend, num_scans):
+    """Lee TIC, MRM/BPI y scans de todas las funciones; devuelve (datos, segundos)"""
+    MassLynxRawBackend.Set(backend, experimental=True)
+    inicio = time.perf_counter()
+    datos = {}
+    with MassLynxRawSession(ruta_raw, LICENCIA, arrayMode=True) as sesion:
+        info = sesion.GetInfoReader()
+        chrom = sesion.GetChromatogramReader()
+        scans = sesion.GetScanReader()
+        for funcion in range(info.GetNumberofFunctions()):
+            datos[(funcion, 'TIC')] = chrom.ReadTIC(funcion)
+            num_mrm = info.GetMRMCount(funcion)
+            if num_mrm > 0:
+                datos[(funcion, 'MRM')] = chrom.ReadMRMChromatograms(funcion, list(range(num_mrm)))
+            else:
+                datos[(funcion, 'BPI')] = chrom.ReadBPI(funcion)
+            total = info.GetScansInFunction(funcion)
+            for scan in np.linspace(0, total - 1, min(num_scans, total), dtype=int):
+                datos[(funcion, f'scan {scan}')] = scans.ReadScan(funcion, int(scan))
+    return datos, time.perf_counter() - inicio
+
+
+def comparar(dll, mmap, tolerancia):
+    """Devuelve la lista de diferencias entre los dos backends"""
+    diferencias = []
+    for clave in dll:
+        if clave not in mmap:
+            diferencias.append(f"{clave}: falta en mmap")
+            continue
+        for a, b in zip(dll[clave], mmap[clave]):
+            a, b = np.asarray(a), np.asarray(b)
+            if a.shape != b.shape:
+                diferencias.append(f"{clave}: forma {a.shape} != {b.shape}")
+            elif not np.allclose(a, b, rtol=tolerancia, atol=tolerancia):
+                diferencias.append(f"{clave}: diferencia máxima {np.max(np.abs(a - b)):.4g}")
+    return diferencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("archivos", nargs="+", help="Archivos .raw (carpetas)")
+    parser.add_argument("--scans", type=int, default=20, help="Scans comparados por función")
+    parser.add_argument("--tolerancia", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    for ruta_raw in args.archivos:
+        print(os.path.basename(os.path.normpath(ruta_raw)))
+        dll, t_dll = leer(ruta_raw, MassLynxRawBackend.DLL, args.scans)
+        mmap, t_mmap = leer(ruta_raw, MassLynxRawBackend.MMAP, args.scans)
+        print(f"  dll   {t_dll * 1000:>9.1f} ms")
+        print(f"  mmap  {t_mmap * 1000:>9.1f} ms")
+        diferencias = comparar(dll, mmap, args.tolerancia)
+        if diferencias:
+            print(f"  {len(diferencias)} diferencias:")
+            for diferencia in diferencias[:20]:
+                print(f"    {diferencia}")
+        else:
+            print(f"  resultados idénticos ({len(dll)} lecturas)")
+        print()
+
+
+if __name__ == "__main__":
+    main()
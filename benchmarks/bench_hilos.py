@@ -0,0 +1,65 @@
+"""
+Benchmark: escalado de la extracción TIC/MRM con varios hilos
+
+Extrae el TIC y todos los cromatogramas MRM de cada archivo con un
+ThreadPoolExecutor de 1 a N hilos (una sesión por tarea) y muestra el
+tiempo total, archivos por segundo y la aceleración respecto a 1 hilo.
+
+Uso:
+    python benchmarks/bench_hilos.py archivo1.raw [archivo2.raw ...] [--hilos N] [--repeticiones R]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Agregar el path del SDK de MassLynx (relativo al repositorio)
+dir_repo = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.join(dir_repo, "MassLynxSDKDownload_v5.0.0", "python_wheel", "extracted"))
+sys.path.insert(0, dir_repo)
+
+from ejemplos_uso_sdk import extraer_en_paralelo
+
+
+def medir(rutas, hilos, repeticiones):
+    """Devuelve el mejor tiempo en segundos y el número de archivos con error"""
+    mejor = None
+    errores = 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultados = extraer_en_paralelo(rutas, hilos)
+        transcurrido = time.perf_counter() - inicio
+        errores = sum(1 for r in resultados.values() if isinstance(r, Exception))
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor, errores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("archivos", nargs="+", help="Archivos .raw (carpetas)")
+    parser.add_argument("--hilos", type=int, default=os.cpu_count() or 4,
+                        help="Número máximo de hilos")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{len(args.archivos)} archivos, mejor de {args.repeticiones} repeticiones\n")
+    print(f"  {'hilos':>5} {'segundos':>10} {'archivos/s':>11} {'aceleración':>12}")
+
+    # 1, 2, 4, ... hasta N (N siempre incluido)
+    niveles = [2 ** i for i in range(args.hilos.bit_length()) if 2 ** i < args.hilos] + [args.hilos]
+
+    base = None
+    for hilos in niveles:
+        segundos, errores = medir(args.archivos, hilos, args.repeticiones)
+        if base is None:
+            base = segundos
+        linea = f"  {hilos:>5} {segundos:>10.3f} {len(args.archivos) / segundos:>11.1f} {base / segundos:>11.2f}x"
+        if errores:
+            linea += f"  ({errores} con error)"
+        print(linea)
+
+
+if __name__ == "__main__":
+    main()
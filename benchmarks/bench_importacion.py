@@ -0,0 +1,87 @@
+"""
+Benchmark: tiempo de importación del SDK de MassLynx
+
+Cada caso se mide en un intérprete nuevo (sin módulos en caché), desde antes
+del primer import hasta que el caso termina:
+  - import masslynxsdk:  sólo el paquete, los módulos se importan al usarlos
+  - un lector:           from masslynxsdk import MassLynxRawInfoReader
+  - todo + DLL:          todos los nombres del paquete y la carga de la DLL,
+                         lo que costaba cualquier import antes de la carga diferida
+  - analizador:          import analizar_raw_masslynx (lo que paga procesar_lote)
+  - analizador + DLL:    lo anterior más la primera llamada nativa
+
+Uso:
+    python benchmarks/bench_importacion.py [--repeticiones R]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Agregar el path del SDK de MassLynx (relativo al repositorio)
+dir_repo = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+dir_sdk = os.path.join(dir_repo, "MassLynxSDKDownload_v5.0.0", "python_wheel", "extracted")
+
+CASOS = [
+    ("import masslynxsdk", "import masslynxsdk"),
+    ("un lector", "from masslynxsdk import MassLynxRawInfoReader"),
+    ("todo + DLL", "import masslynxsdk\n"
+                   "for nombre in masslynxsdk.__all__: getattr(masslynxsdk, nombre)\n"
+                   "from masslynxsdk.Providers.MassLynxProvider import MassLynxProvider\n"
+                   "MassLynxProvider.Load()"),
+    ("analizador", "import analizar_raw_masslynx"),
+    ("analizador + DLL", "import analizar_raw_masslynx\n"
+                         "from masslynxsdk.Providers.MassLynxProvider import MassLynxProvider\n"
+                         "MassLynxProvider.Load()"),
+]
+
+# el intérprete hijo imprime los ms que tardó el caso
+PLANTILLA = """\
+import sys, time
+sys.path[:0] = [{sdk!r}, {repo!r}]
+inicio = time.perf_counter()
+{codigo}
+print((time.perf_counter() - inicio) * 1000)
+"""
+
+
+def medir(codigo, repeticiones):
+    """Devuelve (mejor, mediana, módulos cargados) en ms sobre intérpretes nuevos"""
+    programa = PLANTILLA.format(sdk=dir_sdk, repo=dir_repo, codigo=codigo)
+    programa += "print(len(sys.modules))\n"
+    tiempos = []
+    modulos = 0
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", programa], capture_output=True,
+                                text=True, check=True, cwd=dir_repo).stdout.split()
+        tiempos.append(float(salida[0]))
+        modulos = int(salida[1])
+    tiempos.sort()
+    return tiempos[0], tiempos[len(tiempos) // 2], modulos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=15)
+    args = parser.parse_args()
+
+    resultados = []
+    for nombre, codigo in CASOS:
+        try:
+            resultados.append((nombre,) + medir(codigo, args.repeticiones))
+        except subprocess.CalledProcessError as e:
+            print(f"{nombre}: error: {e.stderr.strip().splitlines()[-1]}")
+
+    # la referencia es lo que costaba cualquier import antes de la carga diferida
+    referencia = {nombre: mediana for nombre, mejor, mediana, modulos in resultados}.get("todo + DLL")
+
+    print(f"{args.repeticiones} intérpretes por caso (ms; módulos cargados; mejora frente a todo + DLL)\n")
+    print(f"  {'caso':<20} {'mejor':>9} {'mediana':>9} {'módulos':>8} {'mejora':>8}")
+    for nombre, mejor, mediana, modulos in resultados:
+        mejora = f"{referencia / mediana:.1f}x" if referencia and mediana > 0 else "-"
+        print(f"  {nombre:<20} {mejor:>9.2f} {mediana:>9.2f} {modulos:>8} {mejora:>8}")
+
+
+if __name__ == "__main__":
+    main()
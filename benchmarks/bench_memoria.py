@@ -0,0 +1,131 @@
+"""
+Benchmark: memoria de los resultados de análisis de una placa de archivos .raw
+
+Analiza N archivos (96 por defecto, una placa) y mide la memoria que ocupan los
+resultados de todos con cada representación: se recorren los objetos guardados
+y se suman sus tamaños (sys.getsizeof, los datos de los arrays incluidos), cada
+objeto una sola vez aunque lo compartan varios resultados.
+  - diccionarios + listas:  lo que devolvía analisis_completo sin NumPy, listas
+                            de floats de Python
+  - diccionarios + arrays:  lo que devolvía analisis_completo con NumPy, un
+                            array de tiempos por cromatograma (TIC, BPI y MRM)
+  - ResultadoAnalisis:      analizar(), clases con __slots__, float32 contiguo
+                            y un eje de tiempos por función
+
+Sin --raw cada archivo es sintético (no hace falta la DLL ni licencia), con una
+semilla distinta por archivo; con --raw se repite el archivo indicado.
+
+Uso:
+    python benchmarks/bench_memoria.py [--raw archivo.raw] [--archivos N]
+                                       [--scans S] [--mrm M] [--funciones F]
+"""
+
+import argparse
+import os
+import sys
+
+# Agregar el path del SDK de MassLynx (relativo al repositorio)
+dir_repo = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.join(dir_repo, "MassLynxSDKDownload_v5.0.0", "python_wheel", "extracted"))
+sys.path.insert(0, dir_repo)
+
+import numpy as np
+
+from masslynxsdk import MassLynxRawBackend
+from analizar_raw_masslynx import AnalizadorRawMassLynx
+
+
+def _copia(valores, listas):
+    # la representación anterior tenía un array (o una lista) propio por cromatograma
+    return valores.tolist() if listas else np.array(valores)
+
+
+def representacion_anterior(resultado, listas=False):
+    """Devuelve los resultados como los devolvía analisis_completo antes de ResultadoAnalisis"""
+    datos = resultado.a_dict()
+    for entrada, croms in zip(datos['cromatogramas'], resultado.cromatogramas):
+        diccionario = entrada['cromatogramas']
+        for clave, crom in (('TIC', croms.tic), ('BPI', croms.bpi)):
+            if crom is not None:
+                diccionario[clave] = {'tiempos': _copia(crom.tiempos, listas),
+                                      'intensidades': _copia(crom.intensidades, listas),
+                                      'puntos': crom.puntos}
+        if croms.mrm_tiempos is not None:
+            tiempos = _copia(croms.mrm_tiempos, listas)
+            matriz = _copia(croms.mrm_matriz, listas)
+            diccionario['MRM_tiempos'] = tiempos
+            diccionario['MRM_matriz'] = matriz
+            for mrm in diccionario['MRM']:
+                mrm['tiempos'] = tiempos
+                mrm['intensidades'] = matriz[mrm['transicion'] - 1]
+    return datos
+
+
+def _slots(tipo):
+    return [nombre for clase in tipo.__mro__ for nombre in getattr(clase, '__slots__', ())]
+
+
+def tamano(objeto):
+    """Bytes de un objeto y de todo lo que contiene, contando cada objeto una vez"""
+    vistos = set()
+    pendientes = [objeto]
+    total = 0
+    while pendientes:
+        actual = pendientes.pop()
+        if id(actual) in vistos:
+            continue
+        vistos.add(id(actual))
+        # un array que no es dueño de sus datos cuenta sólo la cabecera, los datos están en base
+        total += sys.getsizeof(actual)
+        if isinstance(actual, np.ndarray):
+            if actual.base is not None:
+                pendientes.append(actual.base)
+        elif isinstance(actual, dict):
+            pendientes.extend(actual.keys())
+            pendientes.extend(actual.values())
+        elif isinstance(actual, (list, tuple, set)):
+            pendientes.extend(actual)
+        elif not isinstance(actual, (str, bytes, int, float, bool, type(None))):
+            pendientes.extend(getattr(actual, nombre) for nombre in _slots(type(actual)) if hasattr(actual, nombre))
+            if hasattr(actual, '__dict__'):
+                pendientes.append(actual.__dict__)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--raw", default=None, help="Archivo .raw real (por defecto, sintético)")
+    parser.add_argument("--archivos", type=int, default=96, help="Archivos de la placa")
+    parser.add_argument("--funciones", type=int, default=2)
+    parser.add_argument("--scans", type=int, default=1000)
+    parser.add_argument("--mrm", type=int, default=50)
+    args = parser.parse_args()
+
+    def ruta(i):
+        if args.raw:
+            return args.raw
+        return MassLynxRawBackend.SyntheticPath(functions=args.funciones, scans=args.scans, mrm=args.mrm, seed=i + 1)
+
+    placa = []
+    for i in range(args.archivos):
+        with AnalizadorRawMassLynx(ruta(i), cache=False, silencioso=True) as analizador:
+            placa.append(analizador.analizar())
+
+    casos = [
+        ("diccionarios + listas", [representacion_anterior(r, listas=True) for r in placa]),
+        ("diccionarios + arrays", [representacion_anterior(r) for r in placa]),
+        ("ResultadoAnalisis", placa),
+    ]
+
+    print(f"{args.archivos} archivos: {ruta(0)}\n")
+    print(f"  {'representación':<24} {'total MB':>10} {'por archivo KB':>15} {'frente a listas':>16}")
+    referencia = None
+    for nombre, resultados in casos:
+        bytes_totales = tamano(resultados)
+        referencia = referencia or bytes_totales
+        print(f"  {nombre:<24} {bytes_totales / 1e6:>10.1f} {bytes_totales / len(resultados) / 1e3:>15.1f} "
+              f"{referencia / bytes_totales:>15.1f}x")
+
+
+if __name__ == "__main__":
+    main()
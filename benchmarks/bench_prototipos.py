@@ -0,0 +1,87 @@
+"""
+Micro-benchmark: coste por llamada de los prototipos ctypes del SDK de MassLynx
+
+Compara dos formas de llamar a una función de la DLL:
+  - antes:   reasignar argtypes en cada llamada (como hacía el SDK original)
+  - después: llamar a la función con el prototipo ya registrado al cargar la DLL
+
+Usa getParameterValue y releaseMemory(NULL), que no necesitan un archivo .raw,
+así que la diferencia medida es solo la sobrecarga de Python/ctypes.
+
+Uso:
+    python benchmarks/bench_prototipos.py [--llamadas N] [--repeticiones R]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from ctypes import POINTER, c_char_p, c_int, c_void_p
+
+# Agregar el path del SDK de MassLynx (relativo al repositorio)
+sdk_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                        "MassLynxSDKDownload_v5.0.0", "python_wheel", "extracted")
+sys.path.insert(0, os.path.normpath(sdk_path))
+
+from masslynxsdk import MassLynxParameters
+from masslynxsdk.Providers.MassLynxProvider import MassLynxProvider
+
+
+def medir(funcion, llamadas, repeticiones):
+    """Devuelve el mejor tiempo por llamada en nanosegundos"""
+    tiempos = timeit.repeat(funcion, number=llamadas, repeat=repeticiones)
+    return min(tiempos) / llamadas * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--llamadas", type=int, default=200000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    dll = MassLynxProvider.MassLynxDll
+    parametros = MassLynxParameters()
+    handle = parametros.GetParameters()
+    valor = c_char_p()
+    nulo = c_void_p()
+
+    def get_parameter_antes():
+        getParameterValue = dll.getParameterValue
+        getParameterValue.argtypes = [c_void_p, c_int, POINTER(c_char_p)]
+        getParameterValue(handle, 1, valor)
+
+    def get_parameter_despues():
+        getParameterValue = dll.getParameterValue
+        getParameterValue(handle, 1, valor)
+
+    def release_antes():
+        releaseMemory = dll.releaseMemory
+        releaseMemory.argtypes = [c_void_p]
+        releaseMemory(nulo)
+
+    def release_despues():
+        releaseMemory = dll.releaseMemory
+        releaseMemory(nulo)
+
+    casos = [
+        ("getParameterValue", get_parameter_antes, get_parameter_despues),
+        ("releaseMemory", release_antes, release_despues),
+    ]
+
+    print(f"Librería: {MassLynxProvider.MassLynxPath}")
+    print(f"{args.llamadas} llamadas x {args.repeticiones} repeticiones (mejor tiempo)\n")
+    print(f"{'Función':<20} {'antes (ns)':>12} {'después (ns)':>14} {'ahorro':>8}")
+    print("-" * 58)
+
+    for nombre, antes, despues in casos:
+        t_antes = medir(antes, args.llamadas, args.repeticiones)
+        t_despues = medir(despues, args.llamadas, args.repeticiones)
+        ahorro = (1 - t_despues / t_antes) * 100
+        print(f"{nombre:<20} {t_antes:>12.0f} {t_despues:>14.0f} {ahorro:>7.1f}%")
+
+    # Dejar los prototipos como los registra el SDK
+    MassLynxProvider.BindPrototypes(dll)
+
+
+if __name__ == "__main__":
+    main()
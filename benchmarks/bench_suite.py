@@ -0,0 +1,399 @@
+"""
+Benchmark: suite de lectura y exportación con historial por commit
+
+Mide la apertura de archivos, ReadScan, ReadMRMChromatograms de 10 a 1000
+transiciones, los parámetros de scan (bucle de GetScanItemValue frente a
+GetScanItemTable), el índice de scans, AnalizadorRawMassLynx.analisis_completo
+(sin caché) frente al análisis estructurado sin texto (analizar) y al perezoso
+de un solo compuesto, header y funciones desde la caché de metadatos y
+exportar_cromatogramas_csv (MB/s, con un panel normal y uno de 500 transiciones).
+
+Sin --raw cada benchmark usa un archivo sintético de tamaño realista (no hace
+falta la DLL ni licencia); con --raw todos usan el archivo indicado.
+
+Cada ejecución añade una línea por benchmark al historial (JSON Lines) con el
+commit, la máquina y los tiempos, y se compara con la última ejecución de otro
+commit en la misma máquina y con los mismos datos: las que superan el umbral se
+marcan como regresión.
+
+Uso:
+    python benchmarks/bench_suite.py [--raw archivo.raw] [--repeticiones R] [--filtro texto]
+                                     [--umbral 0.2] [--historial ruta] [--sin-guardar] [--estricto]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Agregar el path del SDK de MassLynx (relativo al repositorio)
+dir_repo = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.join(dir_repo, "MassLynxSDKDownload_v5.0.0", "python_wheel", "extracted"))
+sys.path.insert(0, dir_repo)
+
+from masslynxsdk import MassLynxMetadataCache, MassLynxRawBackend, MassLynxRawSession, MassLynxScanItem
+from ejemplos_uso_sdk import LICENCIA
+from analizar_raw_masslynx import AnalizadorRawMassLynx
+
+HISTORIAL = os.path.join(dir_repo, "benchmarks", "historial.jsonl")
+
+# Scans leídos como máximo por los benchmarks que recorren scans
+MAX_SCANS = 500
+
+ITEMS_SCAN = [MassLynxScanItem.TOTAL_ION_CURRENT, MassLynxScanItem.BASE_PEAK_MASS, MassLynxScanItem.BASE_PEAK_INTENSITY]
+
+BENCHMARKS = []
+
+
+def benchmark(nombre, unidad=None, **sintetico):
+    """
+    Registra un benchmark
+
+    La función recibe (ruta_raw, medir) y llama una vez a medir(funcion, unidades)
+    con la parte a cronometrar; lo que hace antes y después (abrir el archivo,
+    preparar datos) no se mide. Si no llama a medir el benchmark se omite.
+
+    Args:
+        nombre: nombre en el historial
+        unidad: qué cuenta `unidades` (para el rendimiento por segundo)
+        sintetico: parámetros del archivo sintético (MassLynxRawBackend.SyntheticPath)
+    """
+    def registrar(funcion):
+        BENCHMARKS.append({'nombre': nombre, 'funcion': funcion, 'unidad': unidad, 'sintetico': sintetico})
+        return funcion
+    return registrar
+
+
+def primera_funcion(info, mrm=False):
+    """Primera función MRM (mrm=True) o la primera con scans; None si no hay"""
+    for funcion in range(info.GetNumberofFunctions()):
+        if mrm and info.GetMRMCount(funcion) > 0:
+            return funcion
+        if not mrm and info.GetScansInFunction(funcion) > 0:
+            return funcion
+    return None
+
+
+@benchmark("apertura_sesion", scans=1000, points=1000)
+def bench_apertura_sesion(ruta_raw, medir):
+    medir(lambda: MassLynxRawSession(ruta_raw, LICENCIA).Close())
+
+
+@benchmark("apertura_lectores", scans=1000, points=1000)
+def bench_apertura_lectores(ruta_raw, medir):
+    def abrir():
+        with MassLynxRawSession(ruta_raw, LICENCIA) as sesion:
+            sesion.GetChromatogramReader()
+            sesion.GetScanReader()
+    medir(abrir)
+
+
+@benchmark("lectura_scans", unidad="scans", scans=2000, points=2000)
+def bench_lectura_scans(ruta_raw, medir):
+    with MassLynxRawSession(ruta_raw, LICENCIA, arrayMode=True) as sesion:
+        info = sesion.GetInfoReader()
+        lector = sesion.GetScanReader()
+        funcion = primera_funcion(info)
+        if funcion is None:
+            return
+        total = min(info.GetScansInFunction(funcion), MAX_SCANS)
+
+        def leer():
+            for scan in range(total):
+                lector.ReadScan(funcion, scan)
+        medir(leer, total)
+
+
+def registrar_mrm(num_transiciones):
+    @benchmark(f"mrm_{num_transiciones}", unidad="transiciones", scans=1000, mrm=num_transiciones)
+    def bench_mrm(ruta_raw, medir):
+        with MassLynxRawSession(ruta_raw, LICENCIA, arrayMode=True) as sesion:
+            info = sesion.GetInfoReader()
+            chrom = sesion.GetChromatogramReader()
+            funcion = primera_funcion(info, mrm=True)
+            if funcion is None:
+                return
+            # con un archivo grabado con menos transiciones se repiten los índices
+            num_mrm = info.GetMRMCount(funcion)
+            transiciones = [indice % num_mrm for indice in range(num_transiciones)]
+            medir(lambda: chrom.ReadMRMChromatograms(funcion, transiciones), num_transiciones)
+
+
+for _num_transiciones in (10, 100, 1000):
+    registrar_mrm(_num_transiciones)
+
+
+@benchmark("items_scan_bucle", unidad="scans", scans=2000, points=500)
+def bench_items_scan_bucle(ruta_raw, medir):
+    with MassLynxRawSession(ruta_raw, LICENCIA) as sesion:
+        info = sesion.GetInfoReader()
+        funcion = primera_funcion(info)
+        if funcion is None:
+            return
+        total = min(info.GetScansInFunction(funcion), MAX_SCANS)
+
+        def leer():
+            for scan in range(total):
+                params = info.GetScanItemValue(funcion, scan, ITEMS_SCAN)
+                for item in ITEMS_SCAN:
+                    params.Get(item)
+        medir(leer, total)
+
+
+@benchmark("items_scan_tabla", unidad="scans", scans=2000, points=500)
+def bench_items_scan_tabla(ruta_raw, medir):
+    with MassLynxRawSession(ruta_raw, LICENCIA, arrayMode=True) as sesion:
+        info = sesion.GetInfoReader()
+        funcion = primera_funcion(info)
+        if funcion is None:
+            return
+        total = min(info.GetScansInFunction(funcion), MAX_SCANS)
+        medir(lambda: info.GetScanItemTable(funcion, ITEMS_SCAN, 0, total - 1), total)
+
+
+@benchmark("indice_scans", unidad="scans", scans=2000, points=500)
+def bench_indice_scans(ruta_raw, medir):
+    def construir():
+        # una sesión nueva cada vez: el índice queda guardado en el lector
+        with MassLynxRawSession(ruta_raw, LICENCIA) as sesion:
+            return len(sesion.GetScanIndex(funcion))
+
+    with MassLynxRawSession(ruta_raw, LICENCIA) as sesion:
+        funcion = primera_funcion(sesion.GetInfoReader())
+        if funcion is None:
+            return
+        total = sesion.GetInfoReader().GetScansInFunction(funcion)
+    medir(construir, total)
+
+
+@benchmark("analisis_completo", functions=2, scans=1000, mrm=50)
+def bench_analisis_completo(ruta_raw, medir):
+    # sin caché de metadatos, para que cada vuelta lea el archivo
+    def analizar():
+        with AnalizadorRawMassLynx(ruta_raw, cache=False) as analizador:
+            analizador.analisis_completo(extraer_espectros=True)
+    medir(analizar)
+
+
+@benchmark("analisis_estructurado", functions=2, scans=1000, mrm=50)
+def bench_analisis_estructurado(ruta_raw, medir):
+    # lo mismo que analisis_completo sin formatear texto (lo que hace procesar_lote)
+    def analizar():
+        with AnalizadorRawMassLynx(ruta_raw, cache=False, silencioso=True) as analizador:
+            analizador.analizar(extraer_espectros=True)
+    medir(analizar)
+
+
+@benchmark("perezoso_un_compuesto", functions=2, scans=1000, mrm=50)
+def bench_perezoso_un_compuesto(ruta_raw, medir):
+    # cromatogramas de un compuesto con el resultado perezoso: no se leen los demás
+    def analizar():
+        with AnalizadorRawMassLynx(ruta_raw, cache=False, silencioso=True) as analizador:
+            resultado = analizador.analizar_perezoso()
+            for funcion, transicion in resultado.buscar("MRM_1"):
+                resultado.cromatograma_mrm(funcion, transicion.indice)
+    medir(analizar)
+
+
+@benchmark("metadatos_con_cache", functions=2, scans=1000, mrm=50)
+def bench_metadatos_con_cache(ruta_raw, medir):
+    # header y funciones desde una caché temporal ya llena (la vuelta de calentamiento la llena)
+    carpeta = tempfile.mkdtemp(prefix="bench_cache_")
+    try:
+        with MassLynxMetadataCache(carpeta) as cache:
+            def analizar():
+                with AnalizadorRawMassLynx(ruta_raw, cache=cache) as analizador:
+                    analizador.extraer_informacion_header()
+                    analizador.extraer_informacion_funciones()
+            medir(analizar)
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+
+def _bench_exportar_csv(ruta_raw, medir):
+    # MB escritos por segundo: una tabla ancha por función
+    with AnalizadorRawMassLynx(ruta_raw, cache=False, silencioso=True) as analizador:
+        resultado = analizador.analizar()
+        carpeta = tempfile.mkdtemp(prefix="bench_csv_")
+        try:
+            archivos = analizador.exportar_cromatogramas_csv(resultado, carpeta)
+            megabytes = sum(os.path.getsize(archivo) for archivo in archivos) / 1e6
+            medir(lambda: analizador.exportar_cromatogramas_csv(resultado, carpeta), megabytes)
+        finally:
+            shutil.rmtree(carpeta, ignore_errors=True)
+
+
+benchmark("exportar_csv", unidad="MB", functions=2, scans=1000, mrm=50)(_bench_exportar_csv)
+benchmark("exportar_csv_panel_grande", unidad="MB", functions=1, scans=2000, mrm=500)(_bench_exportar_csv)
+
+
+class Medidor:
+    """Cronometra la función que le pasa un benchmark: una vuelta de calentamiento y R medidas"""
+
+    def __init__(self, repeticiones):
+        self.repeticiones = repeticiones
+        self.tiempos = None
+        self.unidades = None
+
+    def __call__(self, funcion, unidades=None):
+        # la salida por consola del analizador no forma parte de la medida
+        with contextlib.redirect_stdout(io.StringIO()):
+            funcion()
+            tiempos = []
+            for _ in range(self.repeticiones):
+                inicio = time.perf_counter()
+                funcion()
+                tiempos.append(time.perf_counter() - inicio)
+        self.tiempos = tiempos
+        self.unidades = unidades
+
+
+def estado_git():
+    """Devuelve (commit, hay cambios sin commitear); (None, False) fuera de un repositorio"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=dir_repo, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        cambios = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=dir_repo,
+                                 capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(cambios)
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+def cargar_historial(ruta):
+    """Lee el historial; ignora las líneas dañadas"""
+    registros = []
+    if not os.path.exists(ruta):
+        return registros
+    with open(ruta, encoding="utf-8") as f:
+        for linea in f:
+            try:
+                registros.append(json.loads(linea))
+            except ValueError:
+                continue
+    return registros
+
+
+def anterior(historial, registro):
+    """Última medida del mismo benchmark, datos y máquina en otro commit"""
+    for previo in reversed(historial):
+        if (previo.get('benchmark') == registro['benchmark']
+                and previo.get('datos') == registro['datos']
+                and previo.get('maquina') == registro['maquina']
+                and (registro['commit'] is None or previo.get('commit') != registro['commit'])):
+            return previo
+    return None
+
+
+def ejecutar(seleccion, ruta_raw, repeticiones, contexto):
+    """Ejecuta los benchmarks y devuelve un registro de historial por cada uno medido"""
+    registros = []
+    for definicion in seleccion:
+        datos = ruta_raw or MassLynxRawBackend.SyntheticPath(**definicion['sintetico'])
+        medidor = Medidor(repeticiones)
+        print(f"  {definicion['nombre']:<22}", end="", flush=True)
+        try:
+            definicion['funcion'](datos, medidor)
+        except Exception as e:
+            print(f"error: {e}")
+            continue
+        if medidor.tiempos is None:
+            print("omitido (el archivo no tiene datos para este benchmark)")
+            continue
+
+        mediana = statistics.median(medidor.tiempos)
+        registro = dict(contexto)
+        registro.update({
+            'benchmark': definicion['nombre'],
+            'datos': datos,
+            'repeticiones': repeticiones,
+            'min_s': min(medidor.tiempos),
+            'mediana_s': mediana,
+            'unidades': medidor.unidades,
+            'unidad': definicion['unidad'],
+            'por_segundo': medidor.unidades / mediana if medidor.unidades and mediana > 0 else None,
+        })
+        registros.append(registro)
+        print(f"{mediana * 1000:>10.2f} ms")
+    return registros
+
+
+def imprimir_comparacion(registros, historial, umbral):
+    """Muestra cada resultado frente a la ejecución anterior; devuelve el número de regresiones"""
+    regresiones = 0
+    print()
+    print(f"{'Benchmark':<22} {'Mediana':>11} {'Mínimo':>11} {'Rendimiento':>24} {'vs anterior':>14}")
+    print("-" * 86)
+    for registro in registros:
+        rendimiento = ""
+        if registro['por_segundo']:
+            rendimiento = f"{registro['por_segundo']:,.0f} {registro['unidad']}/s"
+        comparacion = "(sin datos)"
+        previo = anterior(historial, registro)
+        if previo and previo.get('mediana_s'):
+            cambio = registro['mediana_s'] / previo['mediana_s'] - 1
+            comparacion = f"{cambio:+.1%}"
+            if cambio > umbral:
+                comparacion += " REGRESIÓN"
+                regresiones += 1
+        print(f"{registro['benchmark']:<22} {registro['mediana_s'] * 1000:>9.2f}ms "
+              f"{registro['min_s'] * 1000:>9.2f}ms {rendimiento:>24} {comparacion:>14}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--raw", help="Archivo .raw grabado (por defecto, archivos sintéticos)")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Medidas por benchmark")
+    parser.add_argument("--filtro", default="", help="Ejecutar sólo los benchmarks cuyo nombre contiene este texto")
+    parser.add_argument("--umbral", type=float, default=0.2,
+                        help="Aumento de la mediana considerado regresión (0.2 = 20%%)")
+    parser.add_argument("--historial", default=HISTORIAL, help="Archivo JSON Lines con los resultados")
+    parser.add_argument("--sin-guardar", action="store_true", help="No añadir los resultados al historial")
+    parser.add_argument("--estricto", action="store_true", help="Terminar con código 1 si hay regresiones")
+    args = parser.parse_args()
+
+    seleccion = [definicion for definicion in BENCHMARKS if args.filtro in definicion['nombre']]
+    if not seleccion:
+        print(f"Ningún benchmark contiene '{args.filtro}'")
+        return 1
+
+    commit, cambios = estado_git()
+    contexto = {
+        'fecha': datetime.datetime.now().isoformat(timespec="seconds"),
+        'commit': commit,
+        'cambios_sin_commit': cambios,
+        'maquina': platform.node(),
+        'python': platform.python_version(),
+        'backend': MassLynxRawBackend.Get() if args.raw else MassLynxRawBackend.SYNTHETIC,
+    }
+    print(f"Commit {commit[:10] if commit else '?'}{' (con cambios)' if cambios else ''}, "
+          f"{len(seleccion)} benchmarks, {args.repeticiones} repeticiones")
+
+    historial = cargar_historial(args.historial)
+    registros = ejecutar(seleccion, args.raw, args.repeticiones, contexto)
+    regresiones = imprimir_comparacion(registros, historial, args.umbral)
+
+    if not args.sin_guardar and registros:
+        os.makedirs(os.path.dirname(os.path.abspath(args.historial)), exist_ok=True)
+        with open(args.historial, "a", encoding="utf-8") as f:
+            for registro in registros:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        print(f"\nResultados añadidos a {args.historial}")
+
+    if regresiones:
+        print(f"\n{regresiones} regresiones (umbral {args.umbral:.0%})")
+    return 1 if (regresiones and args.estricto) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,14 +7,20 @@ Ejemplos de uso común para análisis rápidos
 import sys
 import os
 
-# Agregar el path del SDK
-sdk_path = r"c:\Damico\Laboratorio\Software\Prueba\MassLynxSDKDownload_v5.0.0\python_wheel\extracted"
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Agregar el path del SDK (relativo a este archivo)
+sdk_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "MassLynxSDKDownload_v5.0.0", "python_wheel", "extracted")
 sys.path.insert(0, sdk_path)
 
 from masslynxsdk import (
     MassLynxRawInfoReader,
     MassLynxRawChromatogramReader,
     MassLynxRawScanReader,
+    MassLynxRawSession,
     MassLynxHeaderItem,
     MassLynxScanItem
 )
@@ -37,6 +43,40 @@ def cargar_licencia():
 
 LICENCIA = cargar_licencia()
 
+# Parámetros que se leen para cada transición MRM
+ITEMS_TRANSICION = [
+    MassLynxScanItem.SET_MASS,
+    MassLynxScanItem.COLLISION_ENERGY,
+    MassLynxScanItem.SAMPLING_CONE_VOLTAGE
+]
+
+
+def abrir_sesion(ruta_raw):
+    """
+    Abre el archivo .raw una sola vez para todos los lectores
+    
+    Todas las funciones de este módulo aceptan una ruta o una sesión ya abierta;
+    pasar la misma sesión evita volver a abrir el archivo en cada llamada.
+    
+    Args:
+        ruta_raw: ruta al archivo .raw o MassLynxRawSession abierta
+    
+    Returns:
+        MassLynxRawSession
+    """
+    if isinstance(ruta_raw, MassLynxRawSession):
+        return ruta_raw
+    return MassLynxRawSession(ruta_raw, LICENCIA, arrayMode=np is not None)
+
+
+def _valor_numerico(valor):
+    """Convierte un valor de la tabla de scan items a float (None si no está disponible)"""
+    try:
+        valor = float(valor)
+    except (TypeError, ValueError):
+        return None
+    return None if valor != valor else valor
+
 
 def extraer_info_basica(ruta_raw):
     """
@@ -45,15 +85,16 @@ def extraer_info_basica(ruta_raw):
     Returns:
         dict con información básica
     """
-    info = MassLynxRawInfoReader(ruta_raw, LICENCIA)
+    info = abrir_sesion(ruta_raw).GetInfoReader()
+    header = info.GetHeaderSnapshot()
     
     datos = {
-        'nombre': info.GetHeaderItemValue([MassLynxHeaderItem.ACQUIRED_NAME]).Get(MassLynxHeaderItem.ACQUIRED_NAME),
-        'fecha': info.GetHeaderItemValue([MassLynxHeaderItem.ACQUIRED_DATE]).Get(MassLynxHeaderItem.ACQUIRED_DATE),
-        'hora': info.GetHeaderItemValue([MassLynxHeaderItem.ACQUIRED_TIME]).Get(MassLynxHeaderItem.ACQUIRED_TIME),
-        'muestra_id': info.GetHeaderItemValue([MassLynxHeaderItem.SAMPLE_ID]).Get(MassLynxHeaderItem.SAMPLE_ID),
-        'instrumento': info.GetHeaderItemValue([MassLynxHeaderItem.INSTRUMENT]).Get(MassLynxHeaderItem.INSTRUMENT),
-        'vial': info.GetHeaderItemValue([MassLynxHeaderItem.BOTTLE_NUMBER]).Get(MassLynxHeaderItem.BOTTLE_NUMBER),
+        'nombre': header.Get(MassLynxHeaderItem.ACQUIRED_NAME),
+        'fecha': header.Get(MassLynxHeaderItem.ACQUIRED_DATE),
+        'hora': header.Get(MassLynxHeaderItem.ACQUIRED_TIME),
+        'muestra_id': header.Get(MassLynxHeaderItem.SAMPLE_ID),
+        'instrumento': header.Get(MassLynxHeaderItem.INSTRUMENT),
+        'vial': header.Get(MassLynxHeaderItem.BOTTLE_NUMBER),
         'num_funciones': info.GetNumberofFunctions()
     }
     
@@ -65,13 +106,13 @@ def listar_transiciones_mrm(ruta_raw, funcion=0):
     Lista todas las transiciones MRM de una función
     
     Args:
-        ruta_raw: ruta al archivo .raw
+        ruta_raw: ruta al archivo .raw o MassLynxRawSession abierta
         funcion: índice de la función (0-based)
     
     Returns:
         list de dicts con info de cada transición
     """
-    info = MassLynxRawInfoReader(ruta_raw, LICENCIA)
+    info = abrir_sesion(ruta_raw).GetInfoReader()
     
     # Verificar que es MRM
     tipo = info.GetFunctionTypeString(info.GetFunctionType(funcion))
@@ -79,34 +120,28 @@ def listar_transiciones_mrm(ruta_raw, funcion=0):
         print(f"Advertencia: La función {funcion} no es MRM, es {tipo}")
     
     num_mrm = info.GetMRMCount(funcion)
+    if num_mrm == 0:
+        return []
+    
+    # Una sola pasada para los tres parámetros de todas las transiciones
+    try:
+        tabla = info.GetScanItemTable(funcion, ITEMS_TRANSICION, 0, num_mrm - 1)
+        q1s = tabla[MassLynxScanItem.SET_MASS]
+        energias = tabla[MassLynxScanItem.COLLISION_ENERGY]
+        conos = tabla[MassLynxScanItem.SAMPLING_CONE_VOLTAGE]
+    except Exception as e:
+        print(f"Error al leer parámetros de las transiciones: {e}")
+        q1s = energias = conos = [None] * num_mrm
     
     transiciones = []
     for i in range(num_mrm):
-        try:
-            trans = {
-                'numero': i + 1,
-                'indice': i
-            }
-            
-            # Intentar obtener parámetros comunes
-            try:
-                trans['q1'] = float(info.GetScanItemValue(funcion, i, [MassLynxScanItem.SET_MASS]).Get(MassLynxScanItem.SET_MASS))
-            except:
-                trans['q1'] = None
-            
-            try:
-                trans['energia_colision'] = float(info.GetScanItemValue(funcion, i, [MassLynxScanItem.COLLISION_ENERGY]).Get(MassLynxScanItem.COLLISION_ENERGY))
-            except:
-                trans['energia_colision'] = None
-            
-            try:
-                trans['voltaje_cono'] = float(info.GetScanItemValue(funcion, i, [MassLynxScanItem.SAMPLING_CONE_VOLTAGE]).Get(MassLynxScanItem.SAMPLING_CONE_VOLTAGE))
-            except:
-                trans['voltaje_cono'] = None
-            
-            transiciones.append(trans)
-        except Exception as e:
-            print(f"Error en transición {i}: {e}")
+        transiciones.append({
+            'numero': i + 1,
+            'indice': i,
+            'q1': _valor_numerico(q1s[i]),
+            'energia_colision': _valor_numerico(energias[i]),
+            'voltaje_cono': _valor_numerico(conos[i])
+        })
     
     return transiciones
 
@@ -118,27 +153,61 @@ def extraer_cromatograma_tic(ruta_raw, funcion=0):
     Returns:
         tuple (tiempos, intensidades)
     """
-    chrom = MassLynxRawChromatogramReader(ruta_raw, LICENCIA)
+    chrom = abrir_sesion(ruta_raw).GetChromatogramReader()
     tiempos, intensidades = chrom.ReadTIC(funcion)
     return tiempos, intensidades
 
 
-def extraer_cromatogramas_mrm(ruta_raw, funcion=0):
+def extraer_matriz_mrm(ruta_raw, funcion=0, transiciones=None):
     """
-    Extrae todos los cromatogramas MRM de una función
+    Extrae los cromatogramas MRM de una función con una sola lectura
+    (por bloques si el panel es muy grande)
+    
+    Args:
+        ruta_raw: ruta al archivo .raw o MassLynxRawSession abierta
+        funcion: índice de la función (0-based)
+        transiciones: índices (0-based) de las transiciones a leer, None para todas;
+                      sólo se leen del archivo las pedidas
     
     Returns:
-        dict con transiciones como keys y (tiempos, intensidades) como values
+        tuple (tiempos, matriz) con un vector de tiempos compartido y una fila
+        por transición; con numpy la matriz es un array float32 (n_transiciones × n_puntos)
     """
-    info = MassLynxRawInfoReader(ruta_raw, LICENCIA)
-    chrom = MassLynxRawChromatogramReader(ruta_raw, LICENCIA)
+    sesion = abrir_sesion(ruta_raw)
+    info = sesion.GetInfoReader()
+    chrom = sesion.GetChromatogramReader()
     
     num_mrm = info.GetMRMCount(funcion)
+    transiciones = list(range(num_mrm)) if transiciones is None else [t for t in transiciones if 0 <= t < num_mrm]
+    if not transiciones:
+        return [], []
+    
+    return chrom.ReadMRMChromatograms(funcion, transiciones)
+
+
+def extraer_cromatogramas_mrm(ruta_raw, funcion=0, transiciones=None):
+    """
+    Extrae los cromatogramas MRM de una función
+    
+    Args:
+        transiciones: índices (0-based) de las transiciones a leer, None para todas;
+                      los índices fuera de rango se ignoran
+    
+    Returns:
+        dict con transiciones como keys y (tiempos, intensidades) como values;
+        todas las transiciones comparten el mismo vector de tiempos
+    """
+    sesion = abrir_sesion(ruta_raw)
+    num_mrm = sesion.GetInfoReader().GetMRMCount(funcion)
+    if transiciones is None:
+        transiciones = range(num_mrm)
+    # filtrar aquí para que las etiquetas correspondan a las filas de la matriz
+    transiciones = [t for t in transiciones if 0 <= t < num_mrm]
+    tiempos, matriz = extraer_matriz_mrm(sesion, funcion, transiciones)
     
     cromatogramas = {}
-    for i in range(num_mrm):
-        tiempos, intensidades = chrom.ReadMRMChromatogram(funcion, i)
-        cromatogramas[f'Transicion_{i+1}'] = (tiempos, intensidades)
+    for fila in range(len(matriz)):
+        cromatogramas[f'Transicion_{transiciones[fila] + 1}'] = (tiempos, matriz[fila])
     
     return cromatogramas
 
@@ -150,7 +219,7 @@ def extraer_espectro_scan(ruta_raw, funcion=0, scan=0):
     Returns:
         tuple (masas, intensidades)
     """
-    scan_reader = MassLynxRawScanReader(ruta_raw, LICENCIA)
+    scan_reader = abrir_sesion(ruta_raw).GetScanReader()
     masas, intensidades = scan_reader.ReadScan(funcion, scan)
     return masas, intensidades
 
@@ -162,7 +231,7 @@ def obtener_parametros_funcion(ruta_raw, funcion=0):
     Returns:
         dict con parámetros
     """
-    info = MassLynxRawInfoReader(ruta_raw, LICENCIA)
+    info = abrir_sesion(ruta_raw).GetInfoReader()
     
     params = {}
     
@@ -194,61 +263,88 @@ def exportar_mrm_a_csv(ruta_raw, funcion, archivo_salida):
     Exporta todos los cromatogramas MRM de una función a un archivo CSV
     con columnas separadas para cada transición
     
+    Los valores se formatean por bloques de filas (exportar_tablas.escribir_tabla),
+    sin recorrer las filas en Python.
+    
     Args:
-        ruta_raw: ruta al archivo .raw
+        ruta_raw: ruta al archivo .raw o MassLynxRawSession abierta
         funcion: índice de la función
         archivo_salida: ruta del archivo CSV de salida
+    
+    Returns:
+        bytes escritos
     """
-    import csv
+    from exportar_tablas import escribir_tabla
     
-    info = MassLynxRawInfoReader(ruta_raw, LICENCIA)
-    chrom = MassLynxRawChromatogramReader(ruta_raw, LICENCIA)
+    # Extraer todos los cromatogramas en una sola lectura
+    tiempos, matriz = extraer_matriz_mrm(ruta_raw, funcion)
+    num_mrm = len(matriz)
     
-    num_mrm = info.GetMRMCount(funcion)
+    # Una fila por tiempo, una columna por transición
+    header = ['Tiempo_min'] + [f'Trans_{i+1}' for i in range(num_mrm)]
+    escritos = escribir_tabla(archivo_salida, header, [tiempos, matriz] if num_mrm else [tiempos])
     
-    # Extraer todos los cromatogramas
-    datos = {}
-    tiempos = None
+    print(f"Exportado a: {archivo_salida}")
+    return escritos
+
+
+def _extraer_archivo(ruta_raw, funcion):
+    """Extrae TIC y matriz MRM de un archivo con una sesión propia (una por tarea)"""
+    with MassLynxRawSession(ruta_raw, LICENCIA, arrayMode=np is not None) as sesion:
+        tic = extraer_cromatograma_tic(sesion, funcion)
+        mrm = extraer_matriz_mrm(sesion, funcion)
+    return {'tic': tic, 'mrm': mrm}
+
+
+def extraer_en_paralelo(rutas_raw, hilos=4, funcion=0):
+    """
+    Extrae TIC y cromatogramas MRM de muchos archivos en paralelo
     
-    for i in range(num_mrm):
-        t, intensidades = chrom.ReadMRMChromatogram(funcion, i)
-        if tiempos is None:
-            tiempos = t
-        datos[f'Transicion_{i+1}'] = intensidades
-    
-    # Escribir CSV
-    with open(archivo_salida, 'w', newline='') as f:
-        writer = csv.writer(f)
-        
-        # Header
-        header = ['Tiempo_min'] + [f'Trans_{i+1}' for i in range(num_mrm)]
-        writer.writerow(header)
-        
-        # Datos
-        for i, t in enumerate(tiempos):
-            fila = [t] + [datos[f'Transicion_{j+1}'][i] for j in range(num_mrm)]
-            writer.writerow(fila)
+    Cada tarea abre su propia sesión, así ningún handle nativo se comparte entre
+    hilos; las llamadas a la DLL liberan el GIL y los archivos se leen en paralelo.
     
-    print(f"Exportado a: {archivo_salida}")
+    Args:
+        rutas_raw: lista de rutas a archivos .raw
+        hilos: número de hilos de trabajo
+        funcion: índice de la función (0-based)
+    
+    Returns:
+        dict ruta -> {'tic': (tiempos, intensidades), 'mrm': (tiempos, matriz)},
+        o la excepción si el archivo no se pudo leer
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    resultados = {}
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        futuros = {ruta: ejecutor.submit(_extraer_archivo, ruta, funcion) for ruta in rutas_raw}
+        for ruta, futuro in futuros.items():
+            try:
+                resultados[ruta] = futuro.result()
+            except Exception as e:
+                resultados[ruta] = e
+    
+    return resultados
 
 
 def resumen_completo(ruta_raw):
     """
     Imprime un resumen completo del archivo .raw
     """
-    info = MassLynxRawInfoReader(ruta_raw, LICENCIA)
+    sesion = abrir_sesion(ruta_raw)
+    info = sesion.GetInfoReader()
     
     print("=" * 70)
     print("RESUMEN DEL ARCHIVO .RAW")
     print("=" * 70)
     
-    # Info básica
-    print(f"\nArchivo: {os.path.basename(ruta_raw)}")
-    print(f"Nombre: {info.GetHeaderItemValue([MassLynxHeaderItem.ACQUIRED_NAME]).Get(MassLynxHeaderItem.ACQUIRED_NAME)}")
-    print(f"Fecha: {info.GetHeaderItemValue([MassLynxHeaderItem.ACQUIRED_DATE]).Get(MassLynxHeaderItem.ACQUIRED_DATE)}")
-    print(f"Hora: {info.GetHeaderItemValue([MassLynxHeaderItem.ACQUIRED_TIME]).Get(MassLynxHeaderItem.ACQUIRED_TIME)}")
-    print(f"Muestra ID: {info.GetHeaderItemValue([MassLynxHeaderItem.SAMPLE_ID]).Get(MassLynxHeaderItem.SAMPLE_ID)}")
-    print(f"Instrumento: {info.GetHeaderItemValue([MassLynxHeaderItem.INSTRUMENT]).Get(MassLynxHeaderItem.INSTRUMENT)}")
+    # Info básica (todo el header en una sola llamada)
+    header = info.GetHeaderSnapshot()
+    print(f"\nArchivo: {os.path.basename(sesion.GetPath())}")
+    print(f"Nombre: {header.Get(MassLynxHeaderItem.ACQUIRED_NAME)}")
+    print(f"Fecha: {header.Get(MassLynxHeaderItem.ACQUIRED_DATE)}")
+    print(f"Hora: {header.Get(MassLynxHeaderItem.ACQUIRED_TIME)}")
+    print(f"Muestra ID: {header.Get(MassLynxHeaderItem.SAMPLE_ID)}")
+    print(f"Instrumento: {header.Get(MassLynxHeaderItem.INSTRUMENT)}")
     
     # Funciones
     num_func = info.GetNumberofFunctions()
@@ -277,15 +373,20 @@ def resumen_completo(ruta_raw):
             if num_mrm > 0:
                 print(f"  *** MRM: {num_mrm} transiciones ***")
                 
-                # Mostrar primeras 5 transiciones
-                for i in range(min(5, num_mrm)):
-                    try:
-                        q1 = float(info.GetScanItemValue(func, i, [MassLynxScanItem.SET_MASS]).Get(MassLynxScanItem.SET_MASS))
-                        ce = float(info.GetScanItemValue(func, i, [MassLynxScanItem.COLLISION_ENERGY]).Get(MassLynxScanItem.COLLISION_ENERGY))
-                        cone = float(info.GetScanItemValue(func, i, [MassLynxScanItem.SAMPLING_CONE_VOLTAGE]).Get(MassLynxScanItem.SAMPLING_CONE_VOLTAGE))
-                        print(f"    Trans {i+1}: Q1={q1:.2f}, CE={ce}V, Cono={cone}V")
-                    except:
+                # Mostrar primeras 5 transiciones (una sola lectura de parámetros)
+                num_mostrar = min(5, num_mrm)
+                try:
+                    tabla = info.GetScanItemTable(func, ITEMS_TRANSICION, 0, num_mostrar - 1)
+                    columnas = [tabla[item] for item in ITEMS_TRANSICION]
+                except:
+                    columnas = [[None] * num_mostrar] * len(ITEMS_TRANSICION)
+                
+                for i in range(num_mostrar):
+                    q1, ce, cone = (_valor_numerico(columna[i]) for columna in columnas)
+                    if None in (q1, ce, cone):
                         print(f"    Trans {i+1}: parámetros no disponibles")
+                    else:
+                        print(f"    Trans {i+1}: Q1={q1:.2f}, CE={ce}V, Cono={cone}V")
                 
                 if num_mrm > 5:
                     print(f"    ... y {num_mrm - 5} transiciones más")
@@ -300,28 +401,31 @@ def resumen_completo(ruta_raw):
 # ============================================================================
 
 if __name__ == "__main__":
-    # Archivo de ejemplo
-    ruta_raw = r"c:\Damico\Laboratorio\Software\Prueba\20251002_20250825 QC3.raw"
+    # Archivo: primer argumento (también una ruta "synthetic:...") o el archivo de ejemplo
+    ruta_raw = sys.argv[1] if len(sys.argv) > 1 else r"c:\Damico\Laboratorio\Software\Prueba\20251002_20250825 QC3.raw"
+    
+    # Abrir el archivo una sola vez y reutilizarlo en todos los ejemplos
+    sesion = abrir_sesion(ruta_raw)
     
     # Ejemplo 1: Resumen completo
     print("\n### EJEMPLO 1: Resumen completo ###\n")
-    resumen_completo(ruta_raw)
+    resumen_completo(sesion)
     
     # Ejemplo 2: Info básica
     print("\n\n### EJEMPLO 2: Información básica ###\n")
-    info_basica = extraer_info_basica(ruta_raw)
+    info_basica = extraer_info_basica(sesion)
     for key, value in info_basica.items():
         print(f"{key}: {value}")
     
     # Ejemplo 3: Parámetros de función
     print("\n\n### EJEMPLO 3: Parámetros de función 1 ###\n")
-    params = obtener_parametros_funcion(ruta_raw, funcion=0)
+    params = obtener_parametros_funcion(sesion, funcion=0)
     for key, value in params.items():
         print(f"{key}: {value}")
     
     # Ejemplo 4: Listar transiciones MRM
     print("\n\n### EJEMPLO 4: Transiciones MRM ###\n")
-    transiciones = listar_transiciones_mrm(ruta_raw, funcion=0)
+    transiciones = listar_transiciones_mrm(sesion, funcion=0)
     print(f"Total de transiciones: {len(transiciones)}")
     for trans in transiciones[:5]:  # Mostrar primeras 5
         print(f"  Trans {trans['numero']}: Q1={trans.get('q1', 'N/A')}, "
@@ -330,24 +434,25 @@ if __name__ == "__main__":
     
     # Ejemplo 5: Extraer TIC
     print("\n\n### EJEMPLO 5: Extraer TIC ###\n")
-    tiempos_tic, int_tic = extraer_cromatograma_tic(ruta_raw, funcion=0)
+    tiempos_tic, int_tic = extraer_cromatograma_tic(sesion, funcion=0)
     print(f"TIC extraído: {len(tiempos_tic)} puntos")
     print(f"Tiempo: {tiempos_tic[0]:.2f} - {tiempos_tic[-1]:.2f} min")
     print(f"Intensidad máxima: {max(int_tic):.2e}")
     
-    # Ejemplo 6: Extraer cromatogramas MRM
+    # Ejemplo 6: Extraer cromatogramas MRM (sólo se leen los 3 que se muestran)
     print("\n\n### EJEMPLO 6: Extraer cromatogramas MRM ###\n")
-    croms_mrm = extraer_cromatogramas_mrm(ruta_raw, funcion=0)
-    print(f"Cromatogramas MRM extraídos: {len(croms_mrm)}")
-    for nombre, (tiempos, intensidades) in list(croms_mrm.items())[:3]:
+    croms_mrm = extraer_cromatogramas_mrm(sesion, funcion=0, transiciones=range(3))
+    print(f"Cromatogramas MRM en la función: {sesion.GetInfoReader().GetMRMCount(0)}")
+    for nombre, (tiempos, intensidades) in croms_mrm.items():
         print(f"  {nombre}: {len(tiempos)} puntos, Imax={max(intensidades):.2e}")
     
     # Ejemplo 7: Exportar MRM a CSV
     print("\n\n### EJEMPLO 7: Exportar MRM a CSV ###\n")
-    archivo_csv = r"c:\Damico\Laboratorio\Software\Prueba\cromatogramas_mrm.csv"
+    archivo_csv = sys.argv[2] if len(sys.argv) > 2 else r"c:\Damico\Laboratorio\Software\Prueba\cromatogramas_mrm.csv"
     try:
-        exportar_mrm_a_csv(ruta_raw, funcion=0, archivo_salida=archivo_csv)
+        exportar_mrm_a_csv(sesion, funcion=0, archivo_salida=archivo_csv)
     except Exception as e:
         print(f"Error al exportar: {e}")
     
+    sesion.Close()
     print("\n\n✓ Ejemplos completados!")
@@ -0,0 +1,114 @@
+"""
+Escritura rápida de cromatogramas en tablas CSV anchas
+
+Una tabla por eje de tiempos: la primera columna es el tiempo y luego una columna
+por cromatograma (TIC, BPI y todas las transiciones MRM de la función). En lugar
+de escribir fila a fila con csv.writer, los valores se formatean por bloques de
+filas con una sola operación de formato por bloque ("%g,%g\\n" * filas % valores),
+así el bucle de Python recorre bloques y no filas.
+
+Los valores se escriben con 9 cifras significativas (formato %.9g), suficiente
+para recuperar exactamente los float32 que devuelve el SDK.
+"""
+
+import csv
+import io
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Valores formateados por bloque (filas × columnas): acota la memoria de cada bloque
+VALORES_POR_BLOQUE = 1 << 18
+
+FORMATO = "%.9g"
+
+
+def _es_matriz(datos):
+    """True si datos son varias series (una fila por serie), False si es una sola"""
+    if np is not None and isinstance(datos, np.ndarray):
+        return datos.ndim == 2
+    return len(datos) > 0 and hasattr(datos[0], '__len__')
+
+
+def _bloque(columnas, inicio, fin):
+    """Valores de las filas inicio:fin en orden de fila, como lista de floats de Python"""
+    if np is not None and all(isinstance(c, np.ndarray) for c in columnas):
+        partes = [c[:, inicio:fin].T if c.ndim == 2 else c[inicio:fin, None] for c in columnas]
+        return np.hstack(partes).ravel().tolist()
+    # sin NumPy: zip recorre las filas en C, sin bucle de Python por fila
+    series = [serie for c in columnas for serie in (c if _es_matriz(c) else [c])]
+    return list(chain.from_iterable(zip(*[serie[inicio:fin] for serie in series])))
+
+
+def escribir_tabla(archivo, encabezados, columnas, formato=FORMATO, valores_por_bloque=VALORES_POR_BLOQUE):
+    """
+    Escribe una tabla CSV ancha
+
+    Args:
+        archivo: ruta del CSV
+        encabezados: nombres de todas las columnas (uno por serie)
+        columnas: lista de series de la misma longitud; cada elemento es una serie
+                  (1-D) o una matriz con una serie por fila, como la de
+                  ReadMRMChromatograms (se escribe sin copiarla entera)
+        formato: formato % de cada valor
+        valores_por_bloque: valores formateados de una vez
+
+    Returns:
+        bytes escritos
+    """
+    anchos = [len(c) if _es_matriz(c) else 1 for c in columnas]
+    num_columnas = sum(anchos)
+    if len(encabezados) != num_columnas:
+        raise ValueError(f"{len(encabezados)} encabezados para {num_columnas} columnas")
+    primera = columnas[0][0] if _es_matriz(columnas[0]) else columnas[0]
+    num_filas = len(primera)
+
+    # el encabezado con csv, por si algún nombre lleva comas o comillas
+    cabecera = io.StringIO()
+    csv.writer(cabecera, lineterminator="\n").writerow(encabezados)
+
+    plantilla = ",".join([formato] * num_columnas) + "\n"
+    filas_por_bloque = max(1, valores_por_bloque // max(1, num_columnas))
+
+    escritos = 0
+    with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        escritos += f.write(cabecera.getvalue())
+        for inicio in range(0, num_filas, filas_por_bloque):
+            fin = min(num_filas, inicio + filas_por_bloque)
+            escritos += f.write((plantilla * (fin - inicio)) % tuple(_bloque(columnas, inicio, fin)))
+    return escritos
+
+
+def agrupar_por_tiempos(series):
+    """
+    Agrupa series por eje de tiempos, para escribir una tabla por eje
+
+    Args:
+        series: lista de (encabezados, tiempos, datos); datos es una serie o una
+                matriz con una serie por fila (ver escribir_tabla)
+
+    Returns:
+        lista de (tiempos, encabezados, columnas) en el orden de la primera serie de cada eje;
+        las series con el mismo objeto de tiempos, o tiempos iguales, comparten tabla
+    """
+    grupos = []
+    for encabezados, tiempos, datos in series:
+        for grupo in grupos:
+            eje = grupo[0]
+            if eje is tiempos or (len(eje) == len(tiempos) and _iguales(eje, tiempos)):
+                break
+        else:
+            grupo = (tiempos, [], [])
+            grupos.append(grupo)
+        grupo[1].extend(encabezados)
+        grupo[2].append(datos)
+    return grupos
+
+
+def _iguales(a, b):
+    if np is not None:
+        return bool(np.array_equal(a, b))
+    return all(x == y for x, y in zip(a, b))
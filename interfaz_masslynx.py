@@ -11,11 +11,11 @@ import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
 import threading
 
-# Agregar el path del SDK
-sdk_path = r"c:\Damico\Laboratorio\Software\Prueba\MassLynxSDKDownload_v5.0.0\python_wheel\extracted"
+# Agregar el path del SDK (relativo a este archivo)
+sdk_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "MassLynxSDKDownload_v5.0.0", "python_wheel", "extracted")
 sys.path.insert(0, sdk_path)
 
-from analizar_raw_masslynx import AnalizadorRawMassLynx
+# El analizador (SDK, numpy y la DLL) se importa al analizar, la ventana abre sin esperarlo
 
 
 class InterfazAnalizadorMassLynx:
@@ -173,23 +173,30 @@ class InterfazAnalizadorMassLynx:
         try:
             self.mostrar_progreso("Inicializando analizador...")
             
-            # Redirigir salida a la interfaz
-            import io
-            from contextlib import redirect_stdout
+            from analizar_raw_masslynx import AnalizadorRawMassLynx
+            from renderizar_resultados import texto_analisis
             
-            output = io.StringIO()
+            # Crear analizador (queda abierto para la exportación; se cierra el anterior)
+            if self.analizador is not None:
+                self.analizador.cerrar()
+                self.analizador = self.resultados = None
+            self.analizador = AnalizadorRawMassLynx(self.archivo_raw, silencioso=True)
             
-            with redirect_stdout(output):
-                # Crear analizador
-                self.analizador = AnalizadorRawMassLynx(self.archivo_raw)
-                
-                # Ejecutar análisis
-                self.resultados = self.analizador.analisis_completo(
-                    extraer_espectros=self.check_espectros.get()
-                )
+            # Resultado perezoso: sólo se lee del archivo lo que se muestra (las secciones
+            # marcadas); la exportación lee después los cromatogramas que falten
+            self.resultados = self.analizador.analizar_perezoso(
+                extraer_espectros=self.check_espectros.get()
+            )
             
-            # Obtener texto capturado
-            texto_salida = output.getvalue()
+            # Texto del análisis para la interfaz
+            texto_salida = texto_analisis(
+                self.resultados,
+                header=self.check_header.get(),
+                funciones=self.check_funciones.get(),
+                transiciones=self.check_transiciones.get(),
+                parametros=self.check_parametros.get(),
+                cromatogramas=self.check_cromatogramas.get()
+            )
             
             # Mostrar en interfaz
             self.root.after(0, lambda: self.escribir_log(texto_salida))
@@ -225,23 +232,35 @@ class InterfazAnalizadorMassLynx:
         if not carpeta:
             return
         
+        # Deshabilitar botones durante la exportación
+        self.btn_analizar.config(state="disabled")
+        self.btn_exportar.config(state="disabled")
+        self.mostrar_progreso("Exportando a CSV...")
+        self.escribir_log(f"\nExportando cromatogramas a: {carpeta}\n")
+        
+        # Exportar en thread separado: los cromatogramas que falten se leen ahora del archivo
+        thread = threading.Thread(target=self._ejecutar_exportacion, args=(carpeta,))
+        thread.daemon = True
+        thread.start()
+    
+    def _ejecutar_exportacion(self, carpeta):
+        """Exporta los cromatogramas (en thread separado)"""
         try:
-            self.mostrar_progreso("Exportando a CSV...")
-            self.escribir_log(f"\nExportando cromatogramas a: {carpeta}\n")
-            
-            # Exportar
             self.analizador.exportar_cromatogramas_csv(self.resultados, carpeta)
             
-            self.escribir_log("\n✓ Exportación completada!\n")
-            messagebox.showinfo("Éxito", f"Archivos exportados a:\n{carpeta}")
+            self.root.after(0, lambda: self.escribir_log("\n✓ Exportación completada!\n"))
+            self.root.after(0, lambda: messagebox.showinfo("Éxito", f"Archivos exportados a:\n{carpeta}"))
             
         except Exception as e:
-            error_msg = f"\n❌ ERROR durante la exportación:\n{str(e)}\n"
-            self.escribir_log(error_msg)
-            messagebox.showerror("Error", str(e))
+            error = str(e)
+            error_msg = f"\n❌ ERROR durante la exportación:\n{error}\n"
+            self.root.after(0, lambda: self.escribir_log(error_msg))
+            self.root.after(0, lambda: messagebox.showerror("Error", error))
         
         finally:
-            self.ocultar_progreso()
+            self.root.after(0, self.ocultar_progreso)
+            self.root.after(0, lambda: self.btn_analizar.config(state="normal"))
+            self.root.after(0, lambda: self.btn_exportar.config(state="normal"))
 
 
 def main():
@@ -0,0 +1,347 @@
+"""
+Procesamiento por lotes de carpetas con archivos .raw de MassLynx
+
+Busca las carpetas .raw de un directorio, las reparte entre varios procesos
+y va guardando los resultados a medida que cada archivo termina:
+
+  carpeta_salida/
+    resultados.jsonl          una línea JSON por archivo (header, funciones,
+                              transiciones, parámetros, tiempo y error)
+    <archivo>/analisis.txt    texto del análisis, como lo imprime analisis_completo
+                              (sólo con --texto)
+    <archivo>/Funcion_<n>.csv cromatogramas de cada función: tiempo, TIC, BPI y
+                              una columna por transición MRM
+    <archivo>/llamadas_dll.json  llamadas, bytes y latencias por función de la
+                              DLL (sólo con --instrumentar)
+
+Los trabajadores usan el análisis estructurado (AnalizadorRawMassLynx.analizar):
+no se formatea texto salvo que se pida con --texto.
+Los archivos que fallan quedan registrados con su error y el lote continúa.
+Al final se imprime un resumen de tiempos por archivo.
+
+Uso:
+    python procesar_lote.py carpeta_raws carpeta_salida [--trabajadores N] [--espectros] [--sin-csv]
+                            [--instrumentar] [--texto]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from analizar_raw_masslynx import AnalizadorRawMassLynx
+from masslynxsdk import MassLynxInstrumentation
+from renderizar_resultados import texto_analisis
+
+
+def buscar_archivos_raw(carpeta, recursivo=True):
+    """
+    Busca las carpetas .raw dentro de un directorio
+
+    No se entra dentro de las carpetas .raw encontradas.
+
+    Args:
+        carpeta: directorio donde buscar
+        recursivo: buscar también en subdirectorios
+
+    Returns:
+        lista ordenada de rutas a carpetas .raw
+    """
+    encontrados = []
+    pendientes = [carpeta]
+    while pendientes:
+        actual = pendientes.pop()
+        try:
+            entradas = list(os.scandir(actual))
+        except OSError:
+            continue
+        for entrada in entradas:
+            if not entrada.is_dir():
+                continue
+            if entrada.name.lower().endswith('.raw'):
+                encontrados.append(entrada.path)
+            elif recursivo:
+                pendientes.append(entrada.path)
+
+    return sorted(encontrados)
+
+
+def _nombre_salida(ruta_raw):
+    """Nombre de la carpeta de salida de un archivo .raw"""
+    return os.path.splitext(os.path.basename(os.path.normpath(ruta_raw)))[0]
+
+
+def procesar_archivo(ruta_raw, carpeta_salida=None, extraer_espectros=False, exportar_csv=True,
+                     instrumentar=False, texto=False):
+    """
+    Analiza un archivo .raw en el proceso actual (tarea de un trabajador)
+
+    El análisis es silencioso y estructurado; el texto que imprimiría
+    analisis_completo sólo se genera, en analisis.txt, si se pide.
+
+    Args:
+        ruta_raw: ruta al archivo .raw
+        carpeta_salida: carpeta donde escribir los resultados del archivo (None = no escribir)
+        extraer_espectros: pasar a analizar
+        exportar_csv: exportar los cromatogramas a CSV
+        instrumentar: contar las llamadas a la DLL (MassLynxInstrumentation)
+        texto: escribir analisis.txt con el texto del análisis
+
+    Returns:
+        dict con ruta, nombre, ok, error, segundos y los datos estructurados
+        (header, funciones con transiciones y parámetros); sin cromatogramas,
+        que se escriben directamente a disco. Con instrumentar, además
+        llamadas_dll: {función: {llamadas, segundos, bytes}}
+    """
+    inicio = time.perf_counter()
+    resultado = {
+        'ruta': ruta_raw,
+        'nombre': _nombre_salida(ruta_raw),
+        'ok': False,
+        'error': None
+    }
+
+    carpeta_archivo = None
+    if carpeta_salida is not None:
+        carpeta_archivo = os.path.join(carpeta_salida, resultado['nombre'])
+        os.makedirs(carpeta_archivo, exist_ok=True)
+
+    if instrumentar:
+        MassLynxInstrumentation.Reset()
+        MassLynxInstrumentation.Enable()
+
+    try:
+        with AnalizadorRawMassLynx(ruta_raw, silencioso=True) as analizador:
+            analisis = analizador.analizar(extraer_espectros=extraer_espectros)
+            if exportar_csv and carpeta_archivo is not None:
+                analizador.exportar_cromatogramas_csv(analisis, carpeta_archivo)
+
+        if texto and carpeta_archivo is not None:
+            with open(os.path.join(carpeta_archivo, "analisis.txt"), 'w', encoding='utf-8') as f:
+                f.write(texto_analisis(analisis))
+
+        resultados = analisis.a_dict()
+        resultado['header'] = resultados['header']
+        resultado['funciones'] = resultados['funciones']
+        resultado['parametros'] = [
+            {'funcion': croms.numero, 'parametros': croms.parametros}
+            for croms in analisis.cromatogramas
+        ]
+        resultado['ok'] = True
+    except Exception as e:
+        resultado['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        if instrumentar:
+            MassLynxInstrumentation.Disable()
+            resultado['llamadas_dll'] = {
+                nombre: {'llamadas': datos['calls'], 'segundos': datos['seconds'], 'bytes': datos['bytes']}
+                for nombre, datos in MassLynxInstrumentation.GetStatistics().items()
+            }
+            if carpeta_archivo is not None:
+                with open(os.path.join(carpeta_archivo, "llamadas_dll.json"), 'w', encoding='utf-8') as f:
+                    f.write(MassLynxInstrumentation.ToJson(indent=2))
+
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+
+def procesar_lote(rutas_raw, carpeta_salida=None, trabajadores=None, extraer_espectros=False,
+                  exportar_csv=True, reintentos=1, instrumentar=False, texto=False):
+    """
+    Procesa muchos archivos .raw con un pool de procesos
+
+    Es un generador: devuelve el resultado de cada archivo (ver procesar_archivo)
+    en cuanto termina, en el orden en que terminan. Sólo se mantienen en vuelo
+    2 tareas por trabajador, así la memoria no crece con el tamaño del lote.
+
+    Si un trabajador muere (por ejemplo un fallo dentro de la DLL) el pool se
+    vuelve a crear; los archivos que estaban en curso se reintentan hasta
+    `reintentos` veces y después se registran como fallidos.
+
+    Args:
+        rutas_raw: lista de rutas a archivos .raw
+        carpeta_salida: carpeta de resultados (None = no escribir nada a disco)
+        trabajadores: número de procesos (None = número de CPUs)
+        extraer_espectros: pasar a analizar
+        exportar_csv: exportar los cromatogramas a CSV
+        reintentos: reintentos de un archivo cuyo proceso terminó inesperadamente
+        instrumentar: contar las llamadas a la DLL de cada archivo
+        texto: escribir analisis.txt de cada archivo
+
+    Yields:
+        dict con el resultado de cada archivo
+    """
+    trabajadores = trabajadores or os.cpu_count() or 1
+    en_vuelo_max = 2 * trabajadores
+    pendientes = [(ruta, 0) for ruta in reversed(list(rutas_raw))]
+
+    while pendientes:
+        caidos = []
+        with ProcessPoolExecutor(max_workers=trabajadores) as ejecutor:
+            en_vuelo = {}
+            try:
+                while pendientes or en_vuelo:
+                    while pendientes and len(en_vuelo) < en_vuelo_max:
+                        ruta, intento = pendientes[-1]
+                        futuro = ejecutor.submit(procesar_archivo, ruta, carpeta_salida,
+                                                 extraer_espectros, exportar_csv, instrumentar, texto)
+                        en_vuelo[futuro] = pendientes.pop()
+
+                    terminados, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                    for futuro in terminados:
+                        ruta, intento = en_vuelo.pop(futuro)
+                        try:
+                            yield futuro.result()
+                        except BrokenProcessPool:
+                            caidos.append((ruta, intento))
+                        except Exception as e:
+                            yield {'ruta': ruta, 'nombre': _nombre_salida(ruta), 'ok': False,
+                                   'error': f"{type(e).__name__}: {e}", 'segundos': 0.0}
+            except BrokenProcessPool:
+                pass
+            # las tareas en vuelo de un pool roto no van a terminar
+            caidos.extend(en_vuelo.values())
+
+        for ruta, intento in caidos:
+            if intento < reintentos:
+                pendientes.append((ruta, intento + 1))
+            else:
+                yield {'ruta': ruta, 'nombre': _nombre_salida(ruta), 'ok': False,
+                       'error': "El proceso de trabajo terminó inesperadamente", 'segundos': 0.0}
+
+
+def resumir_tiempos(resultados, segundos_totales=None):
+    """
+    Resume los tiempos por archivo de un lote
+
+    Args:
+        resultados: lista de resultados de procesar_lote
+        segundos_totales: tiempo de reloj de todo el lote (opcional)
+
+    Returns:
+        dict con archivos, correctos, fallidos, suma, media, mediana, p95, maximo
+        y los 5 archivos más lentos; archivos_por_segundo si se pasa el tiempo total
+    """
+    tiempos = sorted(r['segundos'] for r in resultados)
+    n = len(tiempos)
+    resumen = {
+        'archivos': n,
+        'correctos': sum(1 for r in resultados if r['ok']),
+        'fallidos': sum(1 for r in resultados if not r['ok']),
+        'suma': sum(tiempos),
+        'media': sum(tiempos) / n if n else 0.0,
+        'mediana': tiempos[n // 2] if n else 0.0,
+        'p95': tiempos[min(n - 1, int(0.95 * n))] if n else 0.0,
+        'maximo': tiempos[-1] if n else 0.0,
+        'mas_lentos': [(r['nombre'], r['segundos'])
+                       for r in sorted(resultados, key=lambda r: r['segundos'], reverse=True)[:5]]
+    }
+    if segundos_totales:
+        resumen['segundos_totales'] = segundos_totales
+        resumen['archivos_por_segundo'] = n / segundos_totales
+    return resumen
+
+
+def sumar_llamadas(total, llamadas):
+    """Acumula en total las llamadas a la DLL de un archivo (ver procesar_archivo)"""
+    for nombre, datos in llamadas.items():
+        acumulado = total.setdefault(nombre, {'llamadas': 0, 'segundos': 0.0, 'bytes': 0})
+        for clave in acumulado:
+            acumulado[clave] += datos[clave]
+    return total
+
+
+def ejecutar_lote(carpeta_raws, carpeta_salida, trabajadores=None, extraer_espectros=False,
+                  exportar_csv=True, instrumentar=False, texto=False):
+    """
+    Busca, procesa y guarda todos los archivos .raw de una carpeta
+
+    Cada resultado se añade a carpeta_salida/resultados.jsonl en cuanto llega.
+
+    Returns:
+        dict con el resumen de tiempos (ver resumir_tiempos); con instrumentar,
+        además llamadas_dll con la suma de todos los archivos
+    """
+    rutas = buscar_archivos_raw(carpeta_raws)
+    print(f"Archivos .raw encontrados: {len(rutas)}")
+
+    os.makedirs(carpeta_salida, exist_ok=True)
+    ruta_jsonl = os.path.join(carpeta_salida, "resultados.jsonl")
+
+    resultados = []
+    llamadas = {}
+    inicio = time.perf_counter()
+    with open(ruta_jsonl, 'w', encoding='utf-8') as salida:
+        for resultado in procesar_lote(rutas, carpeta_salida, trabajadores,
+                                       extraer_espectros, exportar_csv, instrumentar=instrumentar,
+                                       texto=texto):
+            salida.write(json.dumps(resultado, ensure_ascii=False, default=str) + "\n")
+            salida.flush()
+
+            resultados.append({k: resultado[k] for k in ('nombre', 'ok', 'segundos')})
+            sumar_llamadas(llamadas, resultado.get('llamadas_dll', {}))
+            estado = "✓" if resultado['ok'] else f"✗ {resultado['error']}"
+            print(f"[{len(resultados)}/{len(rutas)}] {resultado['nombre']} "
+                  f"({resultado['segundos']:.2f} s) {estado}")
+
+    resumen = resumir_tiempos(resultados, time.perf_counter() - inicio)
+    if instrumentar:
+        resumen['llamadas_dll'] = llamadas
+    with open(os.path.join(carpeta_salida, "resumen_lote.json"), 'w', encoding='utf-8') as f:
+        json.dump(resumen, f, ensure_ascii=False, indent=2)
+
+    return resumen
+
+
+def imprimir_resumen(resumen):
+    """Imprime el resumen de tiempos de un lote"""
+    print("\n" + "=" * 80)
+    print("RESUMEN DEL LOTE")
+    print("=" * 80)
+    print(f"Archivos: {resumen['archivos']} ({resumen['correctos']} correctos, "
+          f"{resumen['fallidos']} con error)")
+    if 'segundos_totales' in resumen:
+        print(f"Tiempo total: {resumen['segundos_totales']:.1f} s "
+              f"({resumen['archivos_por_segundo']:.2f} archivos/s)")
+    print(f"Por archivo: media {resumen['media']:.2f} s, mediana {resumen['mediana']:.2f} s, "
+          f"p95 {resumen['p95']:.2f} s, máximo {resumen['maximo']:.2f} s")
+    if resumen['mas_lentos']:
+        print("Más lentos:")
+        for nombre, segundos in resumen['mas_lentos']:
+            print(f"  {nombre}: {segundos:.2f} s")
+    if resumen.get('llamadas_dll'):
+        print("Funciones de la DLL con más tiempo:")
+        ordenadas = sorted(resumen['llamadas_dll'].items(), key=lambda item: item[1]['segundos'], reverse=True)
+        for nombre, datos in ordenadas[:10]:
+            print(f"  {nombre:<28} {datos['llamadas']:>9} llamadas {datos['segundos']:>9.3f} s "
+                  f"{datos['bytes'] / 1e6:>9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("carpeta_raws", help="Carpeta con archivos .raw (se busca recursivamente)")
+    parser.add_argument("carpeta_salida", help="Carpeta donde guardar los resultados")
+    parser.add_argument("--trabajadores", type=int, default=None,
+                        help="Número de procesos (por defecto, número de CPUs)")
+    parser.add_argument("--espectros", action="store_true", help="Extraer también un espectro por función")
+    parser.add_argument("--sin-csv", action="store_true", help="No exportar cromatogramas a CSV")
+    parser.add_argument("--instrumentar", action="store_true",
+                        help="Contar llamadas, bytes y latencia de cada función de la DLL")
+    parser.add_argument("--texto", action="store_true",
+                        help="Guardar también el texto del análisis (analisis.txt) de cada archivo")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.carpeta_raws):
+        print(f"ERROR: No se encuentra la carpeta {args.carpeta_raws}")
+        sys.exit(1)
+
+    resumen = ejecutar_lote(args.carpeta_raws, args.carpeta_salida, args.trabajadores,
+                            args.espectros, not args.sin_csv, args.instrumentar, args.texto)
+    imprimir_resumen(resumen)
+
+
+if __name__ == "__main__":
+    main()
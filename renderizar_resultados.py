@@ -0,0 +1,201 @@
+"""
+Texto de consola de los resultados del análisis de archivos .raw de MassLynx
+
+Convierte un ResultadoAnalisis (o sus partes) en las líneas que imprime
+analisis_completo. Sólo se llama cuando alguien va a leer el texto: la consola,
+la interfaz gráfica o procesar_lote con --texto; el análisis estructurado
+(AnalizadorRawMassLynx.analizar) no formatea nada.
+
+Con un ResultadoPerezoso sólo se lee del archivo lo que se renderiza: las
+secciones desactivadas en lineas_analisis no se leen.
+
+Cada función lineas_* es un generador de líneas sin el salto de línea final.
+"""
+
+import io
+import os
+import sys
+
+
+def lineas_encabezado(header, error=None, errores=None):
+    """Líneas de la sección del encabezado (error: del encabezado entero, errores: de cada item)"""
+    errores = errores or {}
+    yield "=" * 80
+    yield "INFORMACIÓN DEL ENCABEZADO"
+    yield "=" * 80
+    for descripcion, valor in header.items():
+        if error is not None:
+            yield f"{descripcion}: No disponible ({error})"
+        elif descripcion in errores:
+            yield f"{descripcion}: No disponible ({errores[descripcion]})"
+        else:
+            yield f"{descripcion}: {valor}"
+    yield ""
+
+
+def lineas_transiciones(funcion, transiciones):
+    """Líneas de las transiciones MRM de una función (índice 0-based)"""
+    yield f"\nTRANSICIONES MRM (Función {funcion + 1}):"
+    yield "-" * 80
+    for t in transiciones:
+        yield f"\nTransición {t.numero}: {t.transicion}"
+        yield f"  Nombre: {t.nombre}"
+        yield f"  Q1 (precursor): {t.q1_precursor:.4f} Da"
+        yield f"  Q3 (producto): {t.q3_producto:.4f} Da"
+        if t.voltaje_cono is not None:
+            yield f"  Voltaje de cono (CV): {t.voltaje_cono} V"
+        if t.energia_colision is not None:
+            yield f"  Energía de colisión (CE): {t.energia_colision} V"
+
+
+def lineas_funcion(info, transiciones=True):
+    """Líneas de una función (InfoFuncion), con sus transiciones si transiciones es True"""
+    errores = info.errores
+
+    def no_disponible(clave, etiqueta):
+        return f"{etiqueta}: No disponible ({errores[clave]})"
+
+    yield f"\n--- FUNCIÓN {info.numero} ---"
+    yield no_disponible('tipo', "Tipo de función") if 'tipo' in errores else f"Tipo de función: {info.tipo}"
+    yield no_disponible('modo_ion', "Modo de ionización") if 'modo_ion' in errores else f"Modo de ionización: {info.modo_ion}"
+    yield no_disponible('num_scans', "Número de scans") if 'num_scans' in errores else f"Número de scans: {info.num_scans}"
+    if 'rango_masas' in errores:
+        yield no_disponible('rango_masas', "Rango de masas")
+    else:
+        yield f"Rango de masas: {info.rango_masas[0]:.2f} - {info.rango_masas[1]:.2f} Da"
+    if 'rango_tiempo' in errores:
+        yield no_disponible('rango_tiempo', "Rango de tiempo")
+    else:
+        yield f"Rango de tiempo: {info.rango_tiempo[0]:.2f} - {info.rango_tiempo[1]:.2f} min"
+    yield no_disponible('continuum', "Modo") if 'continuum' in errores else f"Modo: {'Continuum' if info.continuum else 'Centroide'}"
+
+    if info.num_transiciones > 0:
+        yield f"\n*** Función MRM con {info.num_transiciones} transiciones ***"
+        if 'mrm' not in errores and transiciones:
+            yield from lineas_transiciones(info.indice, info.transiciones)
+    if 'mrm' in errores:
+        yield f"MRM: No aplicable ({errores['mrm']})"
+
+
+def lineas_funciones(funciones, error=None, transiciones=True):
+    """Líneas de la sección de funciones"""
+    yield "=" * 80
+    yield "INFORMACIÓN DE FUNCIONES"
+    yield "=" * 80
+    if error is not None:
+        yield f"Error al extraer información de funciones: {error}"
+        return
+    yield f"Número total de funciones: {len(funciones)}\n"
+    for info in funciones:
+        yield from lineas_funcion(info, transiciones)
+
+
+def lineas_parametros(funcion, scan, parametros):
+    """Líneas de los parámetros de un scan de una función (índice 0-based)"""
+    yield f"\n--- PARÁMETROS DEL SCAN {scan} (Función {funcion + 1}) ---"
+    for descripcion, valor in parametros.items():
+        yield f"{descripcion}: {valor}"
+
+
+def lineas_cromatogramas(croms):
+    """Líneas de los cromatogramas de una función (CromatogramasFuncion)"""
+    errores = croms.errores
+    yield f"\n--- CROMATOGRAMAS (Función {croms.numero}) ---"
+
+    if croms.tic is not None:
+        yield f"TIC extraído: {croms.tic.puntos} puntos"
+        if croms.tic.puntos > 0:
+            yield f"  Tiempo: {croms.tic.tiempos[0]:.2f} - {croms.tic.tiempos[-1]:.2f} min"
+            yield f"  Intensidad máxima: {croms.tic.intensidad_maxima:.2e}"
+    if 'TIC' in errores:
+        yield f"No se pudo extraer TIC: {errores['TIC']}"
+
+    if croms.bpi is not None:
+        yield f"BPI extraído: {croms.bpi.puntos} puntos"
+        if croms.bpi.puntos > 0:
+            yield f"  Intensidad máxima: {croms.bpi.intensidad_maxima:.2e}"
+    if 'BPI' in errores:
+        yield f"No se pudo extraer BPI: {errores['BPI']}"
+
+    if croms.num_mrm > 0:
+        yield f"\nExtrayendo {croms.num_mrm} cromatogramas MRM..."
+        puntos = 0 if croms.mrm_tiempos is None else len(croms.mrm_tiempos)
+        for indice, maximo in enumerate(croms.mrm_maximos):
+            yield f"  Transición {indice + 1}: {puntos} puntos, Imax = {maximo:.2e}"
+    if 'MRM' in errores:
+        yield f"No se pudieron extraer cromatogramas MRM: {errores['MRM']}"
+
+
+def lineas_espectro(espectro):
+    """Líneas de un espectro de masas (Espectro)"""
+    yield f"\n--- ESPECTRO DE MASAS (Función {espectro.funcion + 1}, Scan {espectro.scan}) ---"
+    if espectro.error is not None:
+        yield f"Error al extraer espectro: {espectro.error}"
+        return
+    yield f"Espectro extraído: {espectro.num_picos} picos"
+    if espectro.num_picos > 0:
+        yield f"  Rango de masas: {min(espectro.masas):.2f} - {max(espectro.masas):.2f} Da"
+        yield f"  Intensidad máxima: {max(espectro.intensidades):.2e}"
+        yield f"\n  Top 5 picos más intensos:"
+        for i, (masa, intensidad) in enumerate(espectro.picos_principales(5)):
+            yield f"    {i+1}. m/z {masa:.4f}: {intensidad:.2e}"
+
+
+def lineas_analisis(resultado, header=True, funciones=True, transiciones=True, parametros=True,
+                    cromatogramas=True):
+    """
+    Líneas de un análisis completo (ResultadoAnalisis o ResultadoPerezoso)
+
+    Los argumentos activan o desactivan cada sección; los espectros se muestran
+    con los cromatogramas.
+    """
+    yield "\n"
+    yield "╔" + "═" * 78 + "╗"
+    yield "║" + " " * 20 + "ANÁLISIS COMPLETO DE ARCHIVO RAW" + " " * 26 + "║"
+    yield "║" + " " * 78 + "║"
+    yield "║  " + f"Archivo: {os.path.basename(resultado.ruta_raw)}".ljust(76) + "║"
+    yield "╚" + "═" * 78 + "╝"
+    yield "\n"
+
+    if header:
+        yield from lineas_encabezado(resultado.header, resultado.errores.get('header'), resultado.errores_header)
+    if funciones:
+        yield from lineas_funciones(resultado.funciones, resultado.errores.get('funciones'), transiciones)
+
+    if parametros or cromatogramas:
+        yield "\n" + "=" * 80
+        yield "EXTRACCIÓN DE CROMATOGRAMAS"
+        yield "=" * 80
+        for info in resultado.funciones:
+            if not cromatogramas:
+                yield from lineas_parametros(info.indice, 0, resultado.parametros_funcion(info.indice, 0))
+                continue
+            croms = resultado.cromatogramas_funcion(info.indice)
+            if parametros:
+                yield from lineas_parametros(croms.indice, croms.scan_parametros, croms.parametros)
+            yield from lineas_cromatogramas(croms)
+            if croms.espectro is not None:
+                yield from lineas_espectro(croms.espectro)
+
+    yield "\n" + "=" * 80
+    yield "ANÁLISIS COMPLETADO"
+    yield "=" * 80
+
+
+def imprimir(lineas, salida=None):
+    """Escribe líneas en salida (sys.stdout por defecto)"""
+    salida = sys.stdout if salida is None else salida
+    for linea in lineas:
+        salida.write(linea + "\n")
+
+
+def imprimir_resultado(resultado, salida=None, **secciones):
+    """Imprime un ResultadoAnalisis como lo hacía analisis_completo (secciones: ver lineas_analisis)"""
+    imprimir(lineas_analisis(resultado, **secciones), salida)
+
+
+def texto_analisis(resultado, **secciones):
+    """Texto de un ResultadoAnalisis (para la interfaz gráfica o analisis.txt)"""
+    texto = io.StringIO()
+    imprimir_resultado(resultado, texto, **secciones)
+    return texto.getvalue()
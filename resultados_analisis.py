@@ -0,0 +1,286 @@
+"""
+Resultados estructurados del análisis de archivos .raw de MassLynx
+
+Son los objetos que devuelve AnalizadorRawMassLynx.analizar(): no imprimen nada
+ni dependen del SDK, se pueden guardar en la caché de metadatos o enviar entre
+procesos. El texto de consola se genera aparte (renderizar_resultados.py) y
+a_dict() da la forma de diccionario que devolvía analisis_completo.
+
+Los errores de lectura no interrumpen el análisis: cada objeto guarda el mensaje
+del dato que no se pudo leer en `errores` (o `error`), con la misma clave que
+el campo.
+
+Para tener en memoria los resultados de muchos archivos (una placa de 96), las
+clases usan __slots__ (Python 3.10+) y los cromatogramas se guardan como arrays
+float32 contiguos (NumPy, o array.array sin NumPy) con un único eje de tiempos
+por función, compartido por TIC, BPI y MRM cuando coinciden.
+"""
+
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# dataclass(slots=True) no existe antes de Python 3.10: ahí las clases usan __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def a_float32(valores):
+    """Devuelve valores como array float32 contiguo (sin copiar si ya lo es)"""
+    if np is not None:
+        return np.ascontiguousarray(valores, dtype=np.float32)
+    if isinstance(valores, array) and valores.typecode == 'f':
+        return valores
+    return array('f', valores)
+
+
+def matriz_float32(filas):
+    """Devuelve una matriz (una fila por transición) como float32 contiguo"""
+    if np is not None:
+        return np.ascontiguousarray(filas, dtype=np.float32)
+    return [a_float32(fila) for fila in filas]
+
+
+def _iguales(a, b):
+    if np is not None:
+        return np.array_equal(a, b)
+    return len(a) == len(b) and all(x == y for x, y in zip(a, b))
+
+
+def _maximo(valores):
+    """Máximo de una lista o array (0.0 si está vacío)"""
+    if len(valores) == 0:
+        return 0.0
+    return float(valores.max() if hasattr(valores, 'max') else max(valores))
+
+
+@dataclass(**_SLOTS)
+class Transicion:
+    """Una transición MRM: masas, compuesto y energías"""
+    indice: int
+    q1_precursor: float
+    q3_producto: float
+    nombre: str
+    voltaje_cono: Optional[int] = None
+    energia_colision: Optional[int] = None
+    dwell: Optional[float] = None
+    ventana_rt: Optional[Tuple[float, float]] = None
+
+    @property
+    def numero(self):
+        return self.indice + 1
+
+    @property
+    def transicion(self):
+        return f"{self.q1_precursor:.2f} > {self.q3_producto:.2f}"
+
+    def a_dict(self):
+        return {
+            'indice': self.indice,
+            'numero': self.numero,
+            'q1_precursor': self.q1_precursor,
+            'q3_producto': self.q3_producto,
+            'transicion': self.transicion,
+            'nombre': self.nombre,
+            'voltaje_cono': self.voltaje_cono,
+            'energia_colision': self.energia_colision,
+            'dwell': self.dwell,
+            'ventana_rt': self.ventana_rt
+        }
+
+
+@dataclass(**_SLOTS)
+class InfoFuncion:
+    """
+    Información de una función de adquisición
+
+    Los campos que no se pudieron leer quedan en None y su error en errores
+    ('tipo', 'modo_ion', 'num_scans', 'rango_masas', 'rango_tiempo', 'continuum', 'mrm').
+    """
+    indice: int
+    tipo: Optional[str] = None
+    modo_ion: Optional[str] = None
+    num_scans: Optional[int] = None
+    rango_masas: Optional[Tuple[float, float]] = None
+    rango_tiempo: Optional[Tuple[float, float]] = None
+    continuum: Optional[bool] = None
+    num_transiciones: int = 0
+    transiciones: List[Transicion] = field(default_factory=list)
+    errores: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def numero(self):
+        return self.indice + 1
+
+    def a_dict(self):
+        info = {'numero': self.numero, 'indice': self.indice}
+        for clave in ('tipo', 'modo_ion', 'num_scans', 'rango_masas', 'rango_tiempo', 'continuum'):
+            valor = getattr(self, clave)
+            if valor is not None:
+                info[clave] = valor
+        if self.num_transiciones > 0:
+            info['num_transiciones'] = self.num_transiciones
+            if 'mrm' not in self.errores:
+                info['transiciones'] = [t.a_dict() for t in self.transiciones]
+        return info
+
+
+@dataclass(**_SLOTS)
+class Cromatograma:
+    """Un cromatograma (TIC o BPI): tiempos en minutos e intensidades, float32"""
+    tiempos: Any
+    intensidades: Any
+
+    @property
+    def puntos(self):
+        return len(self.tiempos)
+
+    @property
+    def intensidad_maxima(self):
+        return _maximo(self.intensidades)
+
+    def a_dict(self):
+        return {'tiempos': self.tiempos, 'intensidades': self.intensidades, 'puntos': self.puntos}
+
+
+@dataclass(**_SLOTS)
+class Espectro:
+    """Espectro de masas de un scan; masas e intensidades en None si no se pudo leer"""
+    funcion: int
+    scan: int
+    masas: Any = None
+    intensidades: Any = None
+    error: Optional[str] = None
+
+    @property
+    def num_picos(self):
+        return 0 if self.masas is None else len(self.masas)
+
+    def picos_principales(self, n=5):
+        """Los n picos más intensos, lista de (masa, intensidad)"""
+        if self.masas is None:
+            return []
+        return sorted(zip(self.masas, self.intensidades), key=lambda x: x[1], reverse=True)[:n]
+
+    def a_dict(self):
+        """Diccionario de extraer_espectro (None si hubo error)"""
+        if self.error is not None:
+            return None
+        return {'masas': self.masas, 'intensidades': self.intensidades, 'num_picos': self.num_picos}
+
+
+@dataclass(**_SLOTS)
+class CromatogramasFuncion:
+    """
+    Parámetros de un scan y cromatogramas de una función
+
+    Los cromatogramas MRM comparten un vector de tiempos (mrm_tiempos) y tienen una
+    fila de intensidades por transición (mrm_matriz, float32). tiempos es el eje de la
+    función: los cromatogramas cuyos tiempos coinciden lo comparten (ver compartir_tiempos).
+    Los errores se guardan con las claves 'TIC', 'BPI' y 'MRM'.
+    """
+    indice: int
+    scan_parametros: int = 0
+    tiempos: Any = None
+    parametros: Dict[str, Any] = field(default_factory=dict)
+    tic: Optional[Cromatograma] = None
+    bpi: Optional[Cromatograma] = None
+    num_mrm: int = 0
+    mrm_tiempos: Any = None
+    mrm_matriz: Any = None
+    mrm_maximos: List[float] = field(default_factory=list)
+    espectro: Optional[Espectro] = None
+    errores: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def numero(self):
+        return self.indice + 1
+
+    def compartir_tiempos(self, tiempos):
+        """
+        Devuelve tiempos como float32 contiguo; si son iguales al eje de la función,
+        el mismo objeto. El primero que se pasa pasa a ser el eje de la función.
+        """
+        tiempos = a_float32(tiempos)
+        if self.tiempos is None:
+            self.tiempos = tiempos
+        elif self.tiempos is not tiempos and _iguales(self.tiempos, tiempos):
+            return self.tiempos
+        return tiempos
+
+    def cromatogramas_dict(self):
+        """Diccionario de extraer_cromatogramas"""
+        croms = {}
+        if self.tic is not None:
+            croms['TIC'] = self.tic.a_dict()
+        if self.bpi is not None:
+            croms['BPI'] = self.bpi.a_dict()
+        if self.num_mrm > 0:
+            croms['MRM'] = []
+            if self.mrm_tiempos is not None:
+                croms['MRM_tiempos'] = self.mrm_tiempos
+                croms['MRM_matriz'] = self.mrm_matriz
+                for indice, maximo in enumerate(self.mrm_maximos):
+                    croms['MRM'].append({
+                        'transicion': indice + 1,
+                        'tiempos': self.mrm_tiempos,
+                        'intensidades': self.mrm_matriz[indice],
+                        'puntos': len(self.mrm_tiempos),
+                        'intensidad_maxima': maximo
+                    })
+        return croms
+
+    def a_dict(self):
+        return {'funcion': self.numero, 'parametros': self.parametros, 'cromatogramas': self.cromatogramas_dict()}
+
+
+@dataclass(**_SLOTS)
+class ResultadoAnalisis:
+    """
+    Resultado completo de AnalizadorRawMassLynx.analizar()
+
+    header es {descripción: valor}; si no se pudo leer, errores['header'] tiene el
+    mensaje y los valores quedan en None. Los items sueltos que no se pudieron leer
+    quedan en None con su mensaje en errores_header. Si no se pudo leer el número de funciones,
+    errores['funciones'] tiene el mensaje y no hay funciones ni cromatogramas.
+    """
+    ruta_raw: str
+    header: Dict[str, Any] = field(default_factory=dict)
+    funciones: List[InfoFuncion] = field(default_factory=list)
+    cromatogramas: List[CromatogramasFuncion] = field(default_factory=list)
+    errores: Dict[str, str] = field(default_factory=dict)
+    errores_header: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def transiciones(self):
+        """Todas las transiciones MRM, en el orden de las funciones"""
+        return [t for funcion in self.funciones for t in funcion.transiciones]
+
+    def cromatogramas_funcion(self, indice):
+        """CromatogramasFuncion de una función (índice 0-based)"""
+        for croms in self.cromatogramas:
+            if croms.indice == indice:
+                return croms
+        raise IndexError(f"No hay cromatogramas de la función {indice}")
+
+    def parametros_funcion(self, indice, scan=0):
+        """Parámetros del scan de una función que se leyó en el análisis"""
+        croms = self.cromatogramas_funcion(indice)
+        if croms.scan_parametros != scan:
+            raise KeyError(f"No se leyeron los parámetros del scan {scan} de la función {indice}")
+        return croms.parametros
+
+    def a_dict(self):
+        """Diccionario de analisis_completo"""
+        header = {} if 'header' in self.errores else {
+            descripcion: valor for descripcion, valor in self.header.items() if descripcion not in self.errores_header}
+        return {
+            'header': header,
+            'funciones': [funcion.a_dict() for funcion in self.funciones],
+            'cromatogramas': [croms.a_dict() for croms in self.cromatogramas]
+        }